@@ -2,6 +2,21 @@
 
 # ================== 시스템 공통 설정 ==================
 UCWIN_PROG_ID = "UCwinRoad.F8ApplicationServicesProxy"
+BUMP_CATALOG_CAPACITY = 1024  # 공유 방지턱 카탈로그 최대 레코드 수
+BUMP_CATALOG_CACHE_DIR = "bump_catalog_cache"  # 프로젝트별 방지턱 카탈로그 디스크 캐시 디렉터리 (헤드리스 백엔드는 캐시하지 않는다)
+TELEMETRY_RATE_HZ = 30.0  # 자차/전방 차량 상태 발행 주기
+UCWIN_BACKEND = "com"  # "com": UC-win/Road COM / "headless": 순수 파이썬 시뮬레이터 (src/headless_sim.py)
+
+# ================== Headless 시뮬레이터 설정 ==================
+HEADLESS_STEP_DT = 1.0 / 60.0
+HEADLESS_TIME_SCALE = 4.0  # 실시간 대비 시뮬레이션 배속
+HEADLESS_START_X = 3600.0
+HEADLESS_CRUISE_SPEED_KMH = 40.0
+HEADLESS_BUMP_LAYOUT = [  # (인스턴스 이름, X[m], 높이[m], 깊이[m])
+    ("TypeA_01", 3450.0, 0.08, 3.6), ("TypeB_01", 3200.0, 0.18, 3.6), ("TypeC_01", 2950.0, 0.10, 1.8),
+    ("TypeA_02", 2700.0, 0.08, 3.6), ("TypeB_02", 2450.0, 0.18, 3.6), ("TypeC_02", 2250.0, 0.10, 1.8),
+]
+HEADLESS_FRONT_VEHICLE_GAP_M = {1: 20.0}  # 시나리오별 전방 차량 초기 간격 (없으면 전방 차량 없음)
 
 # ================== Vision 모듈 설정 ==================
 REGULAR_VIEW_WINDOW_TITLE = "경관 위치 <top>"
@@ -11,7 +26,8 @@ ROI_SETTINGS_PATTERN = {'top_y': 0.4, 'bottom_y': 0.98, 'top_w': 0.4, 'bottom_w'
 HEIGHT_ANALYSIS_SETTINGS = {
     'hue_lower': 0, 'hue_upper': 95, 'min_contour_area': 1400, 'min_aspect_ratio': 1.5,
     'distance_calibration': {0.0: 21.0, 0.5: 11.0, 1.0: 0.0},
-    'height_interpolation_hue': [15, 55], 'height_interpolation_m': [0.25, 0.05]
+    'height_interpolation_hue': [15, 55], 'height_interpolation_m': [0.25, 0.05],
+    'hue_direct': False
 }
 PATTERN_ANALYSIS_SETTINGS = {
     'yellow_lower': [20, 80, 80], 'yellow_upper': [35, 255, 255],
@@ -24,9 +40,39 @@ CLASSIFICATION_THRESHOLDS = {
     'D_MAX_H': 0.04
 }
 DETECTION_CONFIRM_FRAME_COUNT = 2
+VISION_CONCURRENT_VIEWS = False  # True: <top>/<test> 뷰를 뷰별 스레드에서 동시에 캡처·분석 (utils/vision_bench.py --concurrent 로 실측 후 켠다)
+VISION_FRAME_RATE_HZ = 10.0
+VISION_BOOST_FRAME_RATE_HZ = 20.0
+VISION_IDLE_FRAME_RATE_HZ = 5.0
+VISION_IDLE_AFTER_FRAMES = 10
+VISION_FRAME_RING = False
+VISION_FRAME_RING_SLOTS = 4
+VISION_FRAME_RING_MAX_SIZE = (1920, 1080)
+VISION_CAPTURE_RATE_HZ = 20.0
+
+# ================== V2V 모듈 설정 ==================
+V2V_RANGE_M = 30.0  # 전방 차량이 이 거리 안이면 Vision 분석 대신 V2V 인지를 전달한다
+V2V_TRIGGER_DISTANCE_M = 2.0  # 전방 차량이 방지턱에 이 거리 안으로 들어가면 그 방지턱을 방송한다
+V2V_PERIOD_S = 0.1
 
 # ================== Control 모듈 설정 ==================
-CONTROL_POLL_DT = 0.15
+CONTROL_MODE = "poll"  # "poll": CONTROL_POLL_DT 주기 폴링 / "callback": 시뮬레이터 스텝 콜백(OnBeforeCalculateMovement)
+CONTROL_POLL_DT = 0.15  # 폴링 모드 제어 주기 (PWM 제동의 주기이기도 함)
+CONTROL_BRAKE_ACTUATOR = "auto"  # "auto": 차량에 Brake 아날로그 입력이 있으면 사용, 없으면 ParkingBrake PWM / "analog" / "pwm"
+CONTROL_BRAKE_PLANNER = "heuristic"  # "heuristic": calculate_brake_pwm 고정 강도 (기존 동작) / "kinematic": 등감속 프로파일 + 학습 제동 모델, 매 tick 재계획 / "pi": 기준 속도 궤적 PI 추종
+PLANNER_START_DECEL_MPS2 = 3.0  # 필요 감속도가 이 값에 도달하면 제동을 시작한다 ("pi"에서는 기준 궤적의 감속도)
+SPEED_PI_KP = 0.15  # 속도 오차 1m/s 당 제동 명령
+SPEED_PI_KI = 0.3
+SPEED_PI_RATE_LIMIT = 3.0  # 제동 명령의 초당 최대 변화량
+PLANNER_DISTANCE_MARGIN_M = 1.0  # 방지턱 앞에서 목표 속도에 도달할 여유 거리
+CONTROL_LOOKAHEAD = False  # True: 카탈로그로 다음 방지턱을 미리 추적해 제동을 시작하고, Vision/V2V 인지는 확인만 한다
+LOOKAHEAD_HORIZON_M = 120.0  # 이 거리 안에 들어온 방지턱의 계획을 미리 세운다
+LOOKAHEAD_DECEL_MPS2 = 1.5  # 선행 추적으로 시작한 제동의 목표 감속도 (PLANNER_START_DECEL_MPS2 대신 사용)
+CONTROL_HORIZON_BUMPS = 1  # 제동 계획에 함께 고려할 앞쪽 방지턱 수 (1: 방지턱 하나씩 따로 제어, 기존 동작 / kinematic·pi 플래너와 함께 3 권장)
+HORIZON_SEPARATION_M = 3.0  # 인지 거리와 이만큼 안의 카탈로그 방지턱을 같은 방지턱으로, 제동 중인 방지턱보다 이만큼 먼 인지는 다음 방지턱으로 본다
+BRAKE_MODEL_GAIN_MPS2 = 6.0  # 제동 명령 1.0 의 감속도 초기값 (제동 중 관측으로 갱신)
+BRAKE_MODEL_COAST_DECEL_MPS2 = 0.3
+BRAKE_MODEL_LEARNING_RATE = 0.2
 TARGET_SPEED_MARGIN_KMH = 3.0
 SCENARIO_RESTART_TRIGGER_X = 2100.0
 BUMP_PASS_DETECTION_THRESHOLD_M = 3.0
@@ -35,6 +81,10 @@ COMFORT_TARGETS_RMS = {
     '쾌적함': 0.5,
     '보통': 0.8
 }
+PLANNING_TABLE_HEIGHT_RANGE_M = (0.01, 0.40)  # 목표 속도 표의 높이/깊이 격자 (밖의 값은 직접 계산)
+PLANNING_TABLE_DEPTH_RANGE_M = (0.2, 6.0)
+PLANNING_TABLE_HEIGHT_STEP_M = 0.0025
+PLANNING_TABLE_DEPTH_STEP_M = 0.05
 INITIAL_PR_CALIBRATION = 0.06
 INITIAL_PWM_CALIBRATION = 1.0
 
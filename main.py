@@ -1,23 +1,27 @@
 # main.py
 import multiprocessing
 import sys
-import time
-import pythoncom
-from win32com.client import Dispatch, GetActiveObject
 
 from config import config
+from utils import com_runtime
+from utils.clock import REAL_CLOCK
 from src.vision import run_vision_processing
+from src.frame_source import RingFrameSource, run_frame_capture_producer
 from src.control import run_control_simulation
 from src.V2V import run_v2v_simulation
+from src.telemetry import run_telemetry_publisher
+from src.headless_sim import start_headless_world, run_headless_simulator, HeadlessWorldClock
 from src.evaluate import run_evaluate_node
 from utils.logger import setup_logging_area
+from utils.frame_ring import FrameRing
+from utils.bump_catalog import BumpCatalog, build_bump_catalog, bump_catalog_cache_dir
+from utils.telemetry_record import VehicleTelemetry
+from utils.mailbox import LatestValueMailbox
+from utils.packet import PERCEPTION_PACKET, encode_packet, decode_packet
 
-def initialize_simulation():
-    pythoncom.CoInitialize()
-    try:
-        ucwin = GetActiveObject(config.UCWIN_PROG_ID)
-    except:
-        ucwin = Dispatch(config.UCWIN_PROG_ID)
+def initialize_simulation(bump_catalog, clock=REAL_CLOCK):
+    com_runtime.co_initialize()
+    ucwin = com_runtime.attach_application()
 
     sim_core = ucwin.SimulationCore
     project = ucwin.Project
@@ -25,34 +29,51 @@ def initialize_simulation():
     try:
         if hasattr(sim_core, "StopAllScenarios"):
             sim_core.StopAllScenarios()
-            time.sleep(0.3)
+            clock.sleep(0.3)
     except:
         pass
 
     scenario = project.Scenario(0)
     sim_core.StartScenario(scenario)
-    time.sleep(0.8)
-    pythoncom.CoUninitialize()
+    clock.sleep(0.8)
+    bump_catalog.publish(build_bump_catalog(project, bump_catalog_cache_dir()))
+    com_runtime.co_uninitialize()
 
 if __name__ == '__main__':
     if sys.platform == "win32":
         multiprocessing.freeze_support()
 
     setup_logging_area()
-    initialize_simulation()
+    # 헤드리스 백엔드에서는 노드들이 시뮬레이터의 sim_time을 시각으로 쓴다. (월드 스텝 전인 초기화만 벽시계)
+    headless_world, clock = None, REAL_CLOCK
+    if config.UCWIN_BACKEND == "headless":
+        headless_world = start_headless_world()
+        clock = HeadlessWorldClock(headless_world)
+    bump_catalog = BumpCatalog.create(config.BUMP_CATALOG_CAPACITY)
+    initialize_simulation(bump_catalog)
 
-    vision_to_control_queue = multiprocessing.Queue()
+    vision_to_control_queue = LatestValueMailbox(PERCEPTION_PACKET.size, encode_packet, decode_packet)
     v2v_to_vision_queue = multiprocessing.Queue()
     control_to_eval_queue = multiprocessing.Queue()
     eval_to_control_queue = multiprocessing.Queue()
-    forward_vehicle_distance = multiprocessing.Value('d', 999.9)
+    telemetry = VehicleTelemetry.create()
+
+    frame_ring, frame_source = None, None
+    if config.VISION_FRAME_RING:
+        frame_ring = FrameRing.create(config.VISION_FRAME_RING_SLOTS, config.VISION_FRAME_RING_MAX_SIZE)
+        frame_source = RingFrameSource(frame_ring)
 
     processes = [
-        multiprocessing.Process(target=run_vision_processing, args=(vision_to_control_queue, v2v_to_vision_queue, forward_vehicle_distance)),
-        multiprocessing.Process(target=run_control_simulation, args=(vision_to_control_queue, control_to_eval_queue, eval_to_control_queue)),
-        multiprocessing.Process(target=run_v2v_simulation, args=(v2v_to_vision_queue, forward_vehicle_distance)),
-        multiprocessing.Process(target=run_evaluate_node, args=(control_to_eval_queue, eval_to_control_queue))
+        multiprocessing.Process(target=run_telemetry_publisher, args=(telemetry,), kwargs={'clock': clock}),
+        multiprocessing.Process(target=run_vision_processing, args=(vision_to_control_queue, v2v_to_vision_queue, telemetry, frame_source, bump_catalog), kwargs={'clock': clock}),
+        multiprocessing.Process(target=run_control_simulation, args=(vision_to_control_queue, control_to_eval_queue, eval_to_control_queue, bump_catalog, telemetry), kwargs={'clock': clock}),
+        multiprocessing.Process(target=run_v2v_simulation, args=(v2v_to_vision_queue, telemetry, bump_catalog), kwargs={'clock': clock}),
+        multiprocessing.Process(target=run_evaluate_node, args=(control_to_eval_queue, eval_to_control_queue), kwargs={'clock': clock})
     ]
+    if headless_world is not None:
+        processes.append(multiprocessing.Process(target=run_headless_simulator, args=(headless_world,)))
+    if frame_ring is not None:
+        processes.append(multiprocessing.Process(target=run_frame_capture_producer, args=(frame_ring,), kwargs={'clock': clock}))
 
     for p in processes:
         p.start()
@@ -64,4 +85,11 @@ if __name__ == '__main__':
         for p in processes:
             if p.is_alive():
                 p.terminate()
-                p.join()
\ No newline at end of file
+                p.join()
+    finally:
+        if frame_ring is not None:
+            frame_ring.close()
+        bump_catalog.close()
+        telemetry.close()
+        if headless_world is not None:
+            headless_world.close()
\ No newline at end of file
@@ -1,10 +1,27 @@
-﻿import win32com.client as com
+﻿try:
+    import win32com.client as com
+except ImportError:
+    com = None
+
+# 플러그인 디렉토리에서 샘플로 직접 실행될 때는 config 가 없으므로 COM 백엔드를 쓴다.
+try:
+    from config import config
+    DEFAULT_BACKEND = config.UCWIN_BACKEND
+except ImportError:
+    DEFAULT_BACKEND = "com"
 
 class UCwinRoadComProxy:
     PROG_ID = "UCwinRoad.UCwinRoadCom_1723"
     
-    def __init__(self):
-        self.UCwinRoadCOM = com.gencache.EnsureDispatch(self.PROG_ID)
+    # backend: "com"(UC-win/Road) 또는 "headless"(src/headless_sim.py). 지정하지 않으면 DEFAULT_BACKEND
+    def __init__(self, backend=None):
+        if (backend or DEFAULT_BACKEND) == "headless":
+            from src import headless_sim
+            self.UCwinRoadCOM = headless_sim.connect()
+            const = headless_sim.constants
+        else:
+            self.UCwinRoadCOM = com.gencache.EnsureDispatch(self.PROG_ID)
+            const = com.constants
         self.ApplicationServices = self.UCwinRoadCOM.ApplicationServices
         self.Project = self.ApplicationServices.Project
         self.MainForm = self.ApplicationServices.MainForm
@@ -12,7 +29,7 @@ class UCwinRoadComProxy:
         self.GazeTrackingPlugin = self.ApplicationServices.GazeTrackingPlugin
         self.VirtualDisplaysPlugin = self.ApplicationServices.VirtualDisplaysPlugin
         self.CoordinateConverter = self.ApplicationServices.CoordinateConverter
-        self.const = com.constants
+        self.const = const
 
     def __del__(self):
         self.UCwinRoadCOM = None
@@ -0,0 +1,120 @@
+# src/brake_actuator.py
+import threading
+
+from config import config
+from utils import com_runtime
+from utils.clock import REAL_CLOCK
+
+# 제동 강도(0~1)를 차량 입력으로 바꾸는 계층. 제어 루프는 apply(level)만 호출하고 대기하지 않는다.
+def has_analog_brake(car):
+    try:
+        float(car.Brake)
+        return True
+    except Exception:
+        return False
+
+# 차량의 Brake 아날로그 입력에 강도를 그대로 쓴다. 값이 바뀔 때만 COM write 한다.
+class AnalogBrakeActuator:
+    kind = "analog"
+
+    def __init__(self, car):
+        self.car = car
+        self.level = 0.0
+
+    def apply(self, level):
+        level = max(0.0, min(1.0, level))
+        if level == self.level: return
+        if level > 0 and self.level == 0: self.car.Throttle = 0.0
+        self.car.Brake = level
+        self.level = level
+
+    def release(self):
+        self.apply(0.0)
+
+    def step(self):
+        pass
+
+    def close(self):
+        try: self.release()
+        except Exception: pass
+
+# Brake 입력이 없는 차량용: ParkingBrake를 period 주기, level 비율로 on/off 한다.
+# threaded=True 이면 전용 타이머 스레드가 토글하고(스레드는 마샬링한 자체 COM 프록시를 쓴다),
+# False 이면 호출자가 시뮬레이터 스텝마다 step()을 불러 위상을 진행한다 (배치 러너).
+class PwmBrakeActuator:
+    kind = "pwm"
+
+    def __init__(self, car, period=config.CONTROL_POLL_DT, clock=REAL_CLOCK, threaded=True):
+        self.car = car
+        self.period = period
+        self.clock = clock
+        self.level = 0.0
+        self.engaged = False
+        self.phase_start = clock.monotonic()
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopped = False
+        self.thread = None
+        if threaded:
+            get_car = com_runtime.marshal_to_thread(car)
+            self.thread = threading.Thread(target=self._run, args=(get_car,), name="brake-pwm", daemon=True)
+            self.thread.start()
+
+    def apply(self, level):
+        level = max(0.0, min(1.0, level))
+        with self.lock:
+            if level > 0 and self.level == 0: self.phase_start = self.clock.monotonic()
+            self.level = level
+        if self.thread is None: self.step()
+        else: self.wake.set()
+
+    # 타이머 스레드가 on 구간 대기 중이어도 바로 풀리도록 호출 스레드에서 ParkingBrake를 직접 내린다.
+    def release(self):
+        self.apply(0.0)
+        if self.thread is None: return
+        self.car.ParkingBrake = False
+        with self.lock: self.engaged = False
+
+    # 현재 위상에서 ParkingBrake 상태를 맞추고, 다음 on/off 경계까지 남은 시간을 돌려준다.
+    def _update(self, car, now):
+        with self.lock:
+            level, phase = self.level, (now - self.phase_start) % self.period
+        on_time = level * self.period
+        engage = level >= 1.0 or phase < on_time
+        if engage != self.engaged:
+            if engage: car.Throttle = 0.0
+            car.ParkingBrake = engage
+            self.engaged = engage
+        if level <= 0.0 or level >= 1.0: return None
+        return (on_time - phase) if engage else (self.period - phase)
+
+    def step(self):
+        self._update(self.car, self.clock.monotonic())
+
+    def _run(self, get_car):
+        com_runtime.co_initialize()
+        try:
+            car = get_car()
+            while not self.stopped:
+                try: delay = self._update(car, self.clock.monotonic())
+                except Exception: delay = self.period
+                if delay is None:
+                    self.wake.wait()
+                    self.wake.clear()
+                else:
+                    self.clock.sleep(delay)
+        finally:
+            com_runtime.co_uninitialize()
+
+    def close(self):
+        self.stopped = True
+        self.level = 0.0
+        self.wake.set()
+        if self.thread is not None: self.thread.join(timeout=1.0)
+        try: self.car.ParkingBrake = False
+        except Exception: pass
+
+def select_brake_actuator(car, mode=config.CONTROL_BRAKE_ACTUATOR, clock=REAL_CLOCK, threaded=True):
+    if mode == "analog" or (mode == "auto" and has_analog_brake(car)):
+        return AnalogBrakeActuator(car)
+    return PwmBrakeActuator(car, clock=clock, threaded=threaded)
@@ -0,0 +1,150 @@
+# src/braking_planner.py
+import numpy as np
+
+from config import config
+
+# 방지턱까지 남은 거리 안에서 목표 속도로 줄이는 등감속 프로파일로 제동 명령을 정한다.
+# 함수들은 속도/거리 인자에 스칼라나 같은 모양의 배열을 받아 그대로 브로드캐스트한다 (격자 평가용).
+def _result(value):
+    return float(value) if np.ndim(value) == 0 else value
+
+# 감속에 쓸 수 있는 남은 거리: 방지턱까지 거리에서 여유 거리와 제어 지연(latency_s) 동안 달리는 거리를 뺀다 (0 이하면 남은 거리 없음).
+def remaining_distance(speed_kmh, distance_m, latency_s=0.0, margin_m=config.PLANNER_DISTANCE_MARGIN_M):
+    return np.asarray(distance_m, dtype=float) - margin_m - np.asarray(speed_kmh, dtype=float) / 3.6 * latency_s
+
+# a = (v² - vt²) / 2d (d는 remaining_distance), 남은 거리가 없으면 inf
+def required_deceleration(speed_kmh, target_kmh, distance_m, latency_s=0.0, margin_m=config.PLANNER_DISTANCE_MARGIN_M):
+    v = np.asarray(speed_kmh, dtype=float) / 3.6
+    vt = np.asarray(target_kmh, dtype=float) / 3.6
+    d = remaining_distance(speed_kmh, distance_m, latency_s, margin_m)
+    dv2 = np.maximum(v * v - vt * vt, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decel = np.where(d > 0, dv2 / (2.0 * d), np.where(dv2 > 0, np.inf, 0.0))
+    return _result(decel)
+
+# 감속도 decel_mps2 로 목표 속도에 맞추려면 제동을 시작해야 하는 거리
+def braking_start_distance(speed_kmh, target_kmh, decel_mps2, latency_s=0.0, margin_m=config.PLANNER_DISTANCE_MARGIN_M):
+    v = np.asarray(speed_kmh, dtype=float) / 3.6
+    vt = np.asarray(target_kmh, dtype=float) / 3.6
+    return _result(np.maximum(v * v - vt * vt, 0.0) / (2.0 * decel_mps2) + margin_m + v * latency_s)
+
+# 제동 명령 u(0~1) → 감속도 a = gain * u + coast 선형 모델. gain은 제동 중 관측한 감속도로 지수 평균 갱신한다.
+class BrakeActuatorModel:
+    MIN_OBSERVED_COMMAND = 0.2
+
+    def __init__(self, gain=config.BRAKE_MODEL_GAIN_MPS2, coast=config.BRAKE_MODEL_COAST_DECEL_MPS2,
+                 learning_rate=config.BRAKE_MODEL_LEARNING_RATE):
+        self.gain = gain
+        self.coast = coast
+        self.learning_rate = learning_rate
+        self.observations = 0
+
+    def command(self, decel_mps2):
+        return _result(np.clip((np.asarray(decel_mps2, dtype=float) - self.coast) / self.gain, 0.0, 1.0))
+
+    def observe(self, command, decel_mps2):
+        if command < self.MIN_OBSERVED_COMMAND: return
+        gain = (decel_mps2 - self.coast) / command
+        gain = min(4.0 * self.gain, max(0.25 * self.gain, gain))
+        self.gain += self.learning_rate * (gain - self.gain)
+        self.observations += 1
+
+# 필요 감속도가 start_decel 에 도달할 때까지는 제동하지 않고, 그 뒤로는 매 tick 남은 거리로 재계획해 필요 감속도를 추종한다.
+# weight(PWM 보정 계수)는 필요 감속도에 곱해, 평가 노드가 목표보다 빠르게 통과했다고 보정하면 더 일찍/세게 제동한다.
+class KinematicBrakePlanner:
+    def __init__(self, model=None, start_decel=config.PLANNER_START_DECEL_MPS2, latency_s=config.CONTROL_POLL_DT):
+        self.model = model if model is not None else BrakeActuatorModel()
+        self.start_decel = start_decel
+        self.latency_s = latency_s
+        self.weight = 1.0
+        self.engaged = False
+        self.last_sample = None
+
+    # 남은 거리가 없으면 필요 감속도가 inf라 최대 제동이 되므로, 방지턱 직전에서는 목표 속도의 여유(TARGET_SPEED_MARGIN_KMH) 안의
+    # 초과로는 제동하지 않는다 (방지턱 위 급제동 방지).
+    def command(self, speed_kmh, target_kmh, distance_m, weight=1.0, engaged=False):
+        speed, target = np.asarray(speed_kmh, dtype=float), np.asarray(target_kmh, dtype=float)
+        decel = np.asarray(required_deceleration(speed, target, distance_m, self.latency_s)) * weight
+        level = np.where(engaged | (decel >= self.start_decel), self.model.command(np.minimum(decel, 1e3)), 0.0)
+        at_bump = remaining_distance(speed, distance_m, self.latency_s) <= 0
+        level = np.where(at_bump & (speed - target <= config.TARGET_SPEED_MARGIN_KMH), 0.0, level)
+        return _result(np.where(speed > target, level, 0.0))
+
+    def begin(self, weight=1.0, engaged=False):
+        self.weight = weight
+        self.engaged = engaged
+        self.last_sample = None
+
+    # 세션 tick: 직전 명령 구간의 실제 감속도로 모델을 갱신하고 이번 명령을 돌려준다.
+    def step(self, now, distance_m, speed_kmh, target_kmh):
+        if self.last_sample is not None:
+            last_time, last_speed, last_level = self.last_sample
+            if now - last_time > 1e-3:
+                self.model.observe(last_level, (last_speed - speed_kmh) / 3.6 / (now - last_time))
+        level = self.command(speed_kmh, target_kmh, distance_m, self.weight, self.engaged)
+        self.engaged = self.engaged or level > 0
+        self.last_sample = (now, speed_kmh, level)
+        return level
+
+# 기준 속도 궤적 v_ref(d) = min(v_entry, sqrt(vt² + 2·a_ref·d)) 를 PI로 추종한다 (d는 지연/여유 거리를 뺀 남은 거리).
+# 감속 구간에서는 a_ref 에 해당하는 명령을 feedforward로 더하고, 포화 방향으로는 적분하지 않으며(anti-windup),
+# 명령 변화량은 첫 tick과 목표 속도 도달 후 해제까지 포함해 항상 rate_limit [1/s]로 제한한다. 적분/직전 명령 상태는 세션 동안 tick 사이에 유지되고,
+# 제동 중이던 세션을 이어받으면(engaged) 다음 세션으로도 넘어가 명령이 0에서 다시 시작하지 않는다.
+class SpeedTrackingController(KinematicBrakePlanner):
+    def __init__(self, model=None, reference_decel=config.PLANNER_START_DECEL_MPS2, latency_s=config.CONTROL_POLL_DT,
+                 kp=config.SPEED_PI_KP, ki=config.SPEED_PI_KI, rate_limit=config.SPEED_PI_RATE_LIMIT):
+        super().__init__(model, reference_decel, latency_s)
+        self.kp, self.ki, self.rate_limit = kp, ki, rate_limit
+        self.integral = 0.0
+        self.level = 0.0
+        self.entry_speed_kmh = None
+
+    def reference_speed(self, distance_m, target_kmh, entry_kmh, speed_kmh):
+        d = np.maximum(remaining_distance(speed_kmh, distance_m, self.latency_s), 0.0)
+        v_ref = np.sqrt((np.asarray(target_kmh, dtype=float) / 3.6) ** 2 + 2.0 * self.start_decel * d)
+        return np.minimum(v_ref, np.asarray(entry_kmh, dtype=float) / 3.6)
+
+    # 적분 상태 없이 계산한 PI 명령 (plan_bump_response 의 초기 강도와 격자 평가용)
+    def command(self, speed_kmh, target_kmh, distance_m, weight=1.0, engaged=False):
+        v_ref = self.reference_speed(distance_m, target_kmh, speed_kmh, speed_kmh)
+        error = np.asarray(speed_kmh, dtype=float) / 3.6 - v_ref
+        feedforward = np.where(v_ref < np.asarray(speed_kmh, dtype=float) / 3.6, self.model.command(self.start_decel * weight), 0.0)
+        return _result(np.clip(feedforward + self.kp * error, 0.0, 1.0))
+
+    def begin(self, weight=1.0, engaged=False):
+        super().begin(weight, engaged)
+        if not engaged:
+            self.integral = 0.0
+            self.level = 0.0
+        self.entry_speed_kmh = None
+
+    def step(self, now, distance_m, speed_kmh, target_kmh):
+        dt = self.latency_s
+        if self.last_sample is not None:
+            last_time, last_speed, last_level = self.last_sample
+            dt = now - last_time
+            if dt > 1e-3: self.model.observe(last_level, (last_speed - speed_kmh) / 3.6 / dt)
+        if self.entry_speed_kmh is None: self.entry_speed_kmh = speed_kmh
+        dt = max(dt, 0.0)
+
+        v_ref = float(self.reference_speed(distance_m, target_kmh, self.entry_speed_kmh, speed_kmh))
+        error = speed_kmh / 3.6 - v_ref
+        feedforward = self.model.command(self.start_decel * self.weight) if v_ref < self.entry_speed_kmh / 3.6 else 0.0
+        unclamped = feedforward + self.kp * error + self.ki * (self.integral + error * dt)
+        if (unclamped < 1.0 or error < 0) and (unclamped > 0.0 or error > 0):
+            self.integral += error * dt
+        level = min(1.0, max(0.0, feedforward + self.kp * error + self.ki * self.integral))
+        if speed_kmh <= target_kmh and error <= 0: level = 0.0
+        max_change = self.rate_limit * dt
+        level = min(self.level + max_change, max(self.level - max_change, level))
+
+        self.engaged = self.engaged or level > 0
+        self.level = level
+        self.last_sample = (now, speed_kmh, level)
+        return level
+
+# model을 넘기면 다른 플래너와 학습한 제동 모델을 공유한다.
+def make_brake_planner(kind=config.CONTROL_BRAKE_PLANNER, start_decel=config.PLANNER_START_DECEL_MPS2, model=None):
+    if kind == "kinematic": return KinematicBrakePlanner(model, start_decel)
+    if kind == "pi": return SpeedTrackingController(model, start_decel)
+    return None
@@ -0,0 +1,67 @@
+# src/bump_lookahead.py
+from config import config
+from src.braking_planner import braking_start_distance
+from utils.bump_catalog import TYPE_KEYWORDS
+from utils.packet import make_perception_packet
+
+LOOKAHEAD_SOURCE = "Lookahead"
+
+# 카탈로그(ground truth)에서 진행 방향의 다음 방지턱을 추적한다.
+# 방지턱이 horizon_m 안에 들어오면 그 자리에서 목표 속도를 미리 계획해 두고, 완만한 감속도(decel_mps2)로
+# 목표 속도에 맞추려면 지금 제동을 시작해야 하는 거리에 도달했을 때 Lookahead 출처의 인지 패킷을 돌려준다.
+# 이 경우 Vision/V2V 인지는 제동을 시작시키지 않고 확인만 한다. 한 번 처리한 방지턱은 다시 트리거하지 않는다.
+# 높이/깊이가 0 이하인 카탈로그 항목은 제어가 받지 않으므로(매 루프 트리거만 반복) 추적하지 않는다.
+# horizon이 주어지면 다음 horizon.size개 방지턱을 함께 계획해 horizon에 넣고, 그중 하나라도 제동을 시작해야 하면
+# 가장 가까운 방지턱으로 트리거한다.
+class BumpLookahead:
+    def __init__(self, horizon_m=config.LOOKAHEAD_HORIZON_M, decel_mps2=config.LOOKAHEAD_DECEL_MPS2, latency_s=config.CONTROL_POLL_DT):
+        self.horizon_m = horizon_m
+        self.decel_mps2 = decel_mps2
+        self.latency_s = latency_s
+        self.handled_ids = set()
+        self.plans = {}
+        self.reset()
+
+    # 시나리오가 바뀌어 카탈로그를 다시 읽으면 호출한다.
+    def reset(self):
+        self.handled_ids.clear()
+        self.plans.clear()
+        self.bump = None
+        self.distance = None
+        self.plan = None
+        self.plan_gain = None
+
+    def mark_handled(self, bump):
+        if bump is None: return
+        self.handled_ids.add(bump['id'])
+        self.plans.pop(bump['id'], None)
+
+    # 추적 중인 방지턱과 미리 세운 계획 (target_speed, prediction_RMS, level_index) 를 갱신하고,
+    # 제동을 시작할 시점이면 트리거 패킷, 아니면 None 을 돌려준다.
+    def update(self, state, bump_index, planning_table, speed_map, horizon=None):
+        if not bump_index or not state.has_direction: return None
+        upcoming = bump_index.next_ahead(state.position, state.direction, horizon.size if horizon is not None else 1,
+                                         lambda b: b['type'] in TYPE_KEYWORDS and b['id'] not in self.handled_ids
+                                                   and b['GT_Height'] > 0 and b['GT_Depth'] > 0, self.horizon_m)
+        if not upcoming:
+            self.bump = self.distance = self.plan = None
+            return None
+
+        if planning_table.gain != self.plan_gain:
+            self.plans, self.plan_gain = {}, planning_table.gain
+        start_braking = False
+        for distance, bump in upcoming:
+            plan = self.plans.get(bump['id'])
+            if plan is None:
+                plan = self.plans[bump['id']] = planning_table.plan(bump['GT_Height'], bump['GT_Depth'], state.Speed_kmh, speed_map)
+                if horizon is not None: horizon.add(bump, plan[0], bump['GT_Height'], bump['GT_Depth'], LOOKAHEAD_SOURCE)
+            elif horizon is not None and bump not in horizon:
+                horizon.add(bump, plan[0], bump['GT_Height'], bump['GT_Depth'], LOOKAHEAD_SOURCE)
+            if state.Speed_kmh > plan[0] and braking_start_distance(state.Speed_kmh, plan[0], self.decel_mps2, self.latency_s) >= distance:
+                start_braking = True
+        self.distance, self.bump = upcoming[0]
+        self.plan = self.plans[self.bump['id']]
+
+        if not start_braking: return None
+        return make_perception_packet(self.bump['type'], LOOKAHEAD_SOURCE, self.bump['GT_Height'], self.distance, self.bump['GT_Depth'],
+                                      timestamp=state.timestamp)
@@ -0,0 +1,160 @@
+# src/capture.py
+import ctypes
+import numpy as np
+
+# 창 캡처 세션: HWND/DC/비트맵을 프레임 간에 재사용하고, 창 크기 변경 또는 창 소멸 시에만 재생성한다.
+# Win32 계층은 backend 뒤에 숨겨져 있어 SyntheticCaptureBackend로 Linux에서도 세션 로직을 검증할 수 있다.
+
+class _BitmapInfoHeader(ctypes.Structure):
+    _fields_ = [('biSize', ctypes.c_uint32), ('biWidth', ctypes.c_int32), ('biHeight', ctypes.c_int32),
+                ('biPlanes', ctypes.c_uint16), ('biBitCount', ctypes.c_uint16), ('biCompression', ctypes.c_uint32),
+                ('biSizeImage', ctypes.c_uint32), ('biXPelsPerMeter', ctypes.c_int32), ('biYPelsPerMeter', ctypes.c_int32),
+                ('biClrUsed', ctypes.c_uint32), ('biClrImportant', ctypes.c_uint32)]
+
+class GdiCaptureBackend:
+    def __init__(self):
+        import win32gui, win32ui, win32con
+        self.win32gui, self.win32ui, self.win32con = win32gui, win32ui, win32con
+        self.gdi32 = ctypes.windll.gdi32
+
+    def find_window(self, window_title):
+        hwnd = self.win32gui.FindWindow(None, window_title)
+        return hwnd if hwnd != 0 else None
+
+    def is_window(self, hwnd):
+        return bool(self.win32gui.IsWindow(hwnd))
+
+    def client_size(self, hwnd):
+        left, top, right, bot = self.win32gui.GetClientRect(hwnd)
+        return right - left, bot - top
+
+    def create_context(self, hwnd, w, h):
+        hwndDC = self.win32gui.GetWindowDC(hwnd)
+        mfcDC = self.win32ui.CreateDCFromHandle(hwndDC)
+        saveDC = mfcDC.CreateCompatibleDC()
+        saveBitMap = self.win32ui.CreateBitmap()
+        saveBitMap.CreateCompatibleBitmap(mfcDC, w, h)
+        saveDC.SelectObject(saveBitMap)
+        bmi = _BitmapInfoHeader()
+        bmi.biSize = ctypes.sizeof(_BitmapInfoHeader)
+        bmi.biWidth, bmi.biHeight = w, -h  # 음수 높이: top-down DIB
+        bmi.biPlanes, bmi.biBitCount, bmi.biCompression = 1, 32, 0
+        bgra = np.empty((h, w, 4), dtype=np.uint8)
+        return {'hwndDC': hwndDC, 'mfcDC': mfcDC, 'saveDC': saveDC, 'bitmap': saveBitMap, 'bmi': bmi, 'bgra': bgra}
+
+    def blit(self, hwnd, context, out):
+        h, w, _ = out.shape
+        saveDC = context['saveDC']
+        saveDC.BitBlt((0, 0), (w, h), context['mfcDC'], (0, 0), self.win32con.SRCCOPY)
+        bgra = context['bgra']
+        lines = self.gdi32.GetDIBits(saveDC.GetSafeHdc(), context['bitmap'].GetHandle(), 0, h,
+                                     bgra.ctypes.data_as(ctypes.c_void_p), ctypes.byref(context['bmi']), 0)
+        if lines != h: return False
+        np.copyto(out, bgra[..., :3])
+        return True
+
+    def release_context(self, hwnd, context):
+        self.win32gui.DeleteObject(context['bitmap'].GetHandle())
+        context['saveDC'].DeleteDC(); context['mfcDC'].DeleteDC()
+        self.win32gui.ReleaseDC(hwnd, context['hwndDC'])
+
+def render_synthetic_frame(window_title, frame_index, out):
+    h, w, _ = out.shape
+    out[:] = 90
+    band = (frame_index * 7) % max(1, h)
+    out[band:band + max(1, h // 20)] = (60, 200, 230)
+
+class SyntheticCaptureBackend:
+    def __init__(self, render=render_synthetic_frame):
+        self.render = render
+        self.windows = {}
+        self.next_hwnd = 1
+        self.frame_index = 0
+        self.contexts_created = 0
+        self.contexts_released = 0
+
+    def open_window(self, window_title, w, h):
+        self.windows[window_title] = {'hwnd': self.next_hwnd, 'size': (w, h)}
+        self.next_hwnd += 1
+
+    def resize_window(self, window_title, w, h):
+        self.windows[window_title]['size'] = (w, h)
+
+    def close_window(self, window_title):
+        self.windows.pop(window_title, None)
+
+    def _window_by_hwnd(self, hwnd):
+        for title, win in self.windows.items():
+            if win['hwnd'] == hwnd: return title, win
+        return None, None
+
+    def find_window(self, window_title):
+        win = self.windows.get(window_title)
+        return win['hwnd'] if win else None
+
+    def is_window(self, hwnd):
+        return self._window_by_hwnd(hwnd)[1] is not None
+
+    def client_size(self, hwnd):
+        _, win = self._window_by_hwnd(hwnd)
+        return win['size'] if win else (0, 0)
+
+    def create_context(self, hwnd, w, h):
+        self.contexts_created += 1
+        return {'size': (w, h)}
+
+    def blit(self, hwnd, context, out):
+        title, win = self._window_by_hwnd(hwnd)
+        if win is None: return False
+        self.render(title, self.frame_index, out)
+        self.frame_index += 1
+        return True
+
+    def release_context(self, hwnd, context):
+        self.contexts_released += 1
+
+class CaptureSession:
+    def __init__(self, window_title, backend=None):
+        self.window_title = window_title
+        self.backend = backend if backend is not None else GdiCaptureBackend()
+        self.hwnd = None
+        self.context = None
+        self.size = None
+        self.frame = None
+        self.rebuild_count = 0
+
+    def _release_context(self):
+        if self.context is not None:
+            try: self.backend.release_context(self.hwnd, self.context)
+            except Exception: pass
+        self.context, self.size = None, None
+
+    def release(self):
+        self._release_context()
+        self.hwnd = None
+
+    # 반환되는 프레임은 세션이 소유한 버퍼이므로 다음 grab() 호출 시 덮어써진다.
+    def grab(self):
+        try:
+            if self.hwnd is None or not self.backend.is_window(self.hwnd):
+                self.release()
+                self.hwnd = self.backend.find_window(self.window_title)
+                if self.hwnd is None: return None
+            w, h = self.backend.client_size(self.hwnd)
+            if w < 2 or h < 2:
+                self._release_context()
+                return None
+            if self.size != (w, h):
+                self._release_context()
+                self.context = self.backend.create_context(self.hwnd, w, h)
+                self.size = (w, h)
+                self.rebuild_count += 1
+                if self.frame is None or self.frame.shape[:2] != (h, w):
+                    self.frame = np.empty((h, w, 3), dtype=np.uint8)
+            if not self.backend.blit(self.hwnd, self.context, self.frame):
+                self.release()
+                return None
+            return self.frame
+        except Exception:
+            self.release()
+            return None
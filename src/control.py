@@ -1,82 +1,51 @@
 # src/control.py
-import time
 import math
 import queue
-import json
-import numpy as np
-import pythoncom
-from win32com.client import Dispatch, GetActiveObject
+import dataclasses
 
 from config import config
+from utils import com_runtime
+from utils.clock import REAL_CLOCK
 from utils.logger import print_at, log_sequence_to_file
 from samples.UCwinRoadCOM import UCwinRoadComProxy
-from samples.UCwinRoadUtils import Distance
+from src.control_callbacks import CallbackBrakeController, register_tick_handler, CloseCallbackEvent
+from src.brake_actuator import select_brake_actuator
+from src.braking_planner import make_brake_planner
+from src.planning_table import SpeedMap, PlanningTable, RMS_LEVELS
+from src.bump_lookahead import BumpLookahead, LOOKAHEAD_SOURCE
+from src.horizon_planner import BumpHorizon
+from utils.vehicle_state import VehicleStateReader
+from utils.telemetry_record import TelemetryStateReader
+from utils.bump_catalog import TYPE_KEYWORDS, build_bump_catalog, bump_catalog_cache_dir, BumpCatalogReader
 
-PROGID = "UCwinRoad.F8ApplicationServicesProxy"
-TYPE_TO_KEYWORD = {"A": "typea", "B": "typeb", "C": "typec"}
 
-def attach_or_launch():
-    try: return GetActiveObject(PROGID)
-    except: return Dispatch(PROGID)
-
-def restart_scenario(sim_core, proj, idx=0):
+def restart_scenario(sim_core, proj, idx=0, clock=REAL_CLOCK):
     try:
         if hasattr(sim_core, "StopAllScenarios"):
-            sim_core.StopAllScenarios(); time.sleep(0.3)
+            sim_core.StopAllScenarios(); clock.sleep(0.3)
     except: pass
-    sc = proj.Scenario(idx); sim_core.StartScenario(sc); time.sleep(0.8)
-
-def read_speed_kmh(car):
-    try: return float(car.Speed(1))
-    except: return 0.0
+    sc = proj.Scenario(idx); sim_core.StartScenario(sc); clock.sleep(0.8)
 
-def vector_magnitude(v_obj):
-    try: return math.sqrt(v_obj.X**2 + v_obj.Y**2 + v_obj.Z**2)
-    except Exception: return 0.0
+def wait_for_current_car(driver, clock=REAL_CLOCK, timeout=15.0):
+    car = None; t0 = clock.monotonic()
+    while car is None and clock.monotonic() - t0 < timeout:
+        car = driver.CurrentCar; clock.sleep(0.2)
+    if car is None: raise RuntimeError()
+    return car
 
-def find_all_bumps_and_cache(project):
-    ThreeDModelGT_cache = []
-    try:
-        instance_count = project.ThreeDModelInstancesCount
-        for i in range(instance_count):
-            instance = project.ThreeDModelInstance(i)
-            if any(keyword in instance.Name.lower() for keyword in TYPE_TO_KEYWORD.values()):
-                height, depth = 0.0, 0.0
-                if instance.BoundingBoxesCount > 0:
-                    bbox = instance.BoundingBox(0)
-                    height = vector_magnitude(bbox.yAxis) * 2
-                    depth = vector_magnitude(bbox.zAxis) * 2
-                ThreeDModelGT_cache.append({
-                    "instance": instance, "name": instance.Name,
-                    "GT_Height": height, "GT_Depth": depth
-                })
-    except Exception:
-        pass
-    return ThreeDModelGT_cache
+# 시나리오 로드 직후 카탈로그를 새로 만들어 다른 프로세스에도 발행한다.
+def reload_bump_catalog(proj, bump_catalog_reader):
+    records = build_bump_catalog(proj, bump_catalog_cache_dir())
+    generation = -1
+    if bump_catalog_reader.bump_catalog is not None:
+        generation = bump_catalog_reader.bump_catalog.publish(records)
+    bump_catalog_reader.load(records, generation)
 
-def find_target_bump(car, bump_type, bump_cache):
-    keyword = TYPE_TO_KEYWORD.get(bump_type)
-    if not keyword or not bump_cache: return None
+def find_target_bump(state, bump_type, bump_index):
+    if bump_type not in TYPE_KEYWORDS or not bump_index: return None
 
-    car_pos = car.Position
-    car_dir = car.Direction
-    
-    relevant_bumps = [b for b in bump_cache if keyword in b["name"].lower()]
-    if not relevant_bumps: return None
-
-    closest_dist = float('inf')
-    target_bump = None
-
-    for bump_data in relevant_bumps:
-        bump_pos = bump_data["instance"].Position
-        vec_to_bump_x = bump_pos.X - car_pos.X
-        vec_to_bump_z = bump_pos.Z - car_pos.Z
-        dot_product = (car_dir.X * vec_to_bump_x) + (car_dir.Z * vec_to_bump_z)
-        if dot_product > 0:
-            dist = Distance(car_pos, bump_pos)
-            if dist < closest_dist:
-                closest_dist = dist
-                target_bump = bump_data
+    _, target_bump = bump_index.nearest_ahead(state.position, state.direction,
+                                              lambda b: b["type"] == bump_type)
     return target_bump
 
 def calculate_rms(h_m, L_m, v_mps, gain):
@@ -99,16 +68,9 @@ def solve_speed_for_target_rms(h_m, L_m, target_rms, gain):
     if denominator <= 0: return 0.0
     return math.sqrt(target_rms / denominator)
 
-def estimate_min_speed_kmh(current_speed, speed_map_data):
-    if not speed_map_data: return 20.0
-    
-    x_speeds_str = sorted(speed_map_data.keys(), key=int)
-    x_speeds = [int(s) for s in x_speeds_str]
-    y_ms = [speed_map_data[s] for s in x_speeds_str]
-    
-    if current_speed <= x_speeds[0]: return y_ms[0]
-    if current_speed >= x_speeds[-1]: return y_ms[-1]
-    return np.interp(current_speed, x_speeds, y_ms)
+def estimate_min_speed_kmh(current_speed, speed_map):
+    if not isinstance(speed_map, SpeedMap): speed_map = SpeedMap(speed_map)
+    return speed_map.min_speed(current_speed)
 
 def calculate_brake_pwm(current_speed, target_speed, bump_distance, weight):
     speed_diff = max(0, current_speed - target_speed)
@@ -118,35 +80,249 @@ def calculate_brake_pwm(current_speed, target_speed, bump_distance, weight):
     raw_pwm = weight * ((0.7 * speed_diff_factor) + (0.7 * distance_factor))
     return max(0.5, min(1.0, raw_pwm))
 
-def run_control_simulation(vision_to_control_queue, control_to_eval_queue, eval_to_control_queue):
-    pythoncom.CoInitialize()
+# 측정된 방지턱 형상/거리와 현재 속도로 목표 속도와 제동 강도를 정한다.
+# 반환: (target_speed, Brake_PWM, prediction_RMS, prediction_Level). planner가 있으면 Brake_PWM은 현재 시점의 플래너 명령이다.
+# planning_table이 있으면 목표 속도를 표에서 찾는다 (pR_Calibration이 바뀌었으면 표를 먼저 다시 만든다).
+def plan_bump_response(Measured_Height, depth_m, bump_distance, current_speed, speed_map, pR_Calibration, PWM_Calibration, planner=None, planning_table=None):
+    if planning_table is not None:
+        planning_table.set_gain(pR_Calibration)
+        target_speed, prediction_RMS, level_index = planning_table.plan(Measured_Height, depth_m, current_speed, speed_map)
+        prediction_Level = RMS_LEVELS[level_index]
+    else:
+        target_speed, prediction_RMS, prediction_Level = _plan_target_speed(Measured_Height, depth_m, current_speed, speed_map, pR_Calibration)
     
-    pR_Calibration = config.INITIAL_PR_CALIBRATION
-    PWM_Calibration = config.INITIAL_PWM_CALIBRATION
+    if planner is not None: Brake_PWM = planner.command(current_speed, target_speed, bump_distance, PWM_Calibration)
+    else: Brake_PWM = calculate_brake_pwm(current_speed, target_speed, bump_distance, PWM_Calibration)
+    return target_speed, Brake_PWM, prediction_RMS, prediction_Level
+
+def _plan_target_speed(Measured_Height, depth_m, current_speed, speed_map, pR_Calibration):
+    minimum_Speed = estimate_min_speed_kmh(current_speed, speed_map)
+    prediction_RMS = calculate_rms(Measured_Height, depth_m, minimum_Speed / 3.6, pR_Calibration)
+    prediction_Level = classify_rms(prediction_RMS)
+    
+    if prediction_Level in ["불쾌함", "매우 불쾌함"]: target_speed = minimum_Speed
+    else:
+        target_rms = config.COMFORT_TARGETS_RMS.get(prediction_Level, 0.5)
+        optimal_v_mps = solve_speed_for_target_rms(Measured_Height, depth_m, target_rms, pR_Calibration)
+        target_speed = max(minimum_Speed, (optimal_v_mps * 3.6 if optimal_v_mps else 0) + config.TARGET_SPEED_MARGIN_KMH)
+    return target_speed, prediction_RMS, prediction_Level
+
+def load_speed_map(path=config.CALIBRATION_DATA_FILE_PATH):
+    return SpeedMap.load(path)
+
+# 방지턱 접근 중 제동 상태. 매 tick(폴링 주기 또는 시뮬레이터 스텝)마다 update()로 거리와 속도를 넣으면
+# 이번 tick에 제동할지(True/False)를 돌려주고, 시간 초과/이탈 시 None, 통과가 확인되면 finished를 세운다.
+# planner가 있으면 tick마다 남은 거리로 Brake_PWM을 다시 계산하고, 없으면 처음 정한 Brake_PWM으로 목표 속도까지 제동한다.
+# horizon이 있고 update()에 방향을 포함한 차량 상태가 오면, 이 방지턱과 horizon의 앞 방지턱들 중 가장 급한 제약으로 재계획한다.
+# resume=True 이면 직전 세션에서 이어지는 제동이므로 플래너를 제동 중 상태로 시작한다.
+class BrakingSession:
+    def __init__(self, target_speed, Brake_PWM, initial_dist, start_time, timeout=15.0, planner=None, PWM_Calibration=1.0, horizon=None, resume=False):
+        self.target_speed = target_speed
+        self.Brake_PWM = Brake_PWM
+        self.initial_dist = initial_dist
+        self.start_time = start_time
+        self.timeout = timeout
+        self.min_dist_so_far = float('inf')
+        self.has_approached = False
+        self.current_dist = initial_dist
+        self.speed = 0.0
+        self.finished = False
+        self.planner = planner
+        self.horizon = horizon
+        if planner is not None: planner.begin(PWM_Calibration, resume)
+
+    def update(self, now, current_dist, speed, state=None):
+        self.current_dist, self.speed = current_dist, speed
+        if now - self.start_time >= self.timeout or current_dist > self.initial_dist + 5.0:
+            self.finished = True
+            return None
+
+        self.min_dist_so_far = min(self.min_dist_so_far, current_dist)
+        if not self.has_approached and current_dist < config.BUMP_PASS_DETECTION_THRESHOLD_M:
+            self.has_approached = True
+
+        if self.planner is not None:
+            plan_dist, plan_target = current_dist, self.target_speed
+            if self.horizon is not None and state is not None:
+                plan_dist, plan_target = self.horizon.binding(state, current_dist, self.target_speed)
+            self.Brake_PWM = self.planner.step(now, plan_dist, speed, plan_target)
+            braking = self.Brake_PWM > 0
+        else:
+            braking = speed > self.target_speed
+        if self.has_approached and current_dist > self.min_dist_so_far + 0.1:
+            self.finished = True
+        return braking
+
+# 시작한 방지턱 제어 하나: 제동 세션과 로그/평가에 쓰는 계획 값. 선행 추적으로 시작했으면 confirmed_by에 확인한 인지 출처가 들어간다.
+@dataclasses.dataclass(slots=True)
+class BumpControl:
+    session: BrakingSession
+    bump: dict
+    bump_pos: tuple
+    source: str
+    planner: object
+    target_speed: float
+    Brake_PWM: float
+    prediction_RMS: float
+    prediction_Level: str
+    recv_log: str
+    plan_log: str
+    confirmed_by: str = None
+
+    @property
+    def detect_source(self):
+        return self.source if self.source != LOOKAHEAD_SOURCE else f"{self.source}+{self.confirmed_by or '미확인'}"
+
+# 인지 결과로 방지턱 제어를 시작/갱신/종료하는 결정 로직. run_control_simulation(노드)과 utils/scenario_runner(가상 시간 배치)가
+# 같은 객체로 결정하고, 호출하는 쪽은 입출력(인지 수신, 차량 상태, 제동 입력, 로그, 평가 큐)만 맡는다.
+# 대기 중에는 trigger()와 step()으로 제어를 시작하고, 제동 중에는 tick마다 track()을 부른 뒤 finish()로 평가 요청을 만든다.
+class ControlDecision:
+    def __init__(self, speed_map, pR_Calibration=config.INITIAL_PR_CALIBRATION, PWM_Calibration=config.INITIAL_PWM_CALIBRATION,
+                 planner_kind=config.CONTROL_BRAKE_PLANNER, lookahead=config.CONTROL_LOOKAHEAD, horizon_bumps=config.CONTROL_HORIZON_BUMPS,
+                 clock=REAL_CLOCK):
+        self.speed_map = speed_map
+        self.pR_Calibration = pR_Calibration
+        self.PWM_Calibration = PWM_Calibration
+        self.clock = clock
+        self.planning_table = PlanningTable(pR_Calibration)
+        self.brake_planner = make_brake_planner(planner_kind)
+        self.lookahead, self.lookahead_planner = None, None
+        if lookahead:
+            self.lookahead = BumpLookahead()
+            self.lookahead_planner = make_brake_planner(planner_kind, config.LOOKAHEAD_DECEL_MPS2, self.brake_planner.model if self.brake_planner else None)
+        self.horizon = BumpHorizon(horizon_bumps) if horizon_bumps > 1 else None
+        self.reset()
+
+    # 시나리오가 바뀌어 카탈로그를 다시 읽으면 호출한다.
+    def reset(self):
+        self.last_bump_type = "None"
+        self.last_bump_id = None
+        self.chain_ids = set()
+        if self.lookahead is not None: self.lookahead.reset()
+        if self.horizon is not None: self.horizon.clear()
+
+    # 인지를 기다리지 않고 제어를 시작할 수 있는 후보(선행 추적 또는 horizon에 남은 방지턱)가 있는지
+    @property
+    def armed(self):
+        return self.lookahead is not None or bool(self.horizon)
+
+    # 선행 추적이 제동 시작을 요구하거나, 직전 제동 중 인지해 horizon에 넣어 둔 방지턱이 있으면 그 트리거 패킷: (packet, bump)
+    def trigger(self, state, bump_index):
+        if self.lookahead is not None:
+            data = self.lookahead.update(state, bump_index, self.planning_table, self.speed_map, self.horizon)
+            if data is not None: return data, self.lookahead.bump
+        if self.horizon:
+            return self.horizon.next_pending(state, LOOKAHEAD_SOURCE)
+        return None, None
+
+    # 대기 중 인지 패킷(또는 trigger 패킷) 하나를 처리한다. 새로 나타난 방지턱이면 목표 속도를 계획하고 세션을 만들어 BumpControl을,
+    # 인지가 "None"으로 끊기지 않고 이어진 다음 방지턱이면 horizon에 넣어 다음 루프에서 제어하도록 하고 None을 돌려준다.
+    # state는 방향을 포함한 현재 차량 상태 (data.type이 "None"이면 쓰지 않는다).
+    def step(self, data, state, bump_index, trigger_bump=None):
+        control = None
+        if data.type != "None" and (self.last_bump_type == "None" or trigger_bump is not None):
+            control = self._begin(data, state, bump_index, trigger_bump)
+        elif data.type != "None" and self.horizon is not None:
+            self.horizon.add_perceived(data, state, bump_index, self.planning_table, self.speed_map)
+        self.last_bump_type = data.type
+        return control
+
+    # 트리거 패킷이 조건에 맞지 않으면 그 방지턱을 처리한 것으로 표시해 다음 루프에 같은 트리거를 반복하지 않는다.
+    def _begin(self, data, state, bump_index, trigger_bump):
+        if not all([isinstance(data.Measured_Height, float), isinstance(data.bump_distance, float), isinstance(data.depth_m, float), data.type]) \
+                or 'D' in str(data.type).upper() or data.Measured_Height <= 0 or data.depth_m <= 0:
+            if trigger_bump is not None: self._skip(trigger_bump)
+            return None
+
+        # 선행 추적으로 시작한 제동은 완만한 감속도의 플래너로 하고, 이후 같은 종류의 Vision/V2V 인지로 확인한다.
+        planner = self.lookahead_planner if data.source == LOOKAHEAD_SOURCE else self.brake_planner
+        target_speed, Brake_PWM, prediction_RMS, prediction_Level = plan_bump_response(
+            data.Measured_Height, data.depth_m, data.bump_distance, state.Speed_kmh, self.speed_map, self.pR_Calibration, self.PWM_Calibration,
+            planner, self.planning_table)
+
+        bump = trigger_bump if trigger_bump is not None else find_target_bump(state, data.type, bump_index)
+        if not bump: return None
+        self._skip(bump)
+        if bump['id'] == self.last_bump_id: return None
+        if self.horizon is not None: self.horizon.prune(state)
+
+        # 직전 세션이 제동하면서 이 방지턱까지 함께 추종했다면 제동 상태를 이어받아 사이에서 다시 가속하지 않는다.
+        session = BrakingSession(target_speed, Brake_PWM, data.bump_distance, self.clock.time(), planner=planner, PWM_Calibration=self.PWM_Calibration,
+                                 horizon=self.horizon, resume=bump['id'] in self.chain_ids)
+        recv_log = f"T:{data.type}, H:{data.Measured_Height*100:.1f}cm, Dt:{data.bump_distance:.1f}m, Dp:{data.depth_m:.2f}m"
+        if data.height_pixels:
+            recv_log += f", Q:{data.height_pixels}px/σ²{data.hue_variance:.1f}"
+        plan_log = f"tS:{target_speed:.1f}, pR:{prediction_RMS:.2f}, Comfort:{prediction_Level}"
+        return BumpControl(session, bump, (bump['x'], bump['y'], bump['z']), data.source, planner, target_speed, Brake_PWM, prediction_RMS,
+                           prediction_Level, recv_log, plan_log, None if data.source == LOOKAHEAD_SOURCE else data.source)
+
+    # 이 방지턱으로는 다시 트리거하지 않는다 (선행 추적 처리 표시, horizon에서 제거).
+    def _skip(self, bump):
+        if self.lookahead is not None: self.lookahead.mark_handled(bump)
+        if self.horizon is not None: self.horizon.discard(bump)
+
+    # 제동 중 tick: horizon을 갱신하고(선행 추적의 다음 방지턱들, 세션 방지턱보다 먼 방지턱의 인지), 선행 추적으로 시작한 제어를
+    # 같은 종류의 Vision/V2V 인지로 확인한다. data는 이번 tick에 받은 인지 패킷(없으면 None), 이번 tick에 확인되었으면 True
+    # state가 None(텔레메트리에 ego 없음)이면 이번 tick의 horizon 갱신은 건너뛴다.
+    def track(self, control, data, state, bump_index):
+        if self.horizon is not None and state is not None:
+            if self.lookahead is not None:
+                self.lookahead.update(state, bump_index, self.planning_table, self.speed_map, self.horizon)
+            if data is not None:
+                self.horizon.add_perceived(data, state, bump_index, self.planning_table, self.speed_map, control.session.current_dist, control.bump)
+        if data is None or control.confirmed_by is not None: return False
+        if data.type != control.bump['type'] or data.source == LOOKAHEAD_SOURCE: return False
+        control.confirmed_by = data.source
+        return True
+
+    # 제어를 끝내고 평가 요청을 만든다. 세션이 horizon의 다음 방지턱까지 제동 중이었으면 그 방지턱들의 세션이 제동 상태를 이어받는다.
+    # 간격이 짧으면 인지가 "None"으로 끊기지 않고 다음 방지턱으로 이어지므로, 방금 처리한 방지턱만 빼고 다시 제어를 시작할 수 있게 한다.
+    def finish(self, control, end_control_speed):
+        self.last_bump_type, self.last_bump_id = "None", control.bump['id']
+        engaged = self.horizon is not None and control.planner is not None and control.planner.engaged
+        self.chain_ids = set(self.horizon.targets) if engaged else set()
+        return {"msg": "evaluate_request", "current_speed": end_control_speed, "target_speed": control.target_speed, "prediction_RMS": control.prediction_RMS,
+                "GT_Height": control.bump["GT_Height"], "GT_Depth": control.bump["GT_Depth"],
+                "current_pR_Calibration": self.pR_Calibration, "current_PWM_Calibration": self.PWM_Calibration}
+
+    # Evaluate 응답의 보정 계수를 적용하고 보정 로그를 돌려준다 (보정 응답이 아니면 None).
+    def apply_correction(self, response):
+        if response.get("msg") != "final_correction_factors": return None
+        old_gain, old_pwm = self.pR_Calibration, self.PWM_Calibration
+        self.pR_Calibration = response.get("updated_pR_Calibration")
+        self.PWM_Calibration = response.get("updated_PWM_Calibration")
+        self.planning_table.set_gain(self.pR_Calibration)
+        return (f"[Control] 보정 적용: pR_CAL {old_gain:.4f}→{self.pR_Calibration:.4f} | "
+                f"PWM_CAL {old_pwm:.2f}→{self.PWM_Calibration:.2f}")
+
+def run_control_simulation(vision_to_control_queue, control_to_eval_queue, eval_to_control_queue, bump_catalog=None, telemetry=None, clock=REAL_CLOCK):
+    com_runtime.co_initialize()
 
     try:
-        ucwin = attach_or_launch()
+        ucwin = com_runtime.attach_application()
         sim_core = ucwin.SimulationCore; proj = ucwin.Project; driver = sim_core.TrafficSimulation.Driver
         
-        car = None; t0 = time.time()
-        while car is None and time.time() - t0 < 15.0:
-            car = driver.CurrentCar; time.sleep(0.2)
-        if car is None: raise RuntimeError()
+        car = wait_for_current_car(driver, clock)
+        vehicle_reader = TelemetryStateReader(telemetry) if telemetry is not None else VehicleStateReader(car, clock)
         
-        ThreeDModelGT_cache = find_all_bumps_and_cache(proj)
+        bump_catalog_reader = BumpCatalogReader(bump_catalog)
+        if not bump_catalog_reader.refresh():
+            reload_bump_catalog(proj, bump_catalog_reader)
+
+        tick_controller, tick_events = None, []
+        callback_mode = config.CONTROL_MODE == "callback" and config.UCWIN_BACKEND != "headless"
+        brake_actuator = select_brake_actuator(car, clock=clock, threaded=not callback_mode)
+        if callback_mode:
+            tick_controller = CallbackBrakeController(clock, brake_actuator.kind == "analog")
+            register_tick_handler(car, tick_controller, tick_events)
         
-        try:
-            with open(config.CALIBRATION_DATA_FILE_PATH, 'r') as f:
-                speed_map_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            speed_map_data = {}
+        decision = ControlDecision(load_speed_map(), clock=clock)
         
     except Exception:
-        pythoncom.CoUninitialize()
+        com_runtime.co_uninitialize()
         return
 
     Is_Controlling = False
-    last_bump_type = "None"
     current_scenario = 0
     switched_this_round = False
     last_x = None
@@ -155,23 +331,29 @@ def run_control_simulation(vision_to_control_queue, control_to_eval_queue, eval_
 
     while True:
         try:
-            pos = car.Position
-            x = float(pos.X)
+            state = vehicle_reader.refresh()
+            if state is None:
+                clock.sleep(0.5)
+                continue
+            x = state.Pos_X
             if last_x is not None and last_x > config.SCENARIO_RESTART_TRIGGER_X and x <= config.SCENARIO_RESTART_TRIGGER_X and not switched_this_round:
                 current_scenario = 1 if current_scenario == 0 else 0
-                restart_scenario(sim_core, proj, current_scenario)
+                restart_scenario(sim_core, proj, current_scenario, clock)
                 
-                car = None; t0 = time.time()
-                while car is None and time.time() - t0 < 15.0: car = driver.CurrentCar; time.sleep(0.2)
-                if car is None: raise RuntimeError()
+                car = wait_for_current_car(driver, clock)
+                vehicle_reader.attach(car)
+                brake_actuator.close()
+                brake_actuator = select_brake_actuator(car, clock=clock, threaded=tick_controller is None)
 
-                ThreeDModelGT_cache = find_all_bumps_and_cache(proj)
+                reload_bump_catalog(proj, bump_catalog_reader)
+                if tick_controller is not None:
+                    CloseCallbackEvent(tick_events)
+                    register_tick_handler(car, tick_controller, tick_events)
                 
                 Is_Controlling = False
-                last_bump_type = "None" 
+                decision.reset()
                 pending_correction_data = None
-                while not vision_to_control_queue.empty():
-                    vision_to_control_queue.get()
+                vision_to_control_queue.discard()
                 print_at('DEBUG_DISTANCE', "")
 
                 switched_this_round = True
@@ -180,123 +362,100 @@ def run_control_simulation(vision_to_control_queue, control_to_eval_queue, eval_
             last_x = x
 
             if not Is_Controlling and pending_correction_data:
-                if pending_correction_data.get("msg") == "final_correction_factors":
-                    old_gain, old_pwm = pR_Calibration, PWM_Calibration
-                    pR_Calibration = pending_correction_data.get("updated_pR_Calibration")
-                    PWM_Calibration = pending_correction_data.get("updated_PWM_Calibration")
-                    
-                    correction_log = (f"[Control] 보정 적용: pR_CAL {old_gain:.4f}→{pR_Calibration:.4f} | "
-                                      f"PWM_CAL {old_pwm:.2f}→{PWM_Calibration:.2f}")
+                correction_log = decision.apply_correction(pending_correction_data)
+                if correction_log is not None:
                     print_at('CONTROL_CORRECTION', correction_log)
                     correction_log_for_file = correction_log
                 pending_correction_data = None
 
-            data = vision_to_control_queue.get(timeout=0.1)
-            
-            if data['type'] != "None" and last_bump_type == "None" and not Is_Controlling:
-                Measured_Height = data.get('Measured_Height')
-                bump_distance = data.get('bump_distance')
-                depth_m = data.get('depth_m')
-                bump_type = data.get('type')
-                
-                if not all([isinstance(Measured_Height, float), isinstance(bump_distance, float), isinstance(depth_m, float), bump_type]):
-                    last_bump_type = data.get('type', 'None')
-                    continue
+            data, trigger_bump = None, None
+            if decision.armed:
+                state = vehicle_reader.snapshot(with_direction=True)
+                if state is not None: data, trigger_bump = decision.trigger(state, bump_catalog_reader.index)
+            if data is None:
+                data = vision_to_control_queue.get(timeout=0.1)
 
-                if 'D' in str(bump_type).upper() or Measured_Height <= 0 or depth_m <= 0:
-                    last_bump_type = data.get('type', 'None')
-                    continue
+            state = None
+            if data.type != "None":
+                state = vehicle_reader.refresh(with_direction=True)
+                if state is None: continue
+            control = decision.step(data, state, bump_catalog_reader.index, trigger_bump)
+            if control is None:
+                continue
 
-                Is_Controlling = True
-                
-                current_speed = read_speed_kmh(car)
-                minimum_Speed = estimate_min_speed_kmh(current_speed, speed_map_data)
-                prediction_RMS = calculate_rms(Measured_Height, depth_m, minimum_Speed / 3.6, pR_Calibration)
-                prediction_Level = classify_rms(prediction_RMS)
-                
-                if prediction_Level in ["불쾌함", "매우 불쾌함"]: target_speed = minimum_Speed
-                else:
-                    target_rms = config.COMFORT_TARGETS_RMS.get(prediction_Level, 0.5)
-                    optimal_v_mps = solve_speed_for_target_rms(Measured_Height, depth_m, target_rms, pR_Calibration)
-                    target_speed = max(minimum_Speed, (optimal_v_mps * 3.6 if optimal_v_mps else 0) + config.TARGET_SPEED_MARGIN_KMH)
-                
-                Brake_PWM = calculate_brake_pwm(current_speed, target_speed, bump_distance, PWM_Calibration)
+            Is_Controlling = True
+            session, target_bump_obj, bump_pos = control.session, control.bump, control.bump_pos
+            print_at('CONTROL_RECV', f"[{control.source}] {control.recv_log}")
+            print_at('CONTROL_PLAN', f"[Control] {control.plan_log}")
 
-                source = data.get('source', 'N/A')
-                recv_log_content = f"T:{bump_type}, H:{Measured_Height*100:.1f}cm, Dt:{bump_distance:.1f}m, Dp:{depth_m:.2f}m"
-                plan_log_content = f"tS:{target_speed:.1f}, pR:{prediction_RMS:.2f}, Comfort:{prediction_Level}"
-                
-                print_at('CONTROL_RECV', f"[{source}] {recv_log_content}")
-                print_at('CONTROL_PLAN', f"[Control] {plan_log_content}")
-
-                target_bump_obj = find_target_bump(car, bump_type, ThreeDModelGT_cache)
-                if not target_bump_obj:
-                    Is_Controlling = False
-                    last_bump_type = data['type']
-                    continue
-                
-                min_dist_so_far = float('inf')
-                has_approached = False
-                start_time = time.time()
-                initial_dist = bump_distance
-
-                while time.time() - start_time < 15.0:
-                    car_pos = car.Position
-                    bump_pos = target_bump_obj["instance"].Position
-                    current_dist = Distance(car_pos, bump_pos)
-                    
-                    if current_dist > initial_dist + 5.0:
-                        break
-                        
-                    min_dist_so_far = min(min_dist_so_far, current_dist)
-                    if not has_approached and current_dist < config.BUMP_PASS_DETECTION_THRESHOLD_M:
-                        has_approached = True
-                    
-                    print_at('DEBUG_DISTANCE', f"({target_bump_obj['name']})과의 bD: {current_dist:.1f}m")
-                    
-                    s = read_speed_kmh(car)
-                    print_at('CONTROL_STATE', f"[Control] cS:{s:.1f} | B_PWM:{int(Brake_PWM*100)}%(tS:{target_speed:.1f})")
-                    if s > target_speed:
-                        try:
-                            on_time = config.CONTROL_POLL_DT * Brake_PWM; off_time = config.CONTROL_POLL_DT * (1.0 - Brake_PWM)
-                            car.Throttle = 0.0
-                            if on_time > 0: car.ParkingBrake = True; time.sleep(on_time)
-                            if off_time > 0: car.ParkingBrake = False; time.sleep(off_time)
-                        except Exception: break
-                    else:
-                        car.ParkingBrake = False
-
-                    if has_approached and current_dist > min_dist_so_far + 0.1:
+            if tick_controller is not None:
+                tick_controller.arm(session, bump_pos)
+                while not tick_controller.finished.is_set():
+                    com_runtime.pump_waiting_messages()
+                    print_at('DEBUG_DISTANCE', f"({target_bump_obj['name']})과의 bD: {session.current_dist:.1f}m")
+                    print_at('CONTROL_STATE', f"[Control] cS:{session.speed:.1f} | B_PWM:{int(session.Brake_PWM*100)}%(tS:{control.target_speed:.1f}) | tick:{tick_controller.tick_count}")
+                    if clock.time() - session.start_time > session.timeout + 1.0:
+                        tick_controller.disarm(car)
+                    try: tick_data = vision_to_control_queue.get(timeout=0.05)
+                    except queue.Empty: tick_data = None
+                    if decision.track(control, tick_data, vehicle_reader.refresh(with_direction=True), bump_catalog_reader.index):
+                        print_at('CONTROL_RECV', f"[{control.detect_source}] {control.recv_log}")
+            else:
+                # 제동은 brake_actuator가 유지하므로 루프는 대기 대신 인지 결과를 받으며 CONTROL_POLL_DT마다 갱신한다.
+                while True:
+                    state = vehicle_reader.refresh(with_direction=session.horizon is not None)
+                    if state is None:
+                        # 텔레메트리에 ego가 없는 동안은 제동 입력을 유지한 채 다시 읽는다 (세션 시간 초과는 계속 센다).
+                        if clock.time() - session.start_time >= session.timeout: break
+                        clock.sleep(config.CONTROL_POLL_DT)
+                        continue
+                    braking = session.update(state.timestamp, state.distance_to(bump_pos), state.Speed_kmh, state)
+                    if braking is None:
                         break
-                
-                end_control_speed = read_speed_kmh(car)
-                car.ParkingBrake = False
-                
-                eval_request = { "msg": "evaluate_request", "current_speed": end_control_speed, "target_speed": target_speed, "prediction_RMS": prediction_RMS, "GT_Height": target_bump_obj["GT_Height"], "GT_Depth": target_bump_obj["GT_Depth"], "current_pR_Calibration": pR_Calibration, "current_PWM_Calibration": PWM_Calibration }
-                control_to_eval_queue.put(eval_request)
-                
-                file_log_data = { "DETECT": f"[{source}] {recv_log_content}", "PLAN": f"[Control] {plan_log_content}", "COLLISION": f"충돌 속도(cS): {end_control_speed:.1f}km/h (최소 근접 거리: {min_dist_so_far:.2f}m)" }
-                
-                try:
-                    eval_response = eval_to_control_queue.get(timeout=2.0)
-                    pending_correction_data = eval_response
-                    file_log_data["RESULT"] = f"{eval_response.get('result_log', '')}"
-                    file_log_data["CORRECTION"] = correction_log_for_file
-                except queue.Empty:
-                    file_log_data["RESULT"] = "Evaluate 응답 시간 초과"
-                    file_log_data["CORRECTION"] = "보정 없음"
-                
-                log_sequence_to_file(file_log_data)
-                print_at('DEBUG_DISTANCE', "")
-                Is_Controlling = False
 
-            last_bump_type = data['type']
+                    print_at('DEBUG_DISTANCE', f"({target_bump_obj['name']})과의 bD: {session.current_dist:.1f}m")
+                    print_at('CONTROL_STATE', f"[Control] cS:{session.speed:.1f} | B_PWM:{int(session.Brake_PWM*100)}%(tS:{control.target_speed:.1f}) | {brake_actuator.kind}")
+                    try: brake_actuator.apply(session.Brake_PWM if braking else 0.0)
+                    except Exception: break
+
+                    if session.finished:
+                        break
+                    try: tick_data = vision_to_control_queue.get(timeout=config.CONTROL_POLL_DT)
+                    except queue.Empty: tick_data = None
+                    if decision.track(control, tick_data, vehicle_reader.snapshot(with_direction=True), bump_catalog_reader.index):
+                        print_at('CONTROL_RECV', f"[{control.detect_source}] {control.recv_log}")
+            
+            state = vehicle_reader.refresh()
+            end_control_speed = state.Speed_kmh if state is not None else session.speed
+            brake_actuator.release()
+            control_to_eval_queue.put(decision.finish(control, end_control_speed))
+            
+            file_log_data = { "DETECT": f"[{control.detect_source}] {control.recv_log}", "PLAN": f"[Control] {control.plan_log}", "COLLISION": f"충돌 속도(cS): {end_control_speed:.1f}km/h (최소 근접 거리: {session.min_dist_so_far:.2f}m)" }
+            
+            try:
+                eval_response = eval_to_control_queue.get(timeout=2.0)
+                pending_correction_data = eval_response
+                file_log_data["RESULT"] = f"{eval_response.get('result_log', '')}"
+                file_log_data["CORRECTION"] = correction_log_for_file
+            except queue.Empty:
+                file_log_data["RESULT"] = "Evaluate 응답 시간 초과"
+                file_log_data["CORRECTION"] = "보정 없음"
+            
+            log_sequence_to_file(file_log_data)
+            print_at('DEBUG_DISTANCE', "")
+            Is_Controlling = False
 
         except queue.Empty:
-            if not Is_Controlling:
-                print_at('CONTROL_STATE', f"[Control] cS:{read_speed_kmh(car):.1f} | B_PWM:0%")
+            state = vehicle_reader.snapshot()
+            if not Is_Controlling and state is not None:
+                print_at('CONTROL_STATE', f"[Control] cS:{state.Speed_kmh:.1f} | B_PWM:0% | superseded:{vision_to_control_queue.superseded}")
         except Exception:
+            if tick_controller is not None:
+                tick_controller.disarm(car)
+            try: brake_actuator.release()
+            except Exception: pass
             Is_Controlling = False
-            last_bump_type = "None"
+            decision.last_bump_type = "None"
+            clock.sleep(0.5)
     
-    pythoncom.CoUninitialize()
\ No newline at end of file
+    com_runtime.co_uninitialize()
\ No newline at end of file
@@ -0,0 +1,129 @@
+# src/control_callbacks.py
+import threading
+
+# 콜백 모드는 COM 이벤트가 필요하다. pywin32 가 없는 환경(헤드리스 시뮬레이터)에서는 폴링 모드만 쓴다.
+try:
+    import win32com.client as com
+    from samples.CallbackHandlers import HandlerBase
+    from samples.UCwinRoadUtils import SetCallbackHandlers, CloseCallbackEvent
+except ImportError:
+    com = None
+    HandlerBase = object
+    SetCallbackHandlers = CloseCallbackEvent = None
+
+from utils.clock import REAL_CLOCK, VirtualClock
+from utils.vehicle_state import read_vehicle_state
+
+# 시뮬레이터 스텝(OnBeforeCalculateMovement)마다 제동을 결정하는 콜백 제어기.
+# analog_brake 이면 스텝마다 Brake 입력에 제동 강도를 쓰고, 아니면 ParkingBrake PWM을 스텝 단위 시그마-델타로 바꿔
+# 누적 duty가 1을 넘는 스텝에만 제동한다.
+class CallbackBrakeController:
+    def __init__(self, clock=REAL_CLOCK, analog_brake=False):
+        self.clock = clock
+        self.analog_brake = analog_brake
+        self.lock = threading.Lock()
+        self.session = None
+        self.bump_pos = None
+        self.duty = 0.0
+        self.tick_count = 0
+        self.finished = threading.Event()
+        self.finished.set()
+
+    def arm(self, session, bump_pos):
+        with self.lock:
+            self.session, self.bump_pos, self.duty = session, bump_pos, 0.0
+            self.finished.clear()
+
+    def disarm(self, car=None):
+        with self.lock:
+            self._finish(car)
+
+    def _finish(self, car):
+        if self.session is not None:
+            self.session.finished = True
+        self.session = None
+        if car is not None:
+            try:
+                if self.analog_brake: car.Brake = 0.0
+                else: car.ParkingBrake = False
+            except Exception: pass
+        self.finished.set()
+
+    def on_tick(self, dTimeInSeconds, car):
+        with self.lock:
+            session = self.session
+            if session is None: return
+            self.tick_count += 1
+            try:
+                state = read_vehicle_state(car, self.clock.time(), with_direction=session.horizon is not None)
+                braking = session.update(state.timestamp, state.distance_to(self.bump_pos), state.Speed_kmh, state)
+                if braking:
+                    car.Throttle = 0.0
+                    if self.analog_brake:
+                        car.Brake = session.Brake_PWM
+                    else:
+                        self.duty += session.Brake_PWM
+                        brake_on = self.duty >= 1.0
+                        if brake_on: self.duty -= 1.0
+                        car.ParkingBrake = brake_on
+                elif braking is not None:
+                    if self.analog_brake: car.Brake = 0.0
+                    else: car.ParkingBrake = False
+            except Exception:
+                session.finished = True
+            if session.finished:
+                self._finish(car)
+
+class ControlTickHandler(HandlerBase):
+    controller = None
+
+    def OnBeforeCalculateMovement(self, dTimeInSeconds, proxy):
+        if proxy is None or ControlTickHandler.controller is None:
+            return
+        ControlTickHandler.controller.on_tick(dTimeInSeconds, com.Dispatch(proxy))
+
+def register_tick_handler(car, controller, event_list):
+    ControlTickHandler.controller = controller
+    SetCallbackHandlers(event_list, car, ControlTickHandler)
+
+# --- 테스트용 가짜 콜백 드라이버 (COM 없이 고정 스텝으로 on_tick 호출) ---
+class FakeVector:
+    def __init__(self, X=0.0, Y=0.0, Z=0.0):
+        self.X, self.Y, self.Z = X, Y, Z
+
+class FakeCar:
+    BRAKE_DECEL_MPS2 = 6.0
+    COAST_DECEL_MPS2 = 0.3
+
+    def __init__(self, speed_kmh, x=0.0):
+        self.x = x
+        self.speed_mps = speed_kmh / 3.6
+        self.Throttle = 0.0
+        self.Brake = 0.0
+        self.ParkingBrake = False
+
+    @property
+    def Position(self):
+        return FakeVector(self.x, 0.0, 0.0)
+
+    def Speed(self, unit=1):
+        return self.speed_mps * 3.6
+
+    def advance(self, dt):
+        decel = self.BRAKE_DECEL_MPS2 * max(float(self.ParkingBrake), self.Brake) + self.COAST_DECEL_MPS2
+        self.speed_mps = max(0.0, self.speed_mps - decel * dt)
+        self.x += self.speed_mps * dt
+
+class FakeCallbackDriver:
+    def __init__(self, controller, car, dt=1.0 / 60.0):
+        self.controller, self.car, self.dt = controller, car, dt
+        self.clock = controller.clock = VirtualClock()
+
+    def run(self, max_steps=100000):
+        steps = 0
+        while not self.controller.finished.is_set() and steps < max_steps:
+            self.controller.on_tick(self.dt, self.car)
+            self.car.advance(self.dt)
+            self.clock.advance(self.dt)
+            steps += 1
+        return steps
@@ -1,10 +1,10 @@
 # src/evaluate.py
 import math
-import time
 import queue
-import pythoncom
 from utils.logger import print_at
 from config import config
+from utils import com_runtime
+from utils.clock import REAL_CLOCK
 
 def compute_rms(v_kmh, h_m, L_m):
     if not all([isinstance(v_kmh, (int, float)), isinstance(h_m, (int, float)), isinstance(L_m, (int, float))]):
@@ -21,57 +21,65 @@ def classify_rms(rms_value):
     if rms_value < 1.25: return "불쾌함"
     return "매우 불쾌함"
 
-def run_evaluate_node(control_to_eval_queue, eval_to_control_queue):
-    pythoncom.CoInitialize()
+# 통과 결과(evaluate_request)로 실제 승차감을 계산하고 보정 계수를 갱신한 응답(final_correction_factors)을 만든다.
+def evaluate_pass(data):
+    current_speed = data.get('current_speed')
+    target_speed = data.get('target_speed')
+    prediction_RMS = data.get('prediction_RMS')
+    GT_Height = data.get('GT_Height')
+    GT_Depth = data.get('GT_Depth')
+    current_pR_Calibration = data.get('current_pR_Calibration')
+    current_PWM_Calibration = data.get('current_PWM_Calibration')
+
+    actual_RMS = compute_rms(current_speed, GT_Height, GT_Depth)
+    comfort_level = classify_rms(actual_RMS)
     
-    while True:
-        try:
-            data = control_to_eval_queue.get()
-            
-            if data.get("msg") != "evaluate_request":
-                continue
+    result_log = (f"cS:{current_speed:.1f} | aR:{actual_RMS:.2f} "
+                  f"(GT_H:{GT_Height*100:.1f}cm, GT_Dp:{GT_Depth:.2f}m) | Comfort: {comfort_level}")
 
-            current_speed = data.get('current_speed')
-            target_speed = data.get('target_speed')
-            prediction_RMS = data.get('prediction_RMS')
-            GT_Height = data.get('GT_Height')
-            GT_Depth = data.get('GT_Depth')
-            current_pR_Calibration = data.get('current_pR_Calibration')
-            current_PWM_Calibration = data.get('current_PWM_Calibration')
+    er_error = (abs(prediction_RMS - actual_RMS) / prediction_RMS) * 100 if prediction_RMS > 0.01 else 0
+    ts_error = (abs(target_speed - current_speed) / target_speed) * 100 if target_speed > 0.01 else 0
+    accuracy_log = f"pR<>aR 오차: {er_error:.1f}% | tS<>cS 오차: {ts_error:.1f}%"
 
-            actual_RMS = compute_rms(current_speed, GT_Height, GT_Depth)
-            comfort_level = classify_rms(actual_RMS)
-            
-            result_log = (f"cS:{current_speed:.1f} | aR:{actual_RMS:.2f} "
-                          f"(GT_H:{GT_Height*100:.1f}cm, GT_Dp:{GT_Depth:.2f}m) | Comfort: {comfort_level}")
-            print_at('EVALUATE_RESULT', f"[Evaluate] {result_log}")
+    target_gain = current_pR_Calibration * (actual_RMS / prediction_RMS) if prediction_RMS > 0.01 else current_pR_Calibration
+    target_pwm_weight = current_PWM_Calibration * (current_speed / target_speed) if target_speed > 0.01 else current_PWM_Calibration
 
-            er_error = (abs(prediction_RMS - actual_RMS) / prediction_RMS) * 100 if prediction_RMS > 0.01 else 0
-            ts_error = (abs(target_speed - current_speed) / target_speed) * 100 if target_speed > 0.01 else 0
-            accuracy_log = f"pR<>aR 오차: {er_error:.1f}% | tS<>cS 오차: {ts_error:.1f}%"
-            print_at('EVALUATE_ACCURACY', f"[Evaluate] {accuracy_log}")
+    alpha_pr = config.LEARNING_RATE_PR_CALIBRATION
+    updated_pR_Calibration = (current_pR_Calibration * (1 - alpha_pr)) + (target_gain * alpha_pr)
 
-            target_gain = current_pR_Calibration * (actual_RMS / prediction_RMS) if prediction_RMS > 0.01 else current_pR_Calibration
-            target_pwm_weight = current_PWM_Calibration * (current_speed / target_speed) if target_speed > 0.01 else current_PWM_Calibration
+    alpha_pwm = config.LEARNING_RATE_PWM_CALIBRATION
+    updated_PWM_Calibration = (current_PWM_Calibration * (1 - alpha_pwm)) + (target_pwm_weight * alpha_pwm)
 
-            alpha_pr = config.LEARNING_RATE_PR_CALIBRATION
-            updated_pR_Calibration = (current_pR_Calibration * (1 - alpha_pr)) + (target_gain * alpha_pr)
+    return {
+        "msg": "final_correction_factors",
+        "updated_pR_Calibration": updated_pR_Calibration,
+        "updated_PWM_Calibration": updated_PWM_Calibration,
+        "actual_RMS": actual_RMS,
+        "comfort_level": comfort_level,
+        "er_error": er_error,
+        "ts_error": ts_error,
+        "result_log": result_log,
+        "accuracy_log": accuracy_log
+    }
 
-            alpha_pwm = config.LEARNING_RATE_PWM_CALIBRATION
-            updated_PWM_Calibration = (current_PWM_Calibration * (1 - alpha_pwm)) + (target_pwm_weight * alpha_pwm)
+def run_evaluate_node(control_to_eval_queue, eval_to_control_queue, clock=REAL_CLOCK):
+    com_runtime.co_initialize()
+    
+    while True:
+        try:
+            data = control_to_eval_queue.get()
+            
+            if data.get("msg") != "evaluate_request":
+                continue
 
-            response_data = {
-                "msg": "final_correction_factors",
-                "updated_pR_Calibration": updated_pR_Calibration,
-                "updated_PWM_Calibration": updated_PWM_Calibration,
-                "result_log": result_log,
-                "accuracy_log": accuracy_log
-            }
+            response_data = evaluate_pass(data)
+            print_at('EVALUATE_RESULT', f"[Evaluate] {response_data['result_log']}")
+            print_at('EVALUATE_ACCURACY', f"[Evaluate] {response_data['accuracy_log']}")
             eval_to_control_queue.put(response_data)
 
         except queue.Empty:
             continue
         except Exception:
-            time.sleep(1)
+            clock.sleep(1)
 
-    pythoncom.CoUninitialize()
\ No newline at end of file
+    com_runtime.co_uninitialize()
\ No newline at end of file
@@ -0,0 +1,231 @@
+# src/frame_source.py
+import os
+import glob
+import cv2
+import numpy as np
+
+from config import config
+from src.capture import CaptureSession
+from utils.frame_ring import FrameRingReader
+from utils.scheduler import FrameScheduler
+from utils.bump_catalog import build_bump_catalog, catalog_entries
+from utils.bump_index import BumpIndex
+from utils.vehicle_state import read_vehicle_state
+from utils.clock import REAL_CLOCK
+
+# Vision 입력 프레임 소스. read()는 (<top> 프레임, <test> 프레임) 쌍 또는 None을 반환한다.
+# 실시간 GDI 캡처, 녹화된 프레임 재생, 합성 프레임 생성, 시뮬레이터 ground truth 기반 렌더링 구현을 제공한다.
+
+class LiveFrameSource:
+    def __init__(self, regular_title=config.REGULAR_VIEW_WINDOW_TITLE, height_title=config.HEIGHT_MAP_WINDOW_TITLE, backend=None):
+        self.regular_session = CaptureSession(regular_title, backend)
+        self.height_session = CaptureSession(height_title, backend if backend is not None else self.regular_session.backend)
+
+    def read_regular(self):
+        return self.regular_session.grab()
+
+    def read_height(self):
+        return self.height_session.grab()
+
+    def read(self):
+        regular_frame = self.regular_session.grab()
+        height_frame = self.height_session.grab()
+        if regular_frame is None or height_frame is None: return None
+        return regular_frame, height_frame
+
+    def release(self):
+        self.regular_session.release()
+        self.height_session.release()
+
+class RecordedFrameSource:
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.bmp')
+    VIDEO_EXTENSIONS = ('.avi', '.mp4', '.mkv')
+
+    def __init__(self, path, loop=False):
+        self.path = path
+        self.loop = loop
+        self.index = 0
+        self.pairs, self.videos = [], None
+        top_videos = [os.path.join(path, 'top' + ext) for ext in self.VIDEO_EXTENSIONS if os.path.exists(os.path.join(path, 'top' + ext))]
+        test_videos = [os.path.join(path, 'test' + ext) for ext in self.VIDEO_EXTENSIONS if os.path.exists(os.path.join(path, 'test' + ext))]
+        if top_videos and test_videos:
+            self.video_paths = (top_videos[0], test_videos[0])
+            self._open_videos()
+        else:
+            for top_path in sorted(glob.glob(os.path.join(path, 'top_*'))):
+                stem, ext = os.path.splitext(os.path.basename(top_path))
+                test_path = os.path.join(path, 'test_' + stem[len('top_'):] + ext)
+                if ext.lower() in self.IMAGE_EXTENSIONS and os.path.exists(test_path):
+                    self.pairs.append((top_path, test_path))
+        if self.videos is None and not self.pairs:
+            raise FileNotFoundError(f"녹화된 <top>/<test> 프레임 쌍이 없습니다: {path}")
+
+    def _open_videos(self):
+        self.videos = tuple(cv2.VideoCapture(p) for p in self.video_paths)
+
+    def __len__(self):
+        if self.videos is not None: return int(self.videos[0].get(cv2.CAP_PROP_FRAME_COUNT))
+        return len(self.pairs)
+
+    def read(self):
+        if self.videos is not None:
+            ok_top, regular_frame = self.videos[0].read()
+            ok_test, height_frame = self.videos[1].read()
+            if not (ok_top and ok_test):
+                if not self.loop or self.index == 0: return None
+                self.release(); self._open_videos(); self.index = 0
+                return self.read()
+        else:
+            if self.index >= len(self.pairs):
+                if not self.loop: return None
+                self.index = 0
+            top_path, test_path = self.pairs[self.index]
+            regular_frame, height_frame = cv2.imread(top_path), cv2.imread(test_path)
+        self.index += 1
+        return regular_frame, height_frame
+
+    def release(self):
+        if self.videos is not None:
+            for video in self.videos: video.release()
+
+def save_frame_pair(directory, index, regular_frame, height_frame):
+    os.makedirs(directory, exist_ok=True)
+    cv2.imwrite(os.path.join(directory, f"top_{index:06d}.png"), regular_frame)
+    cv2.imwrite(os.path.join(directory, f"test_{index:06d}.png"), height_frame)
+
+# 합성 장면: (종류, 패턴 유무, 높이[m]) 방지턱이 SYNTHETIC_START_DISTANCE_M 부터 0m 까지 접근한 뒤 빈 도로 구간이 이어진다.
+SYNTHETIC_BUMPS = [("A", True, 0.08), ("B", True, 0.18), ("C", False, 0.10), ("D", True, 0.0)]
+SYNTHETIC_START_DISTANCE_M = 20.0
+
+def hue_for_height(height_m):
+    h_points = config.HEIGHT_ANALYSIS_SETTINGS['height_interpolation_hue']
+    m_points = config.HEIGHT_ANALYSIS_SETTINGS['height_interpolation_m']
+    return float(np.interp(height_m, m_points[::-1], h_points[::-1]))
+
+def row_for_distance(h, distance_m, roi_settings=config.ROI_SETTINGS_HEIGHT):
+    dist_calib = config.HEIGHT_ANALYSIS_SETTINGS['distance_calibration']
+    y_points = sorted(dist_calib.keys()); dist_points = [dist_calib[y] for y in y_points]
+    yb_norm = float(np.interp(distance_m, dist_points[::-1], y_points[::-1]))
+    top_y, bottom_y = int(h * roi_settings['top_y']), int(h * roi_settings['bottom_y'])
+    return int(top_y + yb_norm * max(1, bottom_y - top_y))
+
+def render_bump_scene(regular_frame, height_frame, has_pattern, height_m, distance_m):
+    h, w, _ = regular_frame.shape
+    regular_frame[:] = (90, 90, 90)
+    height_frame[:] = (255, 0, 0)
+    if distance_m is None: return
+    y_bottom = row_for_distance(h, distance_m)
+    band_h = max(6, h // 25)
+    x0, x1 = int(w * 0.3), int(w * 0.7)
+    y0 = max(0, y_bottom - band_h)
+    if has_pattern:
+        for x in range(x0, x1, max(4, w // 40) * 2):
+            regular_frame[y0:y_bottom, x:x + max(4, w // 40)] = (0, 255, 255)
+    if height_m > 0:
+        hue = int(round(hue_for_height(height_m)))
+        bgr = cv2.cvtColor(np.uint8([[[hue, 255, 255]]]), cv2.COLOR_HSV2BGR)[0, 0]
+        center = ((x0 + x1) // 2, (y0 + y_bottom) // 2)
+        cv2.ellipse(height_frame, center, ((x1 - x0) // 2, max(1, (y_bottom - y0) // 2)), 0, 0, 360, tuple(int(c) for c in bgr), -1)
+
+class SyntheticFrameSource:
+    def __init__(self, size=(640, 480), step_m=0.5, gap_frames=10, bumps=SYNTHETIC_BUMPS, frame_count=None):
+        w, h = size
+        self.regular_frame = np.empty((h, w, 3), dtype=np.uint8)
+        self.height_frame = np.empty((h, w, 3), dtype=np.uint8)
+        self.frames = []
+        for bump_type, has_pattern, height_m in bumps:
+            d = SYNTHETIC_START_DISTANCE_M
+            while d > 0:
+                self.frames.append((bump_type, has_pattern, height_m, d)); d -= step_m
+            self.frames.extend([("None", False, 0.0, None)] * gap_frames)
+        self.frame_count = frame_count
+        self.index = 0
+        self.truth = None
+
+    def read(self):
+        if self.frame_count is not None and self.index >= self.frame_count: return None
+        bump_type, has_pattern, height_m, distance_m = self.frames[self.index % len(self.frames)]
+        render_bump_scene(self.regular_frame, self.height_frame, has_pattern, height_m, distance_m)
+        self.truth = {'type': bump_type, 'height_m': height_m, 'distance_m': distance_m}
+        self.index += 1
+        return self.regular_frame, self.height_frame
+
+    def release(self):
+        pass
+
+# 시뮬레이터 객체 모델(자차 위치 + 방지턱 인스턴스)에서 전방 방지턱을 찾아 합성 장면으로 렌더링한다.
+# 화면 캡처가 없는 헤드리스 백엔드에서 Vision 입력으로 쓴다.
+class SimulatedFrameSource:
+    BUMP_HAS_PATTERN = {bump_type: has_pattern for bump_type, has_pattern, _ in SYNTHETIC_BUMPS}
+    BUMP_HAS_HEIGHT = {bump_type: height_m > 0 for bump_type, _, height_m in SYNTHETIC_BUMPS}
+
+    def __init__(self, application=None, size=(640, 480), clock=REAL_CLOCK):
+        self.clock = clock
+        if application is None:
+            from samples.UCwinRoadCOM import UCwinRoadComProxy
+            application = UCwinRoadComProxy()
+        self.driver = application.SimulationCore.TrafficSimulation.Driver
+        self.bump_index = BumpIndex(catalog_entries(build_bump_catalog(application.Project)))
+        w, h = size
+        self.regular_frame = np.empty((h, w, 3), dtype=np.uint8)
+        self.height_frame = np.empty((h, w, 3), dtype=np.uint8)
+        self.truth = None
+
+    def read(self):
+        car = self.driver.CurrentCar
+        if not car: return None
+        state = read_vehicle_state(car, self.clock.time(), with_direction=True)
+        distance_m, bump = self.bump_index.nearest_ahead(state.position, state.direction, max_dist=SYNTHETIC_START_DISTANCE_M)
+        if bump is None:
+            render_bump_scene(self.regular_frame, self.height_frame, False, 0.0, None)
+            self.truth = {'type': "None", 'height_m': 0.0, 'distance_m': None}
+        else:
+            height_m = bump['GT_Height'] if self.BUMP_HAS_HEIGHT.get(bump['type'], True) else 0.0
+            render_bump_scene(self.regular_frame, self.height_frame, self.BUMP_HAS_PATTERN.get(bump['type'], False), height_m, distance_m)
+            self.truth = {'type': bump['type'], 'height_m': bump['GT_Height'], 'distance_m': distance_m}
+        return self.regular_frame, self.height_frame
+
+    def release(self):
+        pass
+
+# 캡처 전용 프로세스가 채우는 공유 메모리 링 버퍼에서 최신 프레임 쌍을 복사 없이 읽는다.
+class RingFrameSource:
+    def __init__(self, frame_ring, timeout=1.0):
+        self.frame_ring = frame_ring
+        self.timeout = timeout
+        self.reader = None
+        self.frame_slot = None
+
+    def read(self):
+        if self.reader is None:
+            self.reader = FrameRingReader(self.frame_ring)
+        self.frame_slot = self.reader.wait_latest(self.timeout)
+        if self.frame_slot is None: return None
+        return self.frame_slot.frames[0], self.frame_slot.frames[1]
+
+    def frames_valid(self):
+        return self.frame_slot is not None and self.frame_ring.is_valid(self.frame_slot)
+
+    @property
+    def dropped(self):
+        return self.reader.dropped if self.reader is not None else 0
+
+    @property
+    def oversize_frames(self):
+        return self.frame_ring.oversize_frames
+
+    def release(self):
+        pass
+
+def run_frame_capture_producer(frame_ring, rate_hz=config.VISION_CAPTURE_RATE_HZ, frame_source=None, clock=REAL_CLOCK):
+    if frame_source is None:
+        frame_source = SimulatedFrameSource(clock=clock) if config.UCWIN_BACKEND == "headless" else LiveFrameSource()
+    scheduler = FrameScheduler(rate_hz, clock=clock)
+    while True:
+        frames = frame_source.read()
+        if frames is None:
+            clock.sleep(1)
+            scheduler.reset()
+            continue
+        frame_ring.write(frames, clock.time())
+        scheduler.wait()
@@ -0,0 +1,308 @@
+# src/headless_sim.py
+import os
+import math
+import time
+import numpy as np
+
+from config import config
+from utils.shm import create_shared_memory, attach_shared_memory
+from utils.clock import REAL_CLOCK
+
+# UC-win/Road 없이 노드를 돌리기 위한 순수 파이썬 시뮬레이터.
+# 월드 상태(자차/전방 차량/입력)는 공유 메모리 레코드 하나에 있고, run_headless_simulator 프로세스만 차량 동역학을 적분한다.
+# 각 프로세스는 connect()로 같은 월드에 붙어, 이 프로젝트가 쓰는 COM 객체 모델의 부분집합을 그대로 사용한다.
+WORLD_ENV = "UCWIN_HEADLESS_WORLD"
+
+WORLD_DTYPE = np.dtype([
+    ('sim_time', '<f8'), ('step', '<i8'), ('running', 'u1'), ('scenario', '<i8'),
+    ('ego_x', '<f8'), ('ego_speed', '<f8'), ('cruise_speed', '<f8'),
+    ('throttle', '<f8'), ('throttle_hold_until', '<f8'), ('brake', '<f8'), ('parking_brake', 'u1'),
+    ('front_valid', 'u1'), ('front_x', '<f8'), ('front_speed', '<f8'),
+    ('request_seq', '<i8'), ('applied_request', '<i8'), ('request_scenario', '<i8'), ('request_cruise', '<f8'), ('request_front_gap', '<f8'),
+])
+
+# 차선은 X축을 따라 -X 방향으로 진행한다.
+ROAD_DIRECTION = (-1.0, 0.0, 0.0)
+EGO_ID, FRONT_ID = 1, 2
+BRAKE_DECEL_MPS2 = 6.0
+COAST_DECEL_MPS2 = 0.3
+MAX_ACCEL_MPS2 = 2.0
+CRUISE_GAIN = 0.8
+THROTTLE_HOLD_S = 0.3
+
+class HeadlessConstants:
+    _primaryPath = 0
+    _TransientCar = 1
+
+constants = HeadlessConstants()
+
+class HeadlessWorld:
+    def __init__(self, state, shm=None, owner=False):
+        self.state = state
+        self.shm = shm
+        self.owner = owner
+
+    @classmethod
+    def create(cls):
+        shm = create_shared_memory(WORLD_DTYPE.itemsize)
+        world = cls(np.ndarray((), dtype=WORLD_DTYPE, buffer=shm.buf), shm, owner=True)
+        world.state[()] = np.zeros((), dtype=WORLD_DTYPE)
+        return world
+
+    @classmethod
+    def attach(cls, name):
+        shm = attach_shared_memory(name)
+        return cls(np.ndarray((), dtype=WORLD_DTYPE, buffer=shm.buf), shm)
+
+    # 프로세스 내부 전용 월드 (배치 시나리오 러너처럼 한 프로세스에서 직접 step() 하는 경우)
+    @classmethod
+    def local(cls):
+        return cls(np.zeros((), dtype=WORLD_DTYPE))
+
+    def __reduce__(self):
+        return (HeadlessWorld.attach, (self.shm.name,))
+
+    def get(self, field):
+        return self.state[field].item()
+
+    def set(self, field, value):
+        self.state[field] = value
+
+    # 시나리오 시작/정지는 월드 레코드 대부분을 다시 쓰므로, 공유 월드에서는 요청만 기록하고 월드를 적분하는
+    # 시뮬레이터 프로세스가 step() 안에서 적용한다 (요청 필드는 단일 writer seqlock; 요청은 제어 노드와 초기화 중인 main만 보낸다).
+    # 프로세스 내부 월드(local)는 step()하는 쪽이 곧 요청하는 쪽이므로 바로 적용한다.
+    def start_scenario(self, index, cruise_speed_kmh=None, front_gap_m=None):
+        cruise_mps = (config.HEADLESS_CRUISE_SPEED_KMH if cruise_speed_kmh is None else cruise_speed_kmh) / 3.6
+        gap = config.HEADLESS_FRONT_VEHICLE_GAP_M.get(index) if front_gap_m is None else front_gap_m
+        self._request(index, cruise_mps, gap)
+
+    def stop_all_scenarios(self):
+        self._request(-1)
+
+    def _request(self, scenario, cruise_mps=0.0, front_gap_m=None):
+        if self.shm is None:
+            self._apply_scenario(scenario, cruise_mps, front_gap_m)
+            return
+        seq = self.get('request_seq')
+        self.set('request_seq', seq + 1)
+        self.set('request_scenario', scenario)
+        self.set('request_cruise', cruise_mps)
+        self.set('request_front_gap', math.nan if front_gap_m is None else front_gap_m)
+        self.set('request_seq', seq + 2)
+
+    def _apply_request(self):
+        seq = self.get('request_seq')
+        if seq % 2 or seq == self.get('applied_request'): return
+        scenario, cruise_mps, gap = self.get('request_scenario'), self.get('request_cruise'), self.get('request_front_gap')
+        if self.get('request_seq') != seq: return
+        self.set('applied_request', seq)
+        self._apply_scenario(scenario, cruise_mps, None if math.isnan(gap) else gap)
+
+    def _apply_scenario(self, scenario, cruise_mps, front_gap_m):
+        self.set('running', 0)
+        if scenario < 0: return
+        self.set('scenario', scenario)
+        self.set('ego_x', config.HEADLESS_START_X)
+        self.set('ego_speed', cruise_mps)
+        self.set('cruise_speed', cruise_mps)
+        self.set('throttle', 0.0); self.set('throttle_hold_until', 0.0)
+        self.set('brake', 0.0); self.set('parking_brake', 0)
+        self.set('front_valid', int(front_gap_m is not None))
+        self.set('front_x', config.HEADLESS_START_X + ROAD_DIRECTION[0] * (front_gap_m or 0.0))
+        self.set('front_speed', cruise_mps)
+        self.set('running', 1)
+
+    # 종방향 동역학: 주차 브레이크/브레이크 > Throttle 입력(THROTTLE_HOLD_S 동안 유지) > 순항 속도 추종
+    def step(self, dt):
+        if self.shm is not None: self._apply_request()
+        sim_time = self.get('sim_time')
+        if self.get('running'):
+            v = self.get('ego_speed')
+            brake = max(float(self.get('parking_brake')), self.get('brake'))
+            if brake > 0:
+                accel = -BRAKE_DECEL_MPS2 * brake - COAST_DECEL_MPS2
+            elif sim_time < self.get('throttle_hold_until'):
+                accel = MAX_ACCEL_MPS2 * self.get('throttle') - COAST_DECEL_MPS2
+            else:
+                accel = min(MAX_ACCEL_MPS2, max(-MAX_ACCEL_MPS2, CRUISE_GAIN * (self.get('cruise_speed') - v)))
+            v = max(0.0, v + accel * dt)
+            self.set('ego_speed', v)
+            self.set('ego_x', self.get('ego_x') + ROAD_DIRECTION[0] * v * dt)
+            if self.get('front_valid'):
+                self.set('front_x', self.get('front_x') + ROAD_DIRECTION[0] * self.get('front_speed') * dt)
+        self.set('sim_time', sim_time + dt)
+        self.set('step', self.get('step') + 1)
+
+    def close(self):
+        self.state = None
+        if self.shm is None: return
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def start_headless_world():
+    world = HeadlessWorld.create()
+    os.environ[WORLD_ENV] = world.shm.name
+    return world
+
+def run_headless_simulator(world, step_dt=config.HEADLESS_STEP_DT, time_scale=config.HEADLESS_TIME_SCALE, clock=REAL_CLOCK):
+    next_tick = clock.monotonic()
+    while True:
+        world.step(step_dt)
+        next_tick += step_dt / time_scale
+        delay = next_tick - clock.monotonic()
+        if delay > 0: clock.sleep(delay)
+        else: next_tick = clock.monotonic()
+
+# 헤드리스 월드의 sim_time을 시각으로 쓰는 clock. 노드의 대기/timeout/타임스탬프가 HEADLESS_TIME_SCALE 배속을 그대로 따른다.
+# 공유 월드는 시뮬레이터 프로세스가 sim_time을 올릴 때까지 기다리고, local() 월드는 sleep() 동안 직접 step() 한다.
+# 처리 지연(perf)은 시뮬레이션 시간이 아니라 실제 계산 시간이므로 벽시계로 잰다.
+class HeadlessWorldClock:
+    def __init__(self, world, step_dt=config.HEADLESS_STEP_DT, poll_interval=0.001):
+        self.world = world
+        self.step_dt = step_dt
+        self.poll_interval = poll_interval
+
+    def time(self):
+        return self.world.get('sim_time')
+
+    def monotonic(self):
+        return self.world.get('sim_time')
+
+    def perf(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        if seconds <= 0: return
+        deadline = self.world.get('sim_time') + seconds
+        while self.world.get('sim_time') < deadline:
+            if self.world.shm is None: self.world.step(self.step_dt)
+            else: time.sleep(self.poll_interval)
+
+# --- COM 객체 모델 (이 프로젝트가 사용하는 부분집합) ---
+class HeadlessVector:
+    def __init__(self, X=0.0, Y=0.0, Z=0.0):
+        self.X, self.Y, self.Z = X, Y, Z
+
+class HeadlessBoundingBox:
+    def __init__(self, width, height, depth):
+        self.xAxis = HeadlessVector(width / 2, 0.0, 0.0)
+        self.yAxis = HeadlessVector(0.0, height / 2, 0.0)
+        self.zAxis = HeadlessVector(0.0, 0.0, depth / 2)
+
+class HeadlessModelInstance:
+    def __init__(self, instance_id, name, x, height, depth, width=6.0):
+        self.ID, self.Name = instance_id, name
+        self.Position = HeadlessVector(x, 0.0, 0.0)
+        self.BoundingBoxesCount = 1
+        self._bbox = HeadlessBoundingBox(width, height, depth)
+
+    def BoundingBox(self, index):
+        return self._bbox
+
+class HeadlessCar:
+    TransientType = HeadlessConstants._TransientCar
+
+    def __init__(self, world, instance_id, name, prefix):
+        object.__setattr__(self, '_world', world)
+        object.__setattr__(self, '_prefix', prefix)
+        object.__setattr__(self, 'ID', instance_id)
+        object.__setattr__(self, 'Name', name)
+
+    @property
+    def Position(self):
+        return HeadlessVector(self._world.get(f'{self._prefix}_x'), 0.0, 0.0)
+
+    @property
+    def Direction(self):
+        return HeadlessVector(*ROAD_DIRECTION)
+
+    def Speed(self, unit=1):
+        speed = self._world.get(f'{self._prefix}_speed')
+        return speed * 3.6 if unit == 1 else speed
+
+    @property
+    def Throttle(self):
+        return self._world.get('throttle')
+
+    @property
+    def Brake(self):
+        return self._world.get('brake')
+
+    @property
+    def ParkingBrake(self):
+        return bool(self._world.get('parking_brake'))
+
+    def __setattr__(self, name, value):
+        if self._prefix != 'ego': raise AttributeError(f"{self.Name} is not controllable")
+        if name == 'Throttle':
+            self._world.set('throttle', float(value))
+            self._world.set('throttle_hold_until', self._world.get('sim_time') + THROTTLE_HOLD_S)
+        elif name == 'Brake': self._world.set('brake', float(value))
+        elif name == 'ParkingBrake': self._world.set('parking_brake', int(bool(value)))
+        else: raise AttributeError(name)
+
+    def DriverAheadInTraffic(self, path):
+        if self._prefix != 'ego' or not self._world.get('front_valid'): return None
+        ahead = (self._world.get('front_x') - self._world.get('ego_x')) * ROAD_DIRECTION[0]
+        return HeadlessCar(self._world, FRONT_ID, "FrontCar", 'front') if ahead > 0 else None
+
+class HeadlessDriver:
+    def __init__(self, world):
+        self._world = world
+        self._car = HeadlessCar(world, EGO_ID, "EgoCar", 'ego')
+
+    @property
+    def CurrentCar(self):
+        return self._car if self._world.get('running') else None
+
+class HeadlessTrafficSimulation:
+    def __init__(self, world):
+        self.Driver = HeadlessDriver(world)
+
+class HeadlessScenario:
+    def __init__(self, index):
+        self.index = index
+
+class HeadlessSimulationCore:
+    def __init__(self, world):
+        self._world = world
+        self.TrafficSimulation = HeadlessTrafficSimulation(world)
+
+    def StartScenario(self, scenario):
+        self._world.start_scenario(scenario.index)
+
+    def StopAllScenarios(self):
+        self._world.stop_all_scenarios()
+
+class HeadlessProject:
+    def __init__(self, layout):
+        self._instances = [HeadlessModelInstance(100 + i, name, x, height, depth)
+                           for i, (name, x, height, depth) in enumerate(layout)]
+        self.ThreeDModelInstancesCount = len(self._instances)
+
+    def ThreeDModelInstance(self, index):
+        return self._instances[index]
+
+    def Scenario(self, index):
+        return HeadlessScenario(index)
+
+class HeadlessApplication:
+    def __init__(self, world, layout=None):
+        self.world = world
+        self.Project = HeadlessProject(config.HEADLESS_BUMP_LAYOUT if layout is None else layout)
+        self.SimulationCore = HeadlessSimulationCore(world)
+        self.MainForm = self.GazeTrackingPlugin = self.VirtualDisplaysPlugin = self.CoordinateConverter = None
+        self.UserDirectory = ""
+        self.ApplicationServices = self
+
+_application = None
+
+# 이 프로세스의 헤드리스 애플리케이션 객체. main이 start_headless_world()로 넘긴 공유 메모리 월드에 붙는다.
+def connect():
+    global _application
+    if _application is None:
+        name = os.environ.get(WORLD_ENV)
+        if name is None: raise RuntimeError(f"{WORLD_ENV} is not set; start the world with start_headless_world()")
+        _application = HeadlessApplication(HeadlessWorld.attach(name))
+    return _application
@@ -0,0 +1,87 @@
+# src/horizon_planner.py
+import math
+import collections
+import numpy as np
+
+from config import config
+from src.braking_planner import required_deceleration
+from utils.bump_catalog import TYPE_KEYWORDS
+from utils.bump_index import is_ahead
+from utils.packet import make_perception_packet
+
+HorizonTarget = collections.namedtuple('HorizonTarget', ['bump', 'position', 'target_speed', 'Measured_Height', 'depth_m', 'source', 'seq'])
+
+# 앞으로 지날 방지턱들의 목표 속도를 모아 둔다. 속도 상한 프로파일 v_max(s) = min_i sqrt(vt_i² + 2·a·(d_i − s)) 를
+# 통째로 만드는 대신, 제동 세션이 tick마다 자기 방지턱과 horizon 목표 중 지금 가장 큰 감속도를 요구하는 제약(binding)으로
+# 명령을 정한다 (현재 위치에서 프로파일을 가장 낮게 만드는 제약을 고르는 셈). 그래서 가까운 방지턱 사이에서 다시 가속했다가
+# 세게 제동하는 대신 다음 방지턱이 허용하는 만큼만 속도를 유지한다.
+# 목표는 카탈로그 선행 추적(다음 size개)과 제동 중 받은 인지 결과로 채워진다.
+# 콜백 스레드가 binding()을 읽는 동안 제어 스레드가 목표를 바꿀 수 있으므로 targets는 통째로 교체한다.
+class BumpHorizon:
+    def __init__(self, size=config.CONTROL_HORIZON_BUMPS, latency_s=config.CONTROL_POLL_DT):
+        self.size = size
+        self.latency_s = latency_s
+        self.targets = {}
+
+    def __len__(self):
+        return len(self.targets)
+
+    def __contains__(self, bump):
+        return bump is not None and bump['id'] in self.targets
+
+    def clear(self):
+        self.targets = {}
+
+    def add(self, bump, target_speed, Measured_Height, depth_m, source, seq=0):
+        target = HorizonTarget(bump, (bump['x'], bump['y'], bump['z']), float(target_speed), Measured_Height, depth_m, source, seq)
+        self.targets = {**self.targets, bump['id']: target}
+
+    def discard(self, bump):
+        if bump in self:
+            self.targets = {key: target for key, target in self.targets.items() if key != bump['id']}
+
+    # 진행 방향 뒤로 지나간 목표를 버린다.
+    def prune(self, state):
+        targets = {key: target for key, target in self.targets.items() if is_ahead(state.position, state.direction, target.position)}
+        if len(targets) != len(self.targets): self.targets = targets
+
+    # 진행 방향 앞의 목표를 가까운 순으로 최대 size개 (거리, 목표)
+    def ahead(self, state):
+        self.prune(state)
+        found = sorted(((math.dist(state.position, target.position), target) for target in self.targets.values()), key=lambda item: item[0])
+        return found[:self.size]
+
+    # 세션 자신의 (distance_m, target_kmh) 와 진행 방향 앞의 horizon 목표 가운데 지금 필요한 감속도가 가장 큰 제약의 (거리, 목표 속도).
+    # 지나간 목표는 거리가 짧아 가장 급한 제약으로 잘못 고를 수 있으므로 state(방향 포함)로 앞의 목표만 본다 (방향이 없으면 세션 제약만).
+    def binding(self, state, distance_m, target_kmh):
+        targets = [target for target in self.targets.values() if is_ahead(state.position, state.direction, target.position)] if state.has_direction else []
+        if not targets: return distance_m, target_kmh
+        distances = np.array([distance_m] + [math.dist(state.position, target.position) for target in targets])
+        target_speeds = np.array([target_kmh] + [target.target_speed for target in targets])
+        i = int(np.argmax(required_deceleration(state.Speed_kmh, target_speeds, distances, self.latency_s)))
+        return float(distances[i]), float(target_speeds[i])
+
+    # 인지로 추가한 목표(카탈로그 선행 추적이 아닌 것) 중 가장 가까운 것을 꺼내 트리거 패킷으로 돌려준다: (packet, bump)
+    # 트리거 패킷은 원래 인지 패킷의 (source, seq)를 그대로 쓴다.
+    def next_pending(self, state, exclude_source):
+        for distance, target in self.ahead(state):
+            if target.source == exclude_source: continue
+            packet = make_perception_packet(target.bump['type'], target.source, target.Measured_Height, distance, target.depth_m,
+                                            timestamp=state.timestamp, seq=target.seq)
+            return packet, target.bump
+        return None, None
+
+    # 인지 결과를 카탈로그 방지턱(거리 차이 HORIZON_SEPARATION_M 이내)에 맞춰, 현재 속도 기준 목표 속도를 계획해 추가한다.
+    # 제동 중이면 세션 방지턱보다 HORIZON_SEPARATION_M 이상 먼 방지턱만 받는다. 추가한 방지턱(없으면 None)을 돌려준다.
+    def add_perceived(self, data, state, bump_index, planning_table, speed_map, session_distance=None, session_bump=None):
+        if data.type not in TYPE_KEYWORDS or data.Measured_Height <= 0 or data.depth_m <= 0 or not state.has_direction: return None
+        if session_distance is not None and data.bump_distance < session_distance + config.HORIZON_SEPARATION_M: return None
+        candidates = bump_index.next_ahead(state.position, state.direction, self.size + 1,
+                                           lambda b: b['type'] == data.type and (session_bump is None or b['id'] != session_bump['id']),
+                                           data.bump_distance + config.HORIZON_SEPARATION_M)
+        if not candidates: return None
+        distance, bump = min(candidates, key=lambda item: abs(item[0] - data.bump_distance))
+        if abs(distance - data.bump_distance) > config.HORIZON_SEPARATION_M or bump in self: return None
+        target_speed, _, _ = planning_table.plan(data.Measured_Height, data.depth_m, state.Speed_kmh, speed_map)
+        self.add(bump, target_speed, data.Measured_Height, data.depth_m, data.source, data.seq)
+        return bump
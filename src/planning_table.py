@@ -0,0 +1,98 @@
+# src/planning_table.py
+import json
+import math
+import numpy as np
+
+from config import config
+
+# 승차감 등급 경계 (classify_rms 와 같은 기준) 와 등급 이름
+RMS_LEVEL_BOUNDS = np.array([0.315, 0.5, 0.8, 1.25])
+RMS_LEVELS = ("매우 쾌적함", "쾌적함", "보통", "불쾌함", "매우 불쾌함")
+UNCOMFORTABLE_LEVEL_INDEX = RMS_LEVELS.index("불쾌함")
+DEFAULT_MIN_SPEED_KMH = 20.0
+
+# 방지턱 응답 계수: RMS = gain * h * (v·π/L)² / √2 = gain * v² * rms_coefficient(h, L)
+def rms_coefficient(h_m, L_m):
+    h = np.asarray(h_m, dtype=float)
+    L = np.asarray(L_m, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where((h > 0) & (L > 0), h * (math.pi / np.where(L > 0, L, 1.0)) ** 2 / math.sqrt(2.0), 0.0)
+
+def classify_rms_index(rms_value):
+    return np.searchsorted(RMS_LEVEL_BOUNDS, rms_value, side='right')
+
+# speed_map.json 을 한 번만 읽어 정렬된 배열로 가진다. 범위 밖 속도는 양 끝 값으로 고정한다.
+class SpeedMap:
+    def __init__(self, speed_map_data=None):
+        items = sorted((int(speed), float(min_speed)) for speed, min_speed in (speed_map_data or {}).items())
+        self.speeds = np.array([speed for speed, _ in items], dtype=float)
+        self.min_speeds = np.array([min_speed for _, min_speed in items], dtype=float)
+
+    @classmethod
+    def load(cls, path=config.CALIBRATION_DATA_FILE_PATH):
+        try:
+            with open(path, 'r') as f:
+                return cls(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls()
+
+    def __len__(self):
+        return len(self.speeds)
+
+    def min_speed(self, current_speed):
+        if not len(self.speeds):
+            return np.full(np.shape(current_speed), DEFAULT_MIN_SPEED_KMH) if np.ndim(current_speed) else DEFAULT_MIN_SPEED_KMH
+        result = np.interp(current_speed, self.speeds, self.min_speeds)
+        return float(result) if np.ndim(result) == 0 else result
+
+# (승차감 등급 × 높이 × 깊이) 격자에서 목표 RMS를 만드는 속도 [km/h] 표.
+# 속도는 1/√gain 에 비례하므로 gain=1 기준 표를 한 번 만들고, pR 보정 계수가 바뀌면 배율만 곱해 다시 만든다.
+# 깊이 방향으로는 속도가 선형이라 보간 오차가 없고, 높이 방향은 촘촘한 격자로 보간한다. 격자 밖 입력은 식으로 직접 계산한다.
+class PlanningTable:
+    def __init__(self, gain, height_range=config.PLANNING_TABLE_HEIGHT_RANGE_M, depth_range=config.PLANNING_TABLE_DEPTH_RANGE_M,
+                 height_step=config.PLANNING_TABLE_HEIGHT_STEP_M, depth_step=config.PLANNING_TABLE_DEPTH_STEP_M):
+        self.heights = np.arange(height_range[0], height_range[1] + height_step / 2, height_step)
+        self.depths = np.arange(depth_range[0], depth_range[1] + depth_step / 2, depth_step)
+        self.target_rms = np.array([config.COMFORT_TARGETS_RMS.get(level, 0.5) for level in RMS_LEVELS[:UNCOMFORTABLE_LEVEL_INDEX]])
+        coefficient = rms_coefficient(self.heights[:, None], self.depths[None, :])
+        self.unit_table = np.sqrt(self.target_rms[:, None, None] / coefficient[None, :, :]) * 3.6
+        self.gain = None
+        self.rebuilds = 0
+        self.set_gain(gain)
+
+    def set_gain(self, gain):
+        if gain == self.gain: return False
+        self.gain = gain
+        self.table = self.unit_table / math.sqrt(gain) if gain > 0 else np.zeros_like(self.unit_table)
+        self.rebuilds += 1
+        return True
+
+    # level_index 등급의 목표 RMS를 만드는 속도 [km/h] (쌍선형 보간)
+    def comfort_speed(self, level_index, h_m, L_m):
+        level_index = np.minimum(np.asarray(level_index), UNCOMFORTABLE_LEVEL_INDEX - 1)
+        h = np.asarray(h_m, dtype=float)
+        L = np.asarray(L_m, dtype=float)
+        hi = np.clip((h - self.heights[0]) / (self.heights[1] - self.heights[0]), 0, len(self.heights) - 1.000001)
+        li = np.clip((L - self.depths[0]) / (self.depths[1] - self.depths[0]), 0, len(self.depths) - 1.000001)
+        h0, l0 = hi.astype(int), li.astype(int)
+        fh, fl = hi - h0, li - l0
+        t = self.table
+        speed = ((t[level_index, h0, l0] * (1 - fl) + t[level_index, h0, l0 + 1] * fl) * (1 - fh)
+                 + (t[level_index, h0 + 1, l0] * (1 - fl) + t[level_index, h0 + 1, l0 + 1] * fl) * fh)
+
+        inside = (h >= self.heights[0]) & (h <= self.heights[-1]) & (L >= self.depths[0]) & (L <= self.depths[-1])
+        if not np.all(inside):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                exact = np.sqrt(self.target_rms[level_index] / (self.gain * rms_coefficient(h, L))) * 3.6
+            speed = np.where(inside, speed, np.where(np.isfinite(exact), exact, 0.0))
+        return float(speed) if np.ndim(speed) == 0 else speed
+
+    # plan_bump_response 의 목표 속도 계산을 배열로: (target_speed, prediction_RMS, level_index)
+    def plan(self, h_m, L_m, current_speed, speed_map):
+        minimum_Speed = np.asarray(speed_map.min_speed(current_speed), dtype=float)
+        prediction_RMS = self.gain * (minimum_Speed / 3.6) ** 2 * rms_coefficient(h_m, L_m)
+        level_index = classify_rms_index(prediction_RMS)
+        comfort_speed = np.asarray(self.comfort_speed(level_index, h_m, L_m)) + config.TARGET_SPEED_MARGIN_KMH
+        target_speed = np.where(level_index >= UNCOMFORTABLE_LEVEL_INDEX, minimum_Speed, np.maximum(minimum_Speed, comfort_speed))
+        if np.ndim(target_speed) == 0: return float(target_speed), float(prediction_RMS), int(level_index)
+        return target_speed, prediction_RMS, level_index
@@ -0,0 +1,46 @@
+# src/telemetry.py
+from config import config
+from utils import com_runtime
+from utils.clock import REAL_CLOCK
+from samples.UCwinRoadCOM import UCwinRoadComProxy
+from utils.bump_index import as_xyz
+from utils.vehicle_state import read_vehicle_state
+
+def read_front_vehicle(car, const):
+    front_car = car.DriverAheadInTraffic(const._primaryPath)
+    if front_car and hasattr(front_car, 'TransientType') and front_car.TransientType == const._TransientCar and front_car.ID != 0:
+        return front_car.ID, front_car.Name, as_xyz(front_car.Position)
+    return None, "", None
+
+# 자차/전방 차량 상태를 고정 주기로 COM에서 읽어 공유 메모리 telemetry 레코드로 발행한다.
+# 다른 노드는 driver.CurrentCar / Position / Speed 를 직접 호출하지 않고 이 레코드를 읽는다.
+def run_telemetry_publisher(telemetry, rate_hz=config.TELEMETRY_RATE_HZ, clock=REAL_CLOCK):
+    com_runtime.co_initialize()
+    try:
+        winRoadProxy = UCwinRoadComProxy()
+        driver = winRoadProxy.SimulationCore.TrafficSimulation.Driver
+        const = winRoadProxy.const
+    except Exception:
+        com_runtime.co_uninitialize()
+        return
+
+    period = 1.0 / rate_hz
+    next_tick = clock.monotonic()
+    while True:
+        try:
+            car = driver.CurrentCar
+            if not car:
+                telemetry.publish(None, timestamp=clock.time())
+            else:
+                ego = read_vehicle_state(car, clock.time(), with_direction=True)
+                telemetry.publish(ego, *read_front_vehicle(car, const), timestamp=ego.timestamp)
+        except Exception:
+            telemetry.publish(None, timestamp=clock.time())
+            clock.sleep(0.5)
+            next_tick = clock.monotonic()
+
+        next_tick += period
+        delay = next_tick - clock.monotonic()
+        if delay > 0: clock.sleep(delay)
+        else: next_tick = clock.monotonic()
+    com_runtime.co_uninitialize()
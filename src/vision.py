@@ -1,18 +1,20 @@
 # src/vision.py
 import cv2
 import numpy as np
-import win32gui, win32ui, win32con
-import time
 import collections
 import queue
-import pythoncom
-import math
-from win32com.client import Dispatch, GetActiveObject
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from config import config
+from utils import com_runtime
+from utils.clock import REAL_CLOCK
 from utils.logger import print_at
+from utils.scheduler import FrameScheduler
+from utils.packet import make_perception_packet, decode_packet
+from utils.bump_catalog import build_bump_catalog, BumpCatalogReader
 from samples.UCwinRoadCOM import UCwinRoadComProxy
-from samples.UCwinRoadUtils import Distance
+from src.frame_source import LiveFrameSource, SimulatedFrameSource
 
 def classify_speed_bump_type(Bump_Pattern, Measured_Height):
     cfg = config.CLASSIFICATION_THRESHOLDS
@@ -30,72 +32,131 @@ def classify_speed_bump_type(Bump_Pattern, Measured_Height):
     
     return "None"
 
-def get_gt_depth(confirmed_type, ThreeDModelGT_cache, my_car):
-    if not ThreeDModelGT_cache or not my_car: return 3.0
+def get_gt_depth(confirmed_type, bump_index, my_car):
+    if not bump_index or my_car is None: return 3.0
 
-    relevant_bumps = [b for b in ThreeDModelGT_cache if b['type'] == confirmed_type]
-    if not relevant_bumps: return 3.0
-
-    try:
-        car_pos = my_car.Position
-        closest_bump = min(relevant_bumps, key=lambda b: Distance(car_pos, b['position']))
-        return closest_bump['GT_Depth']
-    except Exception:
-        return 3.0
+    _, closest_bump = bump_index.nearest(my_car.position, lambda b: b['type'] == confirmed_type)
+    return closest_bump['GT_Depth'] if closest_bump else 3.0
         
-def capture_simulation_window(window_title):
-    hwnd = win32gui.FindWindow(None, window_title)
-    if hwnd == 0: return None
-    left, top, right, bot = win32gui.GetClientRect(hwnd)
-    w, h = right - left, bot - top
-    if w < 2 or h < 2: return None
-    hwndDC = win32gui.GetWindowDC(hwnd)
-    mfcDC  = win32ui.CreateDCFromHandle(hwndDC)
-    saveDC = mfcDC.CreateCompatibleDC()
-    saveBitMap = win32ui.CreateBitmap()
-    saveBitMap.CreateCompatibleBitmap(mfcDC, w, h)
-    saveDC.SelectObject(saveBitMap)
-    saveDC.BitBlt((0, 0), (w, h), mfcDC, (0, 0), win32con.SRCCOPY)
-    bmpstr = saveBitMap.GetBitmapBits(True)
-    frame = np.frombuffer(bmpstr, dtype=np.uint8).reshape((h, w, 4))
-    win32gui.DeleteObject(saveBitMap.GetHandle())
-    saveDC.DeleteDC(); mfcDC.DeleteDC(); win32gui.ReleaseDC(hwnd, hwndDC)
-    return frame[..., :3].copy()
-
-def extract_road_roi(frame, roi_settings):
-    h, w, _ = frame.shape
+# 분석 결과 한 프레임을 연속 프레임 확정 이력에 넣고 Control로 보낼 Vision 패킷을 만든다.
+# 같은 종류가 DETECTION_CONFIRM_FRAME_COUNT 프레임 연속 분류되어야 확정하고, "None" 프레임에서 이력을 비운다.
+def make_vision_packet(result, detection_history, bump_index, ego, timestamp):
+    Bump_Pattern, Measured_Height, Measured_Distance, Bump_Type, Height_Quality = result
+    detection_history.append(Bump_Type)
+    confirmed_type = "None"
+    if len(detection_history) == config.DETECTION_CONFIRM_FRAME_COUNT and len(set(detection_history)) == 1:
+        confirmed_type = detection_history[0]
+    if Bump_Type == "None":
+        detection_history.clear()
+
+    GT_Depth_m = get_gt_depth(confirmed_type, bump_index, ego) if confirmed_type != "None" else 0.0
+    return make_perception_packet(confirmed_type, 'Vision', Measured_Height, Measured_Distance, GT_Depth_m,
+                                  Height_Quality.pixel_count, Height_Quality.hue_variance, timestamp=timestamp)
+
+RoiMask = collections.namedtuple('RoiMask', ['points', 'mask', 'rect'])
+ROI_MASK_CACHE_SIZE = 4
+_roi_mask_cache = collections.OrderedDict()
+_roi_mask_lock = threading.Lock()
+
+# ROI 마스크는 (h, w, roi_settings)에만 의존하므로 한 번 계산한 뒤 읽기 전용으로 재사용한다.
+# 같은 ROI 설정의 창 크기가 바뀌면 이전 크기의 항목을 버리고, 오래된 설정은 LRU로 밀려난다.
+def get_roi_mask(h, w, roi_settings):
+    with _roi_mask_lock:
+        return _get_roi_mask(h, w, roi_settings)
+
+def _get_roi_mask(h, w, roi_settings):
+    roi_key = tuple(sorted(roi_settings.items()))
+    key = (h, w, roi_key)
+    roi = _roi_mask_cache.get(key)
+    if roi is not None:
+        _roi_mask_cache.move_to_end(key)
+        return roi
+
+    for stale_key in [k for k in _roi_mask_cache if k[2] == roi_key]:
+        del _roi_mask_cache[stale_key]
+
     top_y, bottom_y = int(h * roi_settings['top_y']), int(h * roi_settings['bottom_y'])
     top_x_start, top_x_end = int(w/2-(w*roi_settings['top_w']/2)), int(w/2+(w*roi_settings['top_w']/2))
     bottom_x_start, bottom_x_end = int(w/2-(w*roi_settings['bottom_w']/2)), int(w/2+(w*roi_settings['bottom_w']/2))
     roi_points = np.array([(top_x_start,top_y),(top_x_end,top_y),(bottom_x_end,bottom_y),(bottom_x_start,bottom_y)],dtype=np.int32)
-    mask = np.zeros_like(frame[:,:,0]); cv2.fillPoly(mask,[roi_points],255)
-    return roi_points, mask
+    mask = np.zeros((h, w), dtype=np.uint8); cv2.fillPoly(mask,[roi_points],255)
 
-def detect_bump_pattern(frame, roi_mask, pattern_settings):
+    x, y, rw, rh = cv2.boundingRect(roi_points)
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(w, x + rw), min(h, y + rh)
+    rect = (x0, y0, max(0, x1 - x0), max(0, y1 - y0))
+    roi_points.flags.writeable = False
+    mask.flags.writeable = False
+    roi = RoiMask(roi_points, mask, rect)
+
+    _roi_mask_cache[key] = roi
+    while len(_roi_mask_cache) > ROI_MASK_CACHE_SIZE:
+        _roi_mask_cache.popitem(last=False)
+    return roi
+
+def crop_to_roi(image, rect):
+    x, y, rw, rh = rect
+    return image[y:y+rh, x:x+rw]
+
+def detect_bump_pattern(frame, roi_mask, pattern_settings, roi_rect=None):
+    if roi_rect is not None:
+        frame, roi_mask = crop_to_roi(frame, roi_rect), crop_to_roi(roi_mask, roi_rect)
     hsv_img = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
     lower_yellow = np.array(pattern_settings['yellow_lower']); upper_yellow = np.array(pattern_settings['yellow_upper'])
     color_mask = cv2.inRange(hsv_img, lower_yellow, upper_yellow)
     detection_mask = cv2.bitwise_and(color_mask, roi_mask)
-    return np.sum(detection_mask > 0) > pattern_settings['min_pixel_area']
+    return cv2.countNonZero(detection_mask) > pattern_settings['min_pixel_area']
+
+_HUE_DIV_TABLE = np.zeros(256, dtype=np.int32)
+_HUE_DIV_TABLE[1:] = np.round((180 << 12) / (6.0 * np.arange(1, 256))).astype(np.int32)
+
+# OpenCV COLOR_BGR2HSV(8bit)의 H 채널과 동일한 정수 연산으로 H만 직접 계산한다.
+def compute_hue_channel(frame):
+    b, g, r = (frame[..., i].astype(np.int32) for i in range(3))
+    v = np.maximum(np.maximum(b, g), r)
+    diff = v - np.minimum(np.minimum(b, g), r)
+    hue = np.where(v == r, g - b, np.where(v == g, b - r + 2 * diff, r - g + 4 * diff))
+    hue = (hue * _HUE_DIV_TABLE[diff] + (1 << 11)) >> 12
+    hue[hue < 0] += 180
+    return hue.astype(np.uint8)
 
-def analyze_bump_height_map(frame, roi_mask):
+HeightQuality = collections.namedtuple('HeightQuality', ['pixel_count', 'hue_variance'])
+
+# hull 외접 사각형 안에서만 마스크를 만들어 hull 내부 H 평균/분산과 픽셀 수를 구한다.
+def estimate_hull_hue(h_channel, hull, hull_rect):
+    x, y, wc, hc = hull_rect
+    local_mask = np.zeros((hc, wc), dtype=np.uint8)
+    cv2.fillConvexPoly(local_mask, hull - np.array([x, y], dtype=hull.dtype), 255)
+    pixel_count = cv2.countNonZero(local_mask)
+    if pixel_count == 0: return None, HeightQuality(0, 0.0)
+    mean, std = cv2.meanStdDev(h_channel[y:y+hc, x:x+wc], mask=local_mask)
+    return float(mean[0, 0]), HeightQuality(pixel_count, float(std[0, 0]) ** 2)
+
+def analyze_bump_height_map(frame, roi_mask, roi_rect=None):
     h, w, _ = frame.shape
-    hsv_img = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV); h_channel = hsv_img[:,:,0]
+    offset_y = 0
+    if roi_rect is not None:
+        offset_y = roi_rect[1]
+        frame, roi_mask = crop_to_roi(frame, roi_rect), crop_to_roi(roi_mask, roi_rect)
+    if config.HEIGHT_ANALYSIS_SETTINGS.get('hue_direct', False):
+        h_channel = compute_hue_channel(frame)
+    else:
+        hsv_img = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV); h_channel = hsv_img[:,:,0]
     hue_mask = cv2.inRange(h_channel, config.HEIGHT_ANALYSIS_SETTINGS['hue_lower'], config.HEIGHT_ANALYSIS_SETTINGS['hue_upper'])
     analysis_mask = cv2.bitwise_and(hue_mask, roi_mask)
     contours, _ = cv2.findContours(analysis_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    Measured_Height, Measured_Distance = 0.0, 0.0
+    Measured_Height, Measured_Distance, Height_Quality = 0.0, 0.0, HeightQuality(0, 0.0)
     if contours:
         all_points = np.concatenate(contours)
         if len(all_points) > 5:
             hull = cv2.convexHull(all_points)
             if cv2.contourArea(hull) > config.HEIGHT_ANALYSIS_SETTINGS['min_contour_area']:
-                x,y,wc,hc = cv2.boundingRect(hull)
+                hull_rect = cv2.boundingRect(hull)
+                x,y,wc,hc = hull_rect
+                y += offset_y
                 if hc > 0 and (wc / hc) > config.HEIGHT_ANALYSIS_SETTINGS['min_aspect_ratio']:
-                    hull_mask = np.zeros_like(analysis_mask); cv2.drawContours(hull_mask, [hull], -1, 255, -1)
-                    hue_values = h_channel[np.nonzero(hull_mask)]
-                    if hue_values.size > 0:
-                        avg_hue = np.mean(hue_values)
+                    avg_hue, Height_Quality = estimate_hull_hue(h_channel, hull, hull_rect)
+                    if avg_hue is not None:
                         h_points = config.HEIGHT_ANALYSIS_SETTINGS['height_interpolation_hue']
                         m_points = config.HEIGHT_ANALYSIS_SETTINGS['height_interpolation_m']
                         Measured_Height = np.interp(avg_hue, h_points, m_points)
@@ -106,116 +167,177 @@ def analyze_bump_height_map(frame, roi_mask):
                     dist_calib = config.HEIGHT_ANALYSIS_SETTINGS['distance_calibration']
                     y_points = sorted(dist_calib.keys()); dist_points = [dist_calib[y] for y in y_points]
                     Measured_Distance = float(np.interp(yb_norm,y_points,dist_points))
-    return Measured_Height, Measured_Distance
+    return Measured_Height, Measured_Distance, Height_Quality
 
-def run_vision_processing(vision_to_control_queue, v2v_to_vision_queue, forward_vehicle_distance):
-    pythoncom.CoInitialize()
-    winRoadProxy, my_car = None, None
-    ThreeDModelGT_cache = []
+def analyze_regular_view(read_frame, timings, clock=REAL_CLOCK):
+    t0 = clock.perf()
+    regular_frame = read_frame()
+    t1 = clock.perf(); timings['capture_top'] = t1 - t0
+    if regular_frame is None: return None
+    roi_pattern = get_roi_mask(*regular_frame.shape[:2], config.ROI_SETTINGS_PATTERN)
+    Bump_Pattern = detect_bump_pattern(regular_frame, roi_pattern.mask, config.PATTERN_ANALYSIS_SETTINGS, roi_pattern.rect)
+    timings['pattern'] = clock.perf() - t1
+    return Bump_Pattern
 
-    try:
-        winRoadProxy = UCwinRoadComProxy()
-        driver = winRoadProxy.SimulationCore.TrafficSimulation.Driver
-        project = winRoadProxy.Project
-        
-        target_names = ["typea", "typeb", "typec"]
-        instance_count = project.ThreeDModelInstancesCount
-        for i in range(instance_count):
-            instance = project.ThreeDModelInstance(i)
-            instance_name_lower = instance.Name.lower()
-            if any(instance_name_lower.startswith(target) for target in target_names):
-                height, depth = 0.0, 0.0
-                try:
-                    if instance.BoundingBoxesCount > 0:
-                        bbox = instance.BoundingBox(0)
-                        height = math.sqrt(bbox.yAxis.X**2 + bbox.yAxis.Y**2 + bbox.yAxis.Z**2) * 2
-                        depth = math.sqrt(bbox.zAxis.X**2 + bbox.zAxis.Y**2 + bbox.zAxis.Z**2) * 2
-                except Exception: pass
-                
-                bump_type = "UNKNOWN"
-                if "typea" in instance_name_lower: bump_type = "A"
-                elif "typeb" in instance_name_lower: bump_type = "B"
-                elif "typec" in instance_name_lower: bump_type = "C"
+def analyze_height_view(read_frame, timings, clock=REAL_CLOCK):
+    t0 = clock.perf()
+    height_frame = read_frame()
+    t1 = clock.perf(); timings['capture_test'] = t1 - t0
+    if height_frame is None: return None
+    roi_height = get_roi_mask(*height_frame.shape[:2], config.ROI_SETTINGS_HEIGHT)
+    result = analyze_bump_height_map(height_frame, roi_height.mask, roi_height.rect)
+    timings['height'] = clock.perf() - t1
+    return result
 
-                ThreeDModelGT_cache.append({ "id": instance.ID, "name": instance.Name, "type": bump_type, "position": instance.Position, "GT_Height": height, "GT_Depth": depth })
-        
-        t0 = time.time()
-        while my_car is None and time.time() - t0 < 15.0:
-            my_car = driver.CurrentCar
-            time.sleep(0.2)
-        if my_car is None and forward_vehicle_distance is not None: 
-            raise RuntimeError()
+# <top>/<test> 두 경로는 classify_speed_bump_type 전까지 독립적이므로 concurrent 모드에서는 뷰별 전용 스레드에서
+# 캡처와 분석을 동시에 수행한다. (win32ui DC 객체는 스레드별로 관리되므로 각 뷰는 항상 같은 스레드에서 캡처한다.)
+class VisionPipeline:
+    def __init__(self, frame_source, concurrent=None, clock=REAL_CLOCK):
+        if concurrent is None: concurrent = config.VISION_CONCURRENT_VIEWS
+        self.frame_source = frame_source
+        self.clock = clock
+        self.workers = None
+        if concurrent:
+            self.workers = (ThreadPoolExecutor(max_workers=1, thread_name_prefix="vision-top"),
+                            ThreadPoolExecutor(max_workers=1, thread_name_prefix="vision-test"))
+        self.stage_latency = {}
+        self.torn_frames = 0
+
+    def _view_readers(self):
+        if hasattr(self.frame_source, 'read_regular'):
+            return self.frame_source.read_regular, self.frame_source.read_height
+        frames = self.frame_source.read()
+        if frames is None: return None
+        return (lambda: frames[0]), (lambda: frames[1])
+
+    # 링 버퍼 소스에서 분석 도중 슬롯이 덮어써졌으면 결과를 버리고 한 번 더 읽는다.
+    def process(self):
+        for _ in range(2):
+            result = self._process_once()
+            if result is None or self.frames_valid(): return result
+            self.torn_frames += 1
+        return None
+
+    def frames_valid(self):
+        frames_valid = getattr(self.frame_source, 'frames_valid', None)
+        return frames_valid is None or frames_valid()
+
+    # 프레임 손실 집계: 분석 중 덮어써져 버린 프레임(torn)과, 링 버퍼 소스면 따라잡지 못해 건너뛴 프레임(drop)과
+    # 최대 크기를 넘어 링에 기록되지 못한 프레임(oversize)
+    def frame_stats(self):
+        stats = [('torn', self.torn_frames)]
+        for label, attr in (('drop', 'dropped'), ('oversize', 'oversize_frames')):
+            value = getattr(self.frame_source, attr, None)
+            if value is not None: stats.append((label, value))
+        return " ".join(f"{label}:{value}" for label, value in stats)
+
+    def _process_once(self):
+        timings = {}
+        readers = self._view_readers()
+        if readers is None: return None
+        t0 = self.clock.perf()
+        read_regular, read_height = readers
+        if self.workers is not None:
+            regular_future = self.workers[0].submit(analyze_regular_view, read_regular, timings, self.clock)
+            height_future = self.workers[1].submit(analyze_height_view, read_height, timings, self.clock)
+            Bump_Pattern, height_result = regular_future.result(), height_future.result()
+        else:
+            Bump_Pattern = analyze_regular_view(read_regular, timings, self.clock)
+            height_result = analyze_height_view(read_height, timings, self.clock) if Bump_Pattern is not None else None
+        if Bump_Pattern is None or height_result is None: return None
+
+        Measured_Height, Measured_Distance, Height_Quality = height_result
+        t1 = self.clock.perf()
+        Bump_Type = classify_speed_bump_type(Bump_Pattern, Measured_Height)
+        timings['classify'] = self.clock.perf() - t1
+        timings['total'] = self.clock.perf() - t0
+        self.stage_latency = timings
+        return Bump_Pattern, Measured_Height, Measured_Distance, Bump_Type, Height_Quality
+
+    def close(self):
+        if self.workers is not None:
+            for worker in self.workers: worker.shutdown(wait=False)
+        self.frame_source.release()
+
+def analyze_frame_pair(regular_frame, height_frame):
+    timings = {}
+    Bump_Pattern = analyze_regular_view(lambda: regular_frame, timings)
+    Measured_Height, Measured_Distance, Height_Quality = analyze_height_view(lambda: height_frame, timings)
+    Bump_Type = classify_speed_bump_type(Bump_Pattern, Measured_Height)
+    return Bump_Pattern, Measured_Height, Measured_Distance, Bump_Type, Height_Quality
+
+def format_stage_latency(stage_latency):
+    names = [('capture_top', 'cT'), ('capture_test', 'cH'), ('pattern', 'P'), ('height', 'H'), ('total', 'Σ')]
+    return "|".join(f"{label}:{stage_latency[key]*1000:.1f}" for key, label in names if key in stage_latency) + "ms"
+
+def run_vision_processing(vision_to_control_queue, v2v_to_vision_queue, telemetry, frame_source=None, bump_catalog=None, clock=REAL_CLOCK):
+    com_runtime.co_initialize()
+    if frame_source is None:
+        frame_source = SimulatedFrameSource(clock=clock) if config.UCWIN_BACKEND == "headless" else LiveFrameSource()
+    pipeline = VisionPipeline(frame_source, clock=clock)
+    bump_catalog_reader = BumpCatalogReader(bump_catalog)
+
+    try:
+        if not bump_catalog_reader.refresh():
+            bump_catalog_reader.load(build_bump_catalog(UCwinRoadComProxy().Project))
     except Exception:
-        if forward_vehicle_distance is not None:
-            pythoncom.CoUninitialize()
+        if telemetry is not None:
+            com_runtime.co_uninitialize()
             return
 
     Detection_History = collections.deque(maxlen=config.DETECTION_CONFIRM_FRAME_COUNT)
+    scheduler = FrameScheduler(config.VISION_FRAME_RATE_HZ, config.VISION_BOOST_FRAME_RATE_HZ,
+                               config.VISION_IDLE_FRAME_RATE_HZ, config.VISION_IDLE_AFTER_FRAMES, clock)
 
     while True:
         try:
-            if my_car is None and forward_vehicle_distance is not None:
-                 my_car = winRoadProxy.SimulationCore.TrafficSimulation.Driver.CurrentCar
-                 time.sleep(0.5)
+            vehicle = telemetry.read() if telemetry is not None else None
+            if vehicle is not None and vehicle.ego is None:
+                 clock.sleep(0.5)
+                 scheduler.reset()
                  continue
             
+            bump_catalog_reader.refresh()
             Is_V2V = False
-            if forward_vehicle_distance is not None:
-                Is_V2V = (forward_vehicle_distance.value <= 30.0)
+            if vehicle is not None:
+                Is_V2V = (vehicle.front_distance <= config.V2V_RANGE_M)
 
             if Is_V2V:
                 try:
-                    v2v_data = v2v_to_vision_queue.get_nowait()
-                    vehicle_name = v2v_data.get('vehicle_name', 'Vehicle')
-                    bump_distance = v2v_data.get('distance_m', 0.0)
-                    depth_m = v2v_data.get('width_m', 0.0)
+                    v2v_data = decode_packet(v2v_to_vision_queue.get_nowait())
                     
-                    log_msg = f"[{v2v_data.get('source', 'V2V')}]{vehicle_name} | Dt:{bump_distance:.1f}m | Dp:{depth_m:.2f}m"
+                    log_msg = f"[{v2v_data.source}]{v2v_data.vehicle_name or 'Vehicle'} | Dt:{v2v_data.bump_distance:.1f}m | Dp:{v2v_data.depth_m:.2f}m"
                     print_at('INFO_SOURCE', log_msg)
                     
-                    data_packet = { 'type': v2v_data.get('type'), 'Measured_Height': v2v_data.get('height_m'), 'bump_distance': bump_distance, 'depth_m': depth_m, 'source': v2v_data.get('source', 'V2V') }
-                    vision_to_control_queue.put_nowait(data_packet)
+                    vision_to_control_queue.put_nowait(v2v_data)
                 except queue.Empty:
-                    log_msg = f"[V2V]전방차량:{forward_vehicle_distance.value:.1f}m"
+                    log_msg = f"[V2V]전방차량:{vehicle.front_distance:.1f}m"
                     print_at('INFO_SOURCE', log_msg)
-                    vision_to_control_queue.put_nowait({'type': 'None'})
+                    vision_to_control_queue.put_nowait(make_perception_packet("None", timestamp=clock.time()))
             else:
-                regular_frame = capture_simulation_window(config.REGULAR_VIEW_WINDOW_TITLE)
-                height_frame = capture_simulation_window(config.HEIGHT_MAP_WINDOW_TITLE)
-                if regular_frame is None or height_frame is None:
-                    time.sleep(1)
+                result = pipeline.process()
+                if result is None:
+                    clock.sleep(1)
+                    scheduler.reset()
                     continue
 
-                _, road_mask_pattern = extract_road_roi(regular_frame, config.ROI_SETTINGS_PATTERN)
-                _, road_mask_height = extract_road_roi(height_frame, config.ROI_SETTINGS_HEIGHT)
-                
-                Bump_Pattern = detect_bump_pattern(regular_frame, road_mask_pattern, config.PATTERN_ANALYSIS_SETTINGS)
-                Measured_Height, Measured_Distance = analyze_bump_height_map(height_frame, road_mask_height)
+                Bump_Pattern, Measured_Height, Measured_Distance, Bump_Type, Height_Quality = result
                 
-                Bump_Type = classify_speed_bump_type(Bump_Pattern, Measured_Height)
-                
-                Detection_History.append(Bump_Type)
-                confirmed_type = "None"
-                if len(Detection_History) == config.DETECTION_CONFIRM_FRAME_COUNT and len(set(Detection_History)) == 1:
-                    confirmed_type = Detection_History[0]
-                if Bump_Type == "None":
-                    Detection_History.clear()
-                    
-                GT_Depth_m = 0.0
-                if confirmed_type != "None":
-                    GT_Depth_m = get_gt_depth(confirmed_type, ThreeDModelGT_cache, my_car)
+                scheduler.report_activity(Bump_Type != "None" or Bump_Pattern or Measured_Height > 0)
+                data_packet = make_vision_packet(result, Detection_History, bump_catalog_reader.index, vehicle.ego if vehicle is not None else None, clock.time())
                 
-                if forward_vehicle_distance is not None:
-                    log_msg = f"[Vision] H:{Measured_Height:.2f}m|Dt:{Measured_Distance:.1f}m|Dp:{GT_Depth_m:.2f}m|T:{confirmed_type}|P:{Bump_Pattern}"
+                if telemetry is not None:
+                    log_msg = f"[Vision] H:{Measured_Height:.2f}m|Dt:{Measured_Distance:.1f}m|Dp:{data_packet.depth_m:.2f}m|T:{data_packet.type}|P:{Bump_Pattern}"
                     print_at('INFO_SOURCE', log_msg)
+                    print_at('VISION_LATENCY', f"[Vision] {format_stage_latency(pipeline.stage_latency)} | {scheduler.current_rate_hz:.0f}Hz miss:{scheduler.missed_deadlines} {pipeline.frame_stats()}")
 
-                data_packet = { 'type': confirmed_type, 'Measured_Height': Measured_Height, 'bump_distance': Measured_Distance, 'depth_m': GT_Depth_m, 'source': 'Vision' }
                 vision_to_control_queue.put_nowait(data_packet)
 
         except Exception:
-            if forward_vehicle_distance is not None:
-                my_car = None
-                time.sleep(0.5)
+            if telemetry is not None:
+                clock.sleep(0.5)
+                scheduler.reset()
         
-        time.sleep(0.1)
-    pythoncom.CoUninitialize()
\ No newline at end of file
+        scheduler.wait()
+    pipeline.close()
+    com_runtime.co_uninitialize()
\ No newline at end of file
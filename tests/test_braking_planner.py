@@ -0,0 +1,43 @@
+from config import config
+from src.braking_planner import KinematicBrakePlanner, SpeedTrackingController, remaining_distance
+from src.horizon_planner import BumpHorizon
+from utils.vehicle_state import VehicleState
+
+def test_no_full_brake_within_target_margin_at_bump():
+    planner = KinematicBrakePlanner()
+    distance = config.PLANNER_DISTANCE_MARGIN_M * 0.5
+    assert remaining_distance(25.0, distance, planner.latency_s) <= 0
+    assert planner.command(25.0 + config.TARGET_SPEED_MARGIN_KMH * 0.5, 25.0, distance, engaged=True) == 0.0
+    assert planner.command(25.0 + config.TARGET_SPEED_MARGIN_KMH * 3.0, 25.0, distance) == 1.0
+
+def test_brakes_before_bump_when_over_target():
+    planner = KinematicBrakePlanner()
+    assert 0.0 < planner.command(40.0, 25.0, 15.0, engaged=True) < 1.0
+    assert planner.command(24.0, 25.0, 15.0, engaged=True) == 0.0
+
+def test_pi_controller_engages_and_resumes_braking():
+    controller = SpeedTrackingController()
+    controller.begin()
+    level = controller.step(0.0, 10.0, 40.0, 25.0)
+    assert level > 0 and controller.engaged
+    controller.begin(engaged=True)
+    assert controller.engaged and controller.level == level
+    assert abs(controller.step(0.05, 30.0, 39.0, 25.0) - level) <= controller.rate_limit * controller.latency_s + 1e-9
+
+def test_horizon_binding_ignores_passed_targets():
+    horizon = BumpHorizon(size=3)
+    horizon.add({'id': 0, 'type': "B", 'x': -2.0, 'y': 0.0, 'z': 0.0}, 10.0, 0.18, 3.6, "Vision")
+    horizon.add({'id': 1, 'type': "A", 'x': 30.0, 'y': 0.0, 'z': 0.0}, 20.0, 0.08, 3.6, "Vision")
+    state = VehicleState(0.0, 0.0, 0.0, 0.0, 40.0, 1.0, 0.0, 0.0)
+    assert horizon.binding(state, 50.0, 30.0) == (30.0, 20.0)
+    assert horizon.binding(VehicleState(0.0, 0.0, 0.0, 0.0, 40.0), 50.0, 30.0) == (50.0, 30.0)
+
+def test_pi_controller_rate_limits_first_tick_and_release():
+    controller = SpeedTrackingController()
+    controller.begin()
+    step = controller.rate_limit * controller.latency_s
+    assert 0.0 < controller.step(0.0, 5.0, 50.0, 25.0) <= step + 1e-9
+    for i in range(1, 20):
+        level = controller.step(i * controller.latency_s, 5.0, 50.0, 25.0)
+    released = controller.step(20 * controller.latency_s, 4.0, 24.0, 25.0)
+    assert level - step - 1e-9 <= released < level
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from src.headless_sim import HeadlessProject, HeadlessModelInstance
+from utils.bump_catalog import BumpCatalog, BumpCatalogReader, build_bump_catalog
+
+LAYOUT = [("TypeA_01", 100.0, 0.08, 3.6), ("TypeB_01", 150.0, 0.18, 3.6), ("Road_01", 0.0, 0.0, 0.0)]
+
+def counting_project(layout, monkeypatch):
+    reads = []
+    original = HeadlessModelInstance.BoundingBox
+    monkeypatch.setattr(HeadlessModelInstance, 'BoundingBox', lambda self, index: reads.append(self.Name) or original(self, index))
+    return HeadlessProject(layout), reads
+
+def test_cache_hit_reads_no_bounding_boxes(tmp_path, monkeypatch):
+    build_bump_catalog(HeadlessProject(LAYOUT), str(tmp_path))
+    project, reads = counting_project(LAYOUT, monkeypatch)
+    records = build_bump_catalog(project, str(tmp_path))
+    assert reads == [] and records['name'].tolist() == ["TypeA_01", "TypeB_01"]
+
+def test_moved_bump_is_read_again(tmp_path, monkeypatch):
+    build_bump_catalog(HeadlessProject(LAYOUT), str(tmp_path))
+    moved = [("TypeA_01", 100.0, 0.08, 3.6), ("TypeB_01", 170.0, 0.12, 1.8), LAYOUT[2]]
+    project, reads = counting_project(moved, monkeypatch)
+    records = build_bump_catalog(project, str(tmp_path))
+    assert reads == ["TypeB_01"]
+    assert records[1]['x'] == 170.0 and abs(records[1]['GT_Height'] - 0.12) < 1e-9
+
+def test_long_names_are_reused(tmp_path, monkeypatch):
+    layout = [("TypeA_" + "x" * 40, 100.0, 0.08, 3.6), LAYOUT[2]]
+    build_bump_catalog(HeadlessProject(layout), str(tmp_path))
+    layout.append(("TypeC_01", 200.0, 0.10, 1.8))
+    project, reads = counting_project(layout, monkeypatch)
+    records = build_bump_catalog(project, str(tmp_path))
+    assert reads == ["TypeC_01"] and records[0]['name'] == layout[0][0]
+
+def test_projects_do_not_share_cache_files(tmp_path, monkeypatch):
+    build_bump_catalog(HeadlessProject(LAYOUT), str(tmp_path))
+    other = [LAYOUT[0], ("Bridge_01", 50.0, 0.0, 0.0)]
+    build_bump_catalog(HeadlessProject(other), str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_publish_and_read_if_changed():
+    records = build_bump_catalog(HeadlessProject(LAYOUT))
+    catalog = BumpCatalog.create(capacity=4)
+    try:
+        assert catalog.read_if_changed() == (-1, None)
+        generation = catalog.publish(records)
+        known, copied = catalog.read_if_changed()
+        assert known == generation == 1 and copied.tolist() == records.tolist()
+        assert catalog.read_if_changed(known) == (known, None)
+        assert catalog.publish(records[:1]) == 2 and len(catalog.read_if_changed(known)[1]) == 1
+        with pytest.raises(ValueError):
+            catalog.publish(build_bump_catalog(HeadlessProject(LAYOUT * 3)))
+    finally:
+        catalog.close()
+
+def test_reader_rebuilds_index_only_on_new_generation():
+    catalog = BumpCatalog.create(capacity=4)
+    try:
+        reader = BumpCatalogReader(catalog)
+        assert reader.refresh() is False
+        catalog.publish(build_bump_catalog(HeadlessProject(LAYOUT)))
+        assert reader.refresh() is True and [entry['name'] for entry in reader.entries] == ["TypeA_01", "TypeB_01"]
+        index = reader.index
+        assert reader.refresh() is False and reader.index is index
+    finally:
+        catalog.close()
@@ -0,0 +1,39 @@
+import math
+import random
+
+from utils import bump_index as bump_index_module
+from utils.bump_index import BumpIndex, is_ahead
+
+def random_entries(n, seed=0):
+    rng = random.Random(seed)
+    return [{'id': i, 'x': rng.uniform(-500, 500), 'y': rng.uniform(-2, 2), 'z': rng.uniform(-500, 500)} for i in range(n)]
+
+def brute_force(entries, origin, k, max_dist, accept):
+    found = sorted((math.dist(origin, (e['x'], e['y'], e['z'])), e['id']) for e in entries if accept(e))
+    return [(d, i) for d, i in found if d <= max_dist][:k]
+
+def ids(found):
+    return [(d, e['id']) for d, e in found]
+
+def test_queries_match_brute_force():
+    entries = random_entries(400)
+    index = BumpIndex(entries)
+    rng = random.Random(1)
+    for _ in range(50):
+        origin = (rng.uniform(-500, 500), 0.0, rng.uniform(-500, 500))
+        angle = rng.uniform(0, 2 * math.pi)
+        direction = (math.cos(angle), 0.0, math.sin(angle))
+        keep = lambda e: e['id'] % 3 != 0
+        ahead = lambda e: is_ahead(origin, direction, (e['x'], e['y'], e['z'])) and keep(e)
+        assert ids(index.next_ahead(origin, direction, 3, keep, 300.0)) == brute_force(entries, origin, 3, 300.0, ahead)
+        assert ids(index.within_radius(origin, 120.0, keep)) == brute_force(entries, origin, len(entries), 120.0, keep)
+        assert ids([index.nearest(origin)]) == brute_force(entries, origin, 1, math.inf, lambda e: True)
+
+def test_next_ahead_skips_subtrees_behind(monkeypatch):
+    entries = [{'id': i, 'x': -float(i), 'y': 0.0, 'z': 0.0} for i in range(1, 1000)] + [{'id': 0, 'x': 50.0, 'y': 0.0, 'z': 0.0}]
+    index = BumpIndex(entries)
+    checked = []
+    monkeypatch.setattr(bump_index_module, 'is_ahead', lambda *args: checked.append(args) or is_ahead(*args))
+    distance, bump = index.nearest_ahead((0.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    assert bump['id'] == 0 and distance == 50.0
+    assert len(checked) < 30
@@ -0,0 +1,35 @@
+from src.capture import CaptureSession, SyntheticCaptureBackend
+
+def make_session(w=64, h=48):
+    backend = SyntheticCaptureBackend()
+    backend.open_window("경관 위치 <top>", w, h)
+    return CaptureSession("경관 위치 <top>", backend), backend
+
+def test_grab_returns_frame_of_window_size():
+    session, backend = make_session()
+    frame = session.grab()
+    assert frame.shape == (48, 64, 3) and frame.dtype.name == 'uint8'
+    assert session.grab() is frame
+    assert backend.contexts_created == 1
+
+def test_grab_rebuilds_context_on_resize():
+    session, backend = make_session()
+    session.grab()
+    backend.resize_window("경관 위치 <top>", 80, 60)
+    assert session.grab().shape == (60, 80, 3)
+    assert session.rebuild_count == 2 and backend.contexts_released == 1
+
+def test_grab_without_window_returns_none():
+    session, backend = make_session()
+    session.grab()
+    backend.close_window("경관 위치 <top>")
+    assert session.grab() is None
+    assert backend.contexts_released == backend.contexts_created
+
+def test_release_is_idempotent():
+    session, backend = make_session()
+    session.grab()
+    session.release()
+    session.release()
+    assert backend.contexts_released == backend.contexts_created == 1
+    assert session.context is None and session.hwnd is None
@@ -0,0 +1,53 @@
+import pytest
+
+from src.control import BrakingSession
+from src.braking_planner import KinematicBrakePlanner
+from src.control_callbacks import CallbackBrakeController, FakeCallbackDriver, FakeCar
+
+class FixedLevelSession:
+    def __init__(self, level):
+        self.Brake_PWM = level
+        self.finished = False
+        self.horizon = None
+
+    def update(self, now, current_dist, speed, state=None):
+        return True
+
+@pytest.mark.parametrize("level", [0.1, 0.25, 0.5, 0.8])
+def test_sigma_delta_duty_matches_level(level):
+    controller, car = CallbackBrakeController(), FakeCar(40.0)
+    controller.arm(FixedLevelSession(level), (100.0, 0.0, 0.0))
+    ticks, on = 200, 0
+    for _ in range(ticks):
+        controller.on_tick(1.0 / 60.0, car)
+        on += car.ParkingBrake
+    assert abs(on - level * ticks) <= 1
+
+def test_analog_brake_follows_level():
+    controller, car = CallbackBrakeController(analog_brake=True), FakeCar(40.0)
+    controller.arm(FixedLevelSession(0.4), (100.0, 0.0, 0.0))
+    controller.on_tick(1.0 / 60.0, car)
+    assert car.Brake == 0.4 and not car.ParkingBrake
+
+@pytest.mark.parametrize("analog_brake", [False, True])
+def test_disarm_releases_brake(analog_brake):
+    controller, car = CallbackBrakeController(analog_brake=analog_brake), FakeCar(40.0)
+    session = FixedLevelSession(1.0)
+    controller.arm(session, (100.0, 0.0, 0.0))
+    controller.on_tick(1.0 / 60.0, car)
+    assert car.ParkingBrake or car.Brake == 1.0
+    controller.disarm(car)
+    assert not car.ParkingBrake and car.Brake == 0.0
+    assert session.finished and controller.finished.is_set()
+    controller.on_tick(1.0 / 60.0, car)
+    assert not car.ParkingBrake
+
+def test_fake_driver_brakes_to_target_before_bump():
+    controller, car = CallbackBrakeController(), FakeCar(50.0)
+    driver = FakeCallbackDriver(controller, car)
+    session = BrakingSession(25.0, 0.0, 40.0, driver.clock.time(), planner=KinematicBrakePlanner())
+    controller.arm(session, (40.0, 0.0, 0.0))
+    steps = driver.run()
+    assert controller.finished.is_set() and steps < 100000
+    assert car.x > 40.0 and 20.0 < car.Speed() < 30.0
+    assert not car.ParkingBrake
@@ -0,0 +1,33 @@
+from src.control import ControlDecision
+from src.planning_table import SpeedMap
+from utils.bump_index import BumpIndex
+from utils.packet import decode_packet, encode_packet, make_perception_packet
+from utils.vehicle_state import VehicleState
+
+def make_bump(bump_id, x, bump_type="A", height=0.08, depth=3.6):
+    return {'id': bump_id, 'name': f"Type{bump_type}_{bump_id:02d}", 'type': bump_type, 'x': x, 'y': 0.0, 'z': 0.0,
+            'GT_Height': height, 'GT_Depth': depth}
+
+def cruising(x=0.0, speed_kmh=50.0):
+    return VehicleState(0.0, x, 0.0, 0.0, speed_kmh, 1.0, 0.0, 0.0)
+
+def test_track_skips_horizon_when_state_is_missing():
+    bump_index = BumpIndex([make_bump(1, 20.0), make_bump(2, 45.0)])
+    decision = ControlDecision(SpeedMap(), planner_kind="kinematic", lookahead=True, horizon_bumps=3)
+    control = decision.step(make_perception_packet("A", "Vision", 0.08, 20.0, 3.6), cruising(), bump_index)
+    assert control is not None and control.bump['id'] == 1
+    assert decision.track(control, make_perception_packet("A", "Vision", 0.08, 19.0, 3.6), None, bump_index) is False
+    assert control.confirmed_by == "Vision"
+
+def test_lookahead_packet_round_trip_and_rejected_trigger_is_not_repeated():
+    bump_index = BumpIndex([make_bump(1, 20.0), make_bump(2, 60.0, height=0.0)])
+    decision = ControlDecision(SpeedMap(), lookahead=True, horizon_bumps=1)
+    data, bump = decision.trigger(cruising(), bump_index)
+    assert data.source == "Lookahead" and bump['id'] == 1
+    assert decode_packet(encode_packet(data)) == data
+
+    rejected = decode_packet(encode_packet(data._replace(Measured_Height=0.0)))
+    assert decision.step(rejected, cruising(), bump_index, bump) is None
+    assert 1 in decision.lookahead.handled_ids
+    assert decision.trigger(cruising(), bump_index) == (None, None)
+    assert decision.trigger(cruising(x=50.0), bump_index) == (None, None)
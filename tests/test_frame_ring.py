@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from utils.frame_ring import FrameRing, FrameRingReader
+
+@pytest.fixture
+def ring():
+    frame_ring = FrameRing.create(slots=4, max_size=(16, 8), frames_per_slot=2)
+    yield frame_ring
+    frame_ring.close()
+
+def frames(value, h=8, w=16):
+    return [np.full((h, w, 3), value, np.uint8), np.full((h // 2, w // 2, 3), value + 1, np.uint8)]
+
+def test_slot_round_trip_keeps_frame_shapes(ring):
+    seq = ring.write(frames(7), timestamp=1.5)
+    frame_slot = ring.slot(seq)
+    assert frame_slot.timestamp == 1.5 and [f.shape for f in frame_slot.frames] == [(8, 16, 3), (4, 8, 3)]
+    assert frame_slot.frames[1][0, 0, 0] == 8 and ring.is_valid(frame_slot)
+
+def test_torn_and_overwritten_slots_are_rejected(ring):
+    seq = ring.write(frames(1))
+    frame_slot = ring.slot(seq)
+    ring.slot_seq[seq % ring.slots] = -seq
+    assert ring.slot(seq) is None and not ring.is_valid(frame_slot)
+    ring.slot_seq[seq % ring.slots] = seq
+    for value in range(ring.slots):
+        ring.write(frames(value))
+    assert ring.slot(seq) is None and not ring.is_valid(frame_slot)
+
+def test_oversize_frame_is_counted_and_not_written(ring):
+    seq = ring.write(frames(1))
+    assert ring.write([np.zeros((9, 16, 3), np.uint8)]) is None
+    assert ring.oversize_frames == 1 and ring.latest_seq == seq
+
+def test_reader_counts_dropped_frames(ring):
+    reader = FrameRingReader(ring)
+    ring.write(frames(1))
+    assert reader.read_latest().seq == 1 and reader.read_latest() is None
+    for value in range(3):
+        ring.write(frames(value))
+    assert reader.read_latest().seq == 4
+    assert reader.dropped == 2 and reader.read_count == 2
@@ -0,0 +1,30 @@
+import queue
+
+import pytest
+
+from utils.mailbox import LatestValueMailbox
+
+def test_get_returns_latest_value_and_counts_superseded():
+    mailbox = LatestValueMailbox()
+    for value in range(3):
+        mailbox.put(value)
+    assert mailbox.get_nowait() == 2 and mailbox.superseded == 2
+    assert mailbox.empty()
+    mailbox.put(3)
+    assert mailbox.get_nowait() == 3 and mailbox.superseded == 2
+
+def test_discard_drops_unread_value():
+    mailbox = LatestValueMailbox()
+    mailbox.put({"msg": "stale"})
+    mailbox.discard()
+    assert mailbox.empty()
+    with pytest.raises(queue.Empty):
+        mailbox.get(timeout=0.01)
+    mailbox.put({"msg": "fresh"})
+    assert mailbox.get(timeout=0.01) == {"msg": "fresh"}
+
+def test_oversize_payload_is_rejected():
+    mailbox = LatestValueMailbox(capacity=16)
+    with pytest.raises(ValueError):
+        mailbox.put(b"x" * 64)
+    assert mailbox.version == 0
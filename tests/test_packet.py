@@ -0,0 +1,22 @@
+from utils.packet import PERCEPTION_PACKET, VEHICLE_NAME_BYTES, decode_packet, encode_packet, make_perception_packet
+
+def test_round_trip_keeps_every_field():
+    packet = make_perception_packet("B", "V2V", 0.18, 42.5, 3.6, height_pixels=31, hue_variance=12.25,
+                                    vehicle_name="전방차량_01", timestamp=123.5)
+    payload = encode_packet(packet)
+    assert len(payload) == PERCEPTION_PACKET.size
+    assert decode_packet(payload) == packet
+
+def test_unknown_type_and_long_vehicle_name():
+    packet = make_perception_packet("Z", vehicle_name="v" * (VEHICLE_NAME_BYTES + 8))
+    decoded = decode_packet(encode_packet(packet))
+    assert decoded.type == "UNKNOWN" and decoded.vehicle_name == "v" * VEHICLE_NAME_BYTES
+
+def test_seq_is_numbered_per_source():
+    vision = [make_perception_packet("A", "Vision").seq for _ in range(2)]
+    v2v = make_perception_packet("A", "V2V").seq
+    assert vision[1] == vision[0] + 1
+    assert make_perception_packet("A", "V2V").seq == v2v + 1
+    assert make_perception_packet("A", "Vision").seq == vision[1] + 1
+    assert make_perception_packet("A", "Vision", seq=7).seq == 7
+    assert make_perception_packet("A", "Vision").seq == vision[1] + 2
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from config import config
+from src.planning_table import PlanningTable, SpeedMap
+from utils.planning_table_bench import BENCH_SPEED_MAP, random_bumps, reference_target_speeds
+
+@pytest.mark.parametrize("gain", [config.INITIAL_PR_CALIBRATION, config.INITIAL_PR_CALIBRATION * 1.7])
+def test_table_matches_direct_planner(gain):
+    heights, depths, speeds = random_bumps(2000, seed=1)
+    speed_map = SpeedMap(BENCH_SPEED_MAP)
+    target_speed, _, _ = PlanningTable(gain).plan(heights, depths, speeds, speed_map)
+    assert np.abs(target_speed - reference_target_speeds(heights, depths, speeds, speed_map, gain)).max() < 0.1
+
+def test_outside_grid_is_exact_and_gain_rebuilds_once():
+    table = PlanningTable(config.INITIAL_PR_CALIBRATION)
+    speed_map = SpeedMap(BENCH_SPEED_MAP)
+    heights, depths, speeds = np.array([0.01, 0.40]), np.array([6.0, 0.3]), np.array([50.0, 50.0])
+    target_speed, _, _ = table.plan(heights, depths, speeds, speed_map)
+    reference = reference_target_speeds(heights, depths, speeds, speed_map, table.gain)
+    assert np.allclose(target_speed, reference)
+    assert not table.set_gain(table.gain) and table.set_gain(table.gain * 1.1) and table.rebuilds == 2
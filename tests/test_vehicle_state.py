@@ -0,0 +1,21 @@
+from utils.vehicle_state import VehicleStateReader
+from utils.vehicle_state_bench import make_counting_car
+
+def test_snapshot_reads_com_once_per_tick():
+    car, calls = make_counting_car(x=10.0, speed_kmh=42.0)
+    reader = VehicleStateReader(car)
+    state = reader.refresh()
+    for _ in range(5):
+        assert reader.snapshot() is state
+    assert reader.fetch_count == 1
+    assert sum(calls.values()) == 5  # Position + X/Y/Z + Speed()
+    assert state.distance_to((20.0, 0.0, 0.0)) == 10.0 and state.Speed_kmh == 42.0
+
+def test_direction_is_read_only_on_request():
+    car, calls = make_counting_car()
+    reader = VehicleStateReader(car)
+    assert not reader.refresh().has_direction
+    state = reader.snapshot(with_direction=True)
+    assert state.direction == (1.0, 0.0, 0.0) and calls['car.Direction'] == 1
+    reader.snapshot(with_direction=True)
+    assert calls['car.Direction'] == 1 and reader.fetch_count == 1
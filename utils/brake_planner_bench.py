@@ -0,0 +1,38 @@
+# utils/brake_planner_bench.py
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# 단독 실행을 위해 프로젝트 root 경로를 sys.path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.control import calculate_brake_pwm
+from src.braking_planner import KinematicBrakePlanner
+
+# 속도 × 거리 격자에서 기존 calculate_brake_pwm 과 등감속 플래너의 명령 비교 + 벡터 평가 시간
+def run_brake_planner_benchmark(target_kmh, grid_size):
+    speeds = np.arange(30.0, 61.0, 10.0)
+    distances = np.arange(5.0, 26.0, 5.0)
+    planner = KinematicBrakePlanner()
+    rows = [f"calculate_brake_pwm / kinematic (tS:{target_kmh:.0f}km/h)", "v\\d    " + " ".join(f"{d:>11.0f}m" for d in distances)]
+    for v in speeds:
+        cells = [f"{calculate_brake_pwm(v, target_kmh, d, 1.0):.2f}/{planner.command(v, target_kmh, d):.2f}" for d in distances]
+        rows.append(f"{v:>4.0f}km/h " + " ".join(f"{c:>12}" for c in cells))
+
+    grid_v, grid_d = np.meshgrid(np.linspace(20.0, 80.0, grid_size), np.linspace(1.0, 50.0, grid_size))
+    t0 = time.perf_counter()
+    levels = planner.command(grid_v, target_kmh, grid_d)
+    return rows, {"grid_points": levels.size, "kinematic_grid_ms": (time.perf_counter() - t0) * 1000}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="제동 플래너 명령 비교 / 격자 평가 벤치마크")
+    parser.add_argument("--target", type=float, default=25.0, help="목표 속도 [km/h]")
+    parser.add_argument("--grid", type=int, default=1000, help="격자 한 변의 점 수")
+    args = parser.parse_args()
+
+    rows, result = run_brake_planner_benchmark(args.target, args.grid)
+    print("\n".join(rows))
+    for key, value in result.items():
+        print(f"{key}: {value}")
@@ -0,0 +1,199 @@
+# utils/bump_catalog.py
+import os
+import math
+import hashlib
+import numpy as np
+
+from config import config
+from utils.shm import create_shared_memory, attach_shared_memory
+from utils.bump_index import BumpIndex
+
+TYPE_KEYWORDS = {"A": "typea", "B": "typeb", "C": "typec"}
+
+BUMP_DTYPE = np.dtype([
+    ('id', '<i8'), ('name', '<U64'), ('type', '<U8'),
+    ('x', '<f8'), ('y', '<f8'), ('z', '<f8'),
+    ('GT_Height', '<f8'), ('GT_Depth', '<f8'),
+])
+
+HEADER_SEQ = 0
+HEADER_COUNT = 1
+HEADER_SIZE = 2
+
+def bump_type_from_name(name):
+    name_lower = name.lower()
+    for bump_type, keyword in TYPE_KEYWORDS.items():
+        if keyword in name_lower: return bump_type
+    return None
+
+def _axis_length(v_obj):
+    return math.sqrt(v_obj.X**2 + v_obj.Y**2 + v_obj.Z**2) * 2
+
+def read_bump_record(instance):
+    height, depth = 0.0, 0.0
+    if instance.BoundingBoxesCount > 0:
+        bbox = instance.BoundingBox(0)
+        height, depth = _axis_length(bbox.yAxis), _axis_length(bbox.zAxis)
+    pos = instance.Position
+    return (int(instance.ID), instance.Name, bump_type_from_name(instance.Name),
+            float(pos.X), float(pos.Y), float(pos.Z), height, depth)
+
+def _read_position(instance):
+    pos = instance.Position
+    return float(pos.X), float(pos.Y), float(pos.Z)
+
+# 인스턴스 ID/이름과 방지턱 위치로 만든 지문. 위치는 인스턴스당 Position 한 번이라 바운딩 박스를 읽는 것보다 훨씬 싸다.
+def catalog_fingerprint(instance_ids, instance_names, bump_positions):
+    digest = hashlib.sha1(np.asarray(instance_ids, dtype='<i8').tobytes())
+    digest.update('\0'.join(instance_names).encode('utf-8'))
+    digest.update(np.asarray(bump_positions, dtype='<f8').tobytes())
+    return digest.hexdigest()
+
+# 캐시 파일을 나누는 프로젝트 키: 방지턱이 아닌 인스턴스(도로, 건물 등)의 ID/이름.
+# 방지턱을 옮기거나 추가해도 같은 파일을 쓰므로 부분 재사용이 되고, 다른 프로젝트와는 파일을 공유하지 않는다.
+def project_cache_key(instance_ids, instance_names):
+    digest = hashlib.sha1()
+    for instance_id, name in zip(instance_ids, instance_names):
+        if bump_type_from_name(name) is None: digest.update(f"{instance_id}\0{name}\0".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+# 디스크 캐시: 프로젝트 지문(인스턴스 ID/이름, 방지턱 위치)과 방지턱 레코드를 함께 저장한다.
+def load_cached_catalog(path):
+    try:
+        with np.load(path) as data:
+            return str(data['fingerprint']), data['records'].astype(BUMP_DTYPE)
+    except (OSError, KeyError, ValueError):
+        return None
+
+def save_cached_catalog(path, fingerprint, records):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, fingerprint=np.array(fingerprint), records=records)
+        os.replace(tmp_path, path)
+    except OSError:
+        try: os.remove(tmp_path)
+        except OSError: pass
+
+# 시나리오 로드 시 한 번만 COM으로 방지턱 인스턴스를 열거해 float 레코드 배열로 만든다.
+# cache_dir 가 주어지면 ID/이름과 방지턱 위치만 읽어 프로젝트별 캐시 파일의 지문과 비교하고, 일치하면 캐시를 그대로 쓴다.
+# 일치하지 않으면 (ID, 위치)가 같은 방지턱은 캐시의 높이/깊이를 재사용하고 새로 생기거나 옮겨진 인스턴스만 바운딩 박스를 읽는다.
+# 위치를 그대로 두고 크기만 바꾼 방지턱은 지문으로 구분되지 않으므로, 그때는 캐시 파일을 지운다.
+def build_bump_catalog(project, cache_dir=None):
+    try:
+        instances = [project.ThreeDModelInstance(i) for i in range(project.ThreeDModelInstancesCount)]
+        instance_ids = [int(instance.ID) for instance in instances]
+        instance_names = [instance.Name for instance in instances]
+        bumps = [(instance, instance_id, name, _read_position(instance))
+                 for instance, instance_id, name in zip(instances, instance_ids, instance_names) if bump_type_from_name(name) is not None]
+    except Exception:
+        return np.array([], dtype=BUMP_DTYPE)
+
+    fingerprint = catalog_fingerprint(instance_ids, instance_names, [position for *_, position in bumps])
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, f"{project_cache_key(instance_ids, instance_names)}.npz")
+    cached = load_cached_catalog(cache_path) if cache_path else None
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    reusable = {}
+    if cached is not None:
+        reusable = {(record[0], *record[3:6]): record[6:] for record in cached[1].tolist()}
+
+    records = []
+    complete = True
+    for instance, instance_id, name, position in bumps:
+        size = reusable.get((instance_id, *position))
+        if size is not None:
+            records.append((instance_id, name, bump_type_from_name(name), *position, *size))
+            continue
+        try: records.append(read_bump_record(instance))
+        except Exception: complete = False
+    records = np.array(records, dtype=BUMP_DTYPE)
+
+    if cache_path and complete:
+        save_cached_catalog(cache_path, fingerprint, records)
+    return records
+
+# 헤드리스 백엔드는 레이아웃을 COM 없이 바로 읽으므로 캐시하지 않는다 (레이아웃을 고쳐도 옛 레코드를 쓰지 않도록).
+def bump_catalog_cache_dir():
+    return config.BUMP_CATALOG_CACHE_DIR if config.UCWIN_BACKEND == "com" else None
+
+# BumpIndex / 기존 dict 기반 코드에서 쓰는 항목 목록으로 변환
+def catalog_entries(records):
+    names = records.dtype.names
+    return [dict(zip(names, row)) for row in records.tolist()]
+
+# 프로세스 간 공유되는 방지턱 카탈로그 (공유 메모리 seqlock).
+# 발행할 때마다 generation이 1 증가하며, 각 프로세스는 generation이 바뀐 경우에만 레코드를 복사해 인덱스를 다시 만든다.
+class BumpCatalog:
+    def __init__(self, shm, capacity, owner=False):
+        self.shm = shm
+        self.capacity = capacity
+        self.owner = owner
+        self.header = np.ndarray((HEADER_SIZE,), dtype=np.int64, buffer=shm.buf, offset=0)
+        self.records = np.ndarray((capacity,), dtype=BUMP_DTYPE, buffer=shm.buf, offset=8 * HEADER_SIZE)
+
+    @classmethod
+    def create(cls, capacity):
+        catalog = cls(create_shared_memory(8 * HEADER_SIZE + capacity * BUMP_DTYPE.itemsize), capacity, owner=True)
+        catalog.header[:] = 0
+        return catalog
+
+    @classmethod
+    def attach(cls, name, capacity):
+        return cls(attach_shared_memory(name), capacity)
+
+    def __reduce__(self):
+        return (BumpCatalog.attach, (self.shm.name, self.capacity))
+
+    @property
+    def generation(self):
+        return int(self.header[HEADER_SEQ]) // 2
+
+    def publish(self, records):
+        if len(records) > self.capacity:
+            raise ValueError(f"{len(records)} bumps exceed catalog capacity {self.capacity}")
+        seq = int(self.header[HEADER_SEQ])
+        self.header[HEADER_SEQ] = seq + 1
+        self.records[:len(records)] = records
+        self.header[HEADER_COUNT] = len(records)
+        self.header[HEADER_SEQ] = seq + 2
+        return (seq + 2) // 2
+
+    # 발행된 적이 없거나 known_generation 이후 바뀐 것이 없으면 (known_generation, None)
+    def read_if_changed(self, known_generation=-1):
+        while True:
+            seq = int(self.header[HEADER_SEQ])
+            if seq == 0 or seq // 2 == known_generation: return known_generation, None
+            if seq % 2: continue
+            records = self.records[:int(self.header[HEADER_COUNT])].copy()
+            if int(self.header[HEADER_SEQ]) == seq: return seq // 2, records
+
+    def close(self):
+        self.header = self.records = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+# 프로세스별 카탈로그 뷰. refresh()가 True를 반환하면 entries/index가 새 generation으로 교체된 것이다.
+class BumpCatalogReader:
+    def __init__(self, bump_catalog):
+        self.bump_catalog = bump_catalog
+        self.generation = -1
+        self.entries = []
+        self.index = BumpIndex(self.entries)
+
+    def refresh(self):
+        if self.bump_catalog is None: return False
+        generation, records = self.bump_catalog.read_if_changed(self.generation)
+        if records is None: return False
+        self.load(records, generation)
+        return True
+
+    def load(self, records, generation=-1):
+        self.generation = generation
+        self.entries = catalog_entries(records)
+        self.index = BumpIndex(self.entries)
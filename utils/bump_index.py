@@ -0,0 +1,82 @@
+# utils/bump_index.py
+import math
+import heapq
+
+# 방지턱 ground truth 공간 인덱스 (3D KD-tree).
+# 항목은 'x', 'y', 'z' float 키를 가진 dict 이며, 조회 경로에서는 COM 호출 없이 float 좌표만 사용한다.
+# 조회 결과는 (거리, 항목) 목록이며 가까운 순으로 정렬된다.
+# 노드마다 하위 트리의 경계 상자를 두어, 현재 k번째 거리보다 먼 상자와 (next_ahead에서) 전부 진행 방향 뒤에 있는 상자는 내려가지 않는다.
+# predicate로 거른 항목은 탐색 범위를 줄이지 못하므로, 진행 방향 앞에 거른 항목이 많으면 그만큼 더 방문한다.
+
+def as_xyz(vector):
+    return (float(vector.X), float(vector.Y), float(vector.Z))
+
+def is_ahead(origin, direction, point):
+    return direction[0] * (point[0] - origin[0]) + direction[2] * (point[2] - origin[2]) > 0
+
+# 경계 상자 [lo, hi] 안에 진행 방향 앞의 점이 있을 수 있는지 (상자에서 is_ahead 값이 가장 큰 꼭짓점으로 판단)
+def box_ahead(origin, direction, lo, hi):
+    return sum(direction[a] * ((hi[a] if direction[a] > 0 else lo[a]) - origin[a]) for a in (0, 2)) > 0
+
+def box_distance(origin, lo, hi):
+    return math.sqrt(sum(max(lo[a] - origin[a], 0.0, origin[a] - hi[a]) ** 2 for a in range(3)))
+
+class BumpIndex:
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self.points = [(e['x'], e['y'], e['z']) for e in self.entries]
+        self.nodes = []
+        self.root = self._build(list(range(len(self.points))), 0)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _build(self, indices, depth):
+        if not indices: return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self.points[i][axis])
+        mid = len(indices) // 2
+        node = len(self.nodes)
+        self.nodes.append(None)
+        lo = tuple(min(self.points[i][a] for i in indices) for a in range(3))
+        hi = tuple(max(self.points[i][a] for i in indices) for a in range(3))
+        left = self._build(indices[:mid], depth + 1)
+        right = self._build(indices[mid + 1:], depth + 1)
+        self.nodes[node] = (indices[mid], axis, left, right, lo, hi)
+        return node
+
+    # reachable(lo, hi)가 False인 하위 트리는 방문하지 않는다.
+    def _search(self, origin, k, max_dist, accept, reachable=None):
+        heap = []  # (-거리, 인덱스) 최대 힙
+        def visit(node):
+            if node is None: return
+            i, axis, left, right, lo, hi = self.nodes[node]
+            bound = -heap[0][0] if len(heap) == k else max_dist
+            if box_distance(origin, lo, hi) > bound or (reachable is not None and not reachable(lo, hi)): return
+            d = math.dist(origin, self.points[i])
+            if d <= max_dist and (accept is None or accept(i)):
+                heapq.heappush(heap, (-d, i))
+                if len(heap) > k: heapq.heappop(heap)
+            near, far = (left, right) if origin[axis] < self.points[i][axis] else (right, left)
+            visit(near)
+            visit(far)
+        visit(self.root)
+        return [(-neg_d, self.entries[i]) for neg_d, i in sorted(heap, reverse=True)]
+
+    def nearest(self, origin, predicate=None, max_dist=math.inf):
+        accept = None if predicate is None else (lambda i: predicate(self.entries[i]))
+        found = self._search(origin, 1, max_dist, accept)
+        return found[0] if found else (None, None)
+
+    def within_radius(self, origin, radius, predicate=None):
+        accept = None if predicate is None else (lambda i: predicate(self.entries[i]))
+        return self._search(origin, len(self.entries), radius, accept)
+
+    def next_ahead(self, origin, direction, n, predicate=None, max_dist=math.inf):
+        def accept(i):
+            return is_ahead(origin, direction, self.points[i]) and (predicate is None or predicate(self.entries[i]))
+        return self._search(origin, n, max_dist, accept, lambda lo, hi: box_ahead(origin, direction, lo, hi))
+
+    def nearest_ahead(self, origin, direction, predicate=None, max_dist=math.inf):
+        found = self.next_ahead(origin, direction, 1, predicate, max_dist)
+        return found[0] if found else (None, None)
@@ -15,6 +15,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # 변경된 디렉토리 구조에 맞게 import 경로 수정
 from src.vision import run_vision_processing 
 from config import config
+from utils.mailbox import LatestValueMailbox
+from utils.packet import PERCEPTION_PACKET, encode_packet, decode_packet
 
 # --- 시뮬레이션 제어를 위한 헬퍼 함수 ---
 def attach_or_launch():
@@ -63,7 +65,7 @@ def run_calibration_session(target_speed):
         pythoncom.CoUninitialize()
         return
 
-    vision_to_calib_queue = multiprocessing.Queue(maxsize=1)
+    vision_to_calib_queue = LatestValueMailbox(PERCEPTION_PACKET.size, encode_packet, decode_packet)
     vision_process = multiprocessing.Process(target=run_vision_processing, args=(vision_to_calib_queue, None, None))
     vision_process.start()
 
@@ -102,14 +104,14 @@ def run_calibration_session(target_speed):
                     vehicle.ParkingBrake = False
                     measured_speeds.append(round(speed, 2))
                     print(f"\n>> 충돌! 속도({speed:.2f} km/h)가 기록되었습니다. <<")
-                    while not vision_to_calib_queue.empty(): vision_to_calib_queue.get()
+                    vision_to_calib_queue.discard()
                     break
                 
                 elif key == 'b' and is_braking:
                     vehicle.ParkingBrake = False
                     braking_cancelled = True
                     print("\n>> 잘못된 감속! 'b'키가 입력되어 이번 측정을 취소합니다. <<")
-                    while not vision_to_calib_queue.empty(): vision_to_calib_queue.get()
+                    vision_to_calib_queue.discard()
                     break
 
             if not is_braking:
@@ -117,7 +119,7 @@ def run_calibration_session(target_speed):
                 if current_speed >= target_speed:
                     try:
                         data = vision_to_calib_queue.get(timeout=0.01)
-                        if data['type'] != "None":
+                        if data.type != "None":
                             print(f"\n>>> 과속방지턱 감지! 제동(강도:{brake_intensity:.1f})을 시작합니다. (기록: 'c', 취소: 'b') <<<")
                             is_braking = True
                     except queue.Empty:
@@ -0,0 +1,42 @@
+# utils/clock.py
+import time
+
+# 노드의 시간 측정/대기는 모두 clock 객체를 거친다.
+# time(): 타임스탬프와 제동 구간 시각, monotonic(): 주기/timeout 계산, perf(): 처리 지연 측정, sleep(): 대기
+class RealClock:
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def perf(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        if seconds > 0: time.sleep(seconds)
+
+REAL_CLOCK = RealClock()
+
+# 가상 시계: sleep()은 기다리지 않고 시각만 앞으로 옮긴다. on_advance(dt)가 있으면 옮긴 만큼 호출한다 (시뮬레이터 스텝 등).
+# 처리 시간은 시각에 반영되지 않으므로 같은 입력이면 타임스탬프/지연 측정이 항상 같다.
+class VirtualClock:
+    def __init__(self, start=0.0, on_advance=None):
+        self.now = start
+        self.on_advance = on_advance
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def perf(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds <= 0: return
+        self.now += seconds
+        if self.on_advance is not None: self.on_advance(seconds)
+
+    advance = sleep
@@ -0,0 +1,33 @@
+# utils/com_runtime.py
+from config import config
+
+# pywin32 가 없는 환경(헤드리스 시뮬레이터)에서도 노드가 import/실행되도록 COM 런타임 호출을 감싼다.
+try:
+    import pythoncom
+    from win32com.client import Dispatch, GetActiveObject
+except ImportError:
+    pythoncom = None
+
+def co_initialize():
+    if pythoncom is not None: pythoncom.CoInitialize()
+
+def co_uninitialize():
+    if pythoncom is not None: pythoncom.CoUninitialize()
+
+def pump_waiting_messages():
+    if pythoncom is not None: pythoncom.PumpWaitingMessages()
+
+# F8ApplicationServicesProxy 에 붙거나 실행한다. 헤드리스 백엔드에서는 시뮬레이터의 ApplicationServices 를 돌려준다.
+def attach_application(prog_id=config.UCWIN_PROG_ID):
+    if config.UCWIN_BACKEND == "headless":
+        from src.headless_sim import connect
+        return connect().ApplicationServices
+    try: return GetActiveObject(prog_id)
+    except Exception: return Dispatch(prog_id)
+
+# STA 에서는 COM 프록시를 다른 스레드에서 그대로 쓸 수 없으므로 인터페이스를 마샬링해 넘긴다.
+# 반환값은 대상 스레드 안에서(co_initialize 후) 호출해 그 스레드용 객체를 얻는 함수다. COM 객체가 아니면 그대로 돌려준다.
+def marshal_to_thread(obj):
+    if pythoncom is None or not hasattr(obj, '_oleobj_'): return lambda: obj
+    stream = pythoncom.CoMarshalInterThreadInterfaceInStream(pythoncom.IID_IDispatch, obj._oleobj_)
+    return lambda: Dispatch(pythoncom.CoGetInterfaceAndReleaseStream(stream, pythoncom.IID_IDispatch))
@@ -0,0 +1,131 @@
+# utils/frame_ring.py
+import time
+import collections
+import numpy as np
+
+from utils.shm import create_shared_memory, attach_shared_memory
+
+FrameSlot = collections.namedtuple('FrameSlot', ['seq', 'timestamp', 'frames'])
+
+HEADER_WRITE_SEQ = 0
+HEADER_OVERSIZE = 1
+HEADER_SIZE = 4
+
+def _align(offset, alignment=64):
+    return (offset + alignment - 1) // alignment * alignment
+
+# 고정 크기 슬롯으로 구성된 공유 메모리 프레임 링 버퍼.
+# 캡처 producer가 가장 오래된 슬롯을 덮어쓰며 기록하고, 분석 consumer는 FrameRingReader로 슬롯을 복사 없이 읽는다.
+# 슬롯 seq는 쓰는 동안 음수(-seq)로 표시되므로, 읽은 뒤 is_valid()로 분석 중에 덮어써지지 않았는지 확인할 수 있다.
+class FrameRing:
+    def __init__(self, shm, slots, frames_per_slot, max_h, max_w, owner=False):
+        self.shm = shm
+        self.slots, self.frames_per_slot = slots, frames_per_slot
+        self.max_h, self.max_w = max_h, max_w
+        self.owner = owner
+        self._map()
+
+    @staticmethod
+    def _layout(slots, frames_per_slot, max_h, max_w):
+        offset = 8 * HEADER_SIZE
+        seq_offset = offset; offset += 8 * slots
+        time_offset = offset; offset += 8 * slots
+        shape_offset = offset; offset += 4 * slots * frames_per_slot * 2
+        data_offset = _align(offset)
+        size = data_offset + slots * frames_per_slot * max_h * max_w * 3
+        return seq_offset, time_offset, shape_offset, data_offset, size
+
+    @classmethod
+    def create(cls, slots, max_size, frames_per_slot=2):
+        max_w, max_h = max_size
+        size = cls._layout(slots, frames_per_slot, max_h, max_w)[-1]
+        ring = cls(create_shared_memory(size), slots, frames_per_slot, max_h, max_w, owner=True)
+        ring.header[:] = 0
+        ring.slot_seq[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name, slots, frames_per_slot, max_h, max_w):
+        return cls(attach_shared_memory(name), slots, frames_per_slot, max_h, max_w)
+
+    def __reduce__(self):
+        return (FrameRing.attach, (self.shm.name, self.slots, self.frames_per_slot, self.max_h, self.max_w))
+
+    def _map(self):
+        seq_offset, time_offset, shape_offset, data_offset, _ = self._layout(self.slots, self.frames_per_slot, self.max_h, self.max_w)
+        buf = self.shm.buf
+        self.header = np.ndarray((HEADER_SIZE,), dtype=np.int64, buffer=buf, offset=0)
+        self.slot_seq = np.ndarray((self.slots,), dtype=np.int64, buffer=buf, offset=seq_offset)
+        self.slot_time = np.ndarray((self.slots,), dtype=np.float64, buffer=buf, offset=time_offset)
+        self.slot_shape = np.ndarray((self.slots, self.frames_per_slot, 2), dtype=np.int32, buffer=buf, offset=shape_offset)
+        self.data = np.ndarray((self.slots, self.frames_per_slot, self.max_h, self.max_w, 3), dtype=np.uint8, buffer=buf, offset=data_offset)
+
+    @property
+    def latest_seq(self):
+        return int(self.header[HEADER_WRITE_SEQ])
+
+    @property
+    def oversize_frames(self):
+        return int(self.header[HEADER_OVERSIZE])
+
+    def write(self, frames, timestamp=None):
+        for frame in frames:
+            if frame.shape[0] > self.max_h or frame.shape[1] > self.max_w:
+                self.header[HEADER_OVERSIZE] += 1
+                return None
+        seq = self.latest_seq + 1
+        idx = seq % self.slots
+        self.slot_seq[idx] = -seq
+        for i, frame in enumerate(frames):
+            h, w = frame.shape[:2]
+            self.data[idx, i, :h, :w] = frame
+            self.slot_shape[idx, i] = (h, w)
+        self.slot_time[idx] = timestamp if timestamp is not None else time.time()
+        self.slot_seq[idx] = seq
+        self.header[HEADER_WRITE_SEQ] = seq
+        return seq
+
+    def slot(self, seq):
+        idx = seq % self.slots
+        if seq <= 0 or self.slot_seq[idx] != seq: return None
+        frames = [self.data[idx, i, :h, :w] for i, (h, w) in enumerate(self.slot_shape[idx].tolist())]
+        timestamp = float(self.slot_time[idx])
+        if self.slot_seq[idx] != seq: return None
+        return FrameSlot(seq, timestamp, frames)
+
+    def is_valid(self, frame_slot):
+        return self.slot_seq[frame_slot.seq % self.slots] == frame_slot.seq
+
+    def close(self):
+        self.header = self.slot_seq = self.slot_time = self.slot_shape = self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+# consumer별 읽기 커서. 항상 최신 슬롯을 읽으며, 그 사이 읽지 못하고 건너뛴 프레임은 dropped 로 집계한다.
+class FrameRingReader:
+    def __init__(self, frame_ring, from_start=False):
+        self.frame_ring = frame_ring
+        self.last_seq = 0 if from_start else frame_ring.latest_seq
+        self.read_count = 0
+        self.dropped = 0
+
+    def _take(self, seq):
+        frame_slot = self.frame_ring.slot(seq)
+        if frame_slot is None: return None
+        self.dropped += seq - self.last_seq - 1
+        self.last_seq = seq
+        self.read_count += 1
+        return frame_slot
+
+    def read_latest(self):
+        latest = self.frame_ring.latest_seq
+        if latest <= self.last_seq: return None
+        return self._take(latest)
+
+    def wait_latest(self, timeout, poll_interval=0.002):
+        deadline = time.monotonic() + timeout
+        while True:
+            frame_slot = self.read_latest()
+            if frame_slot is not None or time.monotonic() >= deadline: return frame_slot
+            time.sleep(poll_interval)
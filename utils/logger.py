@@ -14,6 +14,7 @@ LINE_KEYS = {
     'EVALUATE_RESULT': 5,
     'EVALUATE_ACCURACY': 6,
     'CONTROL_CORRECTION': 7,
+    'VISION_LATENCY': 8,
     'DEBUG_DISTANCE': 9
 }
 CURSOR_SAVE = "\033[s"
@@ -0,0 +1,82 @@
+# utils/mailbox.py
+import time
+import queue
+import pickle
+import multiprocessing
+
+STATE_SEQ = 0
+STATE_SIZE = 1
+STATE_READ_VERSION = 2
+STATE_SUPERSEDED = 3
+
+def pickle_encode(value):
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+# 최신 값 하나만 유지하는 프로세스 간 채널 (공유 메모리 seqlock).
+# writer는 seq를 홀수로 올린 뒤 payload를 쓰고 다시 짝수로 올린다. reader는 쓰기 전후 seq가 같을 때만 값을 받아들인다.
+# 읽히기 전에 새 값으로 덮어쓴 횟수는 superseded 로 집계되며, reader는 항상 가장 최근 값만 본다.
+class LatestValueMailbox:
+    def __init__(self, capacity=4096, encode=pickle_encode, decode=pickle.loads):
+        self.capacity = capacity
+        self.encode = encode
+        self.decode = decode
+        self.buffer = multiprocessing.RawArray('B', capacity)
+        self.state = multiprocessing.RawArray('q', 4)
+        self.write_lock = multiprocessing.Lock()
+        self.updated = multiprocessing.Event()
+
+    @property
+    def version(self):
+        return self.state[STATE_SEQ] // 2
+
+    @property
+    def superseded(self):
+        return self.state[STATE_SUPERSEDED]
+
+    def put(self, value):
+        payload = self.encode(value)
+        if len(payload) > self.capacity:
+            raise ValueError(f"payload {len(payload)}B exceeds mailbox capacity {self.capacity}B")
+        with self.write_lock:
+            seq = self.state[STATE_SEQ]
+            if seq // 2 > self.state[STATE_READ_VERSION]:
+                self.state[STATE_SUPERSEDED] += 1
+            self.state[STATE_SEQ] = seq + 1
+            memoryview(self.buffer).cast('B')[:len(payload)] = payload
+            self.state[STATE_SIZE] = len(payload)
+            self.state[STATE_SEQ] = seq + 2
+        self.updated.set()
+
+    put_nowait = put
+
+    def empty(self):
+        return self.version <= self.state[STATE_READ_VERSION]
+
+    def _try_read(self):
+        seq = self.state[STATE_SEQ]
+        if seq % 2 or seq // 2 <= self.state[STATE_READ_VERSION]: return False, None
+        payload = bytes(memoryview(self.buffer).cast('B')[:self.state[STATE_SIZE]])
+        if self.state[STATE_SEQ] != seq: return False, None
+        self.state[STATE_READ_VERSION] = seq // 2
+        return True, self.decode(payload)
+
+    def get(self, block=True, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            ok, value = self._try_read()
+            if ok: return value
+            if self.state[STATE_SEQ] % 2: continue
+            if not block: raise queue.Empty
+            self.updated.clear()
+            ok, value = self._try_read()
+            if ok: return value
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0: raise queue.Empty
+            self.updated.wait(remaining)
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    # 아직 읽지 않은 값을 버린다. (큐를 비우던 get() 반복을 대체)
+    def discard(self):
+        self.state[STATE_READ_VERSION] = self.version
@@ -0,0 +1,46 @@
+# utils/packet.py
+import time
+import struct
+import itertools
+import collections
+
+# Vision/V2V/Control 간 인지 패킷의 고정 레이아웃 (little-endian, 76 bytes).
+# 종류/출처는 enum 인덱스로, 전방 차량 이름은 고정 길이 utf-8 필드로 담는다.
+# seq는 출처별로 그 출처를 만드는 노드 하나에서만 증가한다 (Vision은 Vision 노드, V2V는 V2V 노드; Vision 노드는 V2V 패킷을 그대로 전달한다).
+# 따라서 패킷 순서/신선도는 (source, seq) 로 비교하고, 출처가 다른 패킷의 seq끼리는 비교하지 않는다.
+# Lookahead는 Control 노드가 카탈로그에서 만드는 트리거 패킷의 출처 (src.bump_lookahead). 인덱스가 바뀌지 않도록 뒤에 추가한다.
+BUMP_TYPES = ("None", "A", "B", "C", "D", "UNKNOWN")
+SOURCES = ("Vision", "V2V", "Lookahead")
+VEHICLE_NAME_BYTES = 24
+
+PERCEPTION_PACKET = struct.Struct(f'<QdBBxxIdddf{VEHICLE_NAME_BYTES}s')
+
+PerceptionPacket = collections.namedtuple('PerceptionPacket', [
+    'seq', 'timestamp', 'type', 'source', 'height_pixels',
+    'Measured_Height', 'bump_distance', 'depth_m', 'hue_variance', 'vehicle_name'
+])
+
+_BUMP_TYPE_INDEX = {name: i for i, name in enumerate(BUMP_TYPES)}
+_SOURCE_INDEX = {name: i for i, name in enumerate(SOURCES)}
+_packet_seq = collections.defaultdict(lambda: itertools.count(1))
+
+# seq를 주면 새 번호를 매기지 않는다 (이미 받은 인지 결과를 다시 만드는 경우).
+def make_perception_packet(bump_type, source="Vision", Measured_Height=0.0, bump_distance=0.0, depth_m=0.0,
+                           height_pixels=0, hue_variance=0.0, vehicle_name="", timestamp=None, seq=None):
+    if bump_type not in _BUMP_TYPE_INDEX: bump_type = "UNKNOWN"
+    if seq is None: seq = next(_packet_seq[source])
+    return PerceptionPacket(seq, time.time() if timestamp is None else timestamp, bump_type, source,
+                            int(height_pixels), float(Measured_Height), float(bump_distance), float(depth_m),
+                            float(hue_variance), vehicle_name)
+
+def encode_packet(packet):
+    name = packet.vehicle_name.encode('utf-8')[:VEHICLE_NAME_BYTES]
+    return PERCEPTION_PACKET.pack(packet.seq, packet.timestamp, _BUMP_TYPE_INDEX.get(packet.type, _BUMP_TYPE_INDEX["UNKNOWN"]),
+                                  _SOURCE_INDEX[packet.source], packet.height_pixels, packet.Measured_Height,
+                                  packet.bump_distance, packet.depth_m, packet.hue_variance, name)
+
+def decode_packet(payload):
+    seq, timestamp, type_index, source_index, height_pixels, Measured_Height, bump_distance, depth_m, hue_variance, name = PERCEPTION_PACKET.unpack(payload)
+    return PerceptionPacket(seq, timestamp, BUMP_TYPES[type_index], SOURCES[source_index], height_pixels,
+                            Measured_Height, bump_distance, depth_m, hue_variance,
+                            name.rstrip(b'\0').decode('utf-8', errors='ignore'))
@@ -0,0 +1,59 @@
+# utils/planning_table_bench.py
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# 단독 실행을 위해 프로젝트 root 경로를 sys.path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from src.control import calculate_rms, classify_rms, solve_speed_for_target_rms
+from src.planning_table import PlanningTable, SpeedMap
+
+BENCH_SPEED_MAP = {"30": 18.0, "40": 22.0, "50": 25.0, "60": 28.0}
+
+# plan_bump_response 기존 스칼라 경로의 목표 속도 [km/h]
+def reference_target_speeds(heights, depths, speeds, speed_map, gain):
+    reference = []
+    for h, L, v in zip(heights.tolist(), depths.tolist(), speeds.tolist()):
+        minimum_Speed = speed_map.min_speed(v)
+        level = classify_rms(calculate_rms(h, L, minimum_Speed / 3.6, gain))
+        if level in ["불쾌함", "매우 불쾌함"]: reference.append(minimum_Speed)
+        else: reference.append(max(minimum_Speed, solve_speed_for_target_rms(h, L, config.COMFORT_TARGETS_RMS[level], gain) * 3.6 + config.TARGET_SPEED_MARGIN_KMH))
+    return np.array(reference)
+
+def random_bumps(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.03, 0.25, n), rng.uniform(0.5, 4.0, n), rng.uniform(20.0, 70.0, n)
+
+# 스칼라 경로와 표 조회의 결과/속도 비교
+def run_planning_table_benchmark(n, gain=config.INITIAL_PR_CALIBRATION):
+    heights, depths, speeds = random_bumps(n)
+    speed_map = SpeedMap(BENCH_SPEED_MAP)
+
+    t0 = time.perf_counter()
+    reference = reference_target_speeds(heights, depths, speeds, speed_map, gain)
+    scalar_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    table = PlanningTable(gain)
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    target_speed, _, _ = table.plan(heights, depths, speeds, speed_map)
+    table_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    table.set_gain(gain * 1.1)
+    rebuild_s = time.perf_counter() - t0
+
+    return {"scalar_us_per_bump": scalar_s / n * 1e6, "table_us_per_bump": table_s / n * 1e6, "build_ms": build_s * 1000,
+            "gain_rebuild_ms": rebuild_s * 1000, "max_error_kmh": float(np.abs(target_speed - reference).max())}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="목표 속도 계획 표 조회 vs 스칼라 경로 벤치마크")
+    parser.add_argument("--bumps", type=int, default=100000)
+    args = parser.parse_args()
+
+    for key, value in run_planning_table_benchmark(args.bumps).items():
+        print(f"{key}: {value:.4f}")
@@ -0,0 +1,277 @@
+# utils/scenario_runner.py
+import os
+import sys
+import csv
+import argparse
+import itertools
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+# 단독 실행을 위해 프로젝트 root 경로를 sys.path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from src.headless_sim import HeadlessWorld, HeadlessWorldClock, HeadlessApplication, ROAD_DIRECTION
+from src.frame_source import SimulatedFrameSource
+from src.vision import analyze_frame_pair, make_vision_packet
+from src.V2V import make_v2v_packets
+from src.control import ControlDecision, load_speed_map
+from src.control_callbacks import CallbackBrakeController
+from src.brake_actuator import select_brake_actuator
+from src.evaluate import evaluate_pass, compute_rms, classify_rms
+from utils.packet import make_perception_packet
+from utils.vehicle_state import read_vehicle_state
+from utils.bump_index import BumpIndex
+from utils.bump_catalog import build_bump_catalog, catalog_entries
+
+# 헤드리스 월드 위에서 Vision → Control → Evaluate 폐루프를 가상 시간으로 돌리는 배치 러너.
+# 노드 프로세스/큐/time.sleep 없이 한 에피소드를 한 프로세스에서 스텝 단위로 진행하므로 실시간보다 훨씬 빠르고,
+# 에피소드 격자는 ProcessPoolExecutor 로 병렬 실행한다.
+# 제어 결정은 노드와 같은 src.control.ControlDecision 이 하고, 인지 패킷은 Vision/V2V 노드와 같은 함수로 만든다.
+# 러너는 노드 사이의 입출력(메일박스, 제동 입력, 평가 큐)만 같은 프로세스 안에서 흉내낸다.
+BUMP_SHAPES = {"A": (0.08, 3.6), "B": (0.18, 3.6), "C": (0.10, 1.8), "D": (0.03, 0.5)}  # (높이[m], 깊이[m])
+FIRST_BUMP_OFFSET_M = 150.0
+HARD_BRAKING_DECEL_MPS2 = 3.5  # 직전 방지턱 이후 최대 감속도가 이보다 크면 급제동으로 센다
+
+EpisodeSpec = collections.namedtuple('EpisodeSpec', [
+    'bump_type', 'speed_kmh', 'spacing_m', 'bump_count', 'v2v', 'control_mode', 'pR_Calibration', 'PWM_Calibration', 'brake_actuator', 'brake_planner', 'lookahead',
+    'horizon_bumps'
+], defaults=(4, False, "poll", config.INITIAL_PR_CALIBRATION, config.INITIAL_PWM_CALIBRATION, config.CONTROL_BRAKE_ACTUATOR,
+             config.CONTROL_BRAKE_PLANNER, config.CONTROL_LOOKAHEAD, config.CONTROL_HORIZON_BUMPS))
+
+RESULT_FIELDS = ['bump_type', 'speed_kmh', 'spacing_m', 'v2v', 'control_mode', 'brake_actuator', 'brake_planner', 'lookahead', 'horizon_bumps', 'bump', 'source',
+                 'target_speed', 'Brake_PWM', 'prediction_RMS', 'pass_speed', 'actual_RMS', 'comfort_level', 'time_lost_s', 'segment_time_s',
+                 'peak_decel_mps2', 'pR_Calibration', 'PWM_Calibration']
+
+def make_layout(spec):
+    height, depth = BUMP_SHAPES[spec.bump_type]
+    return [(f"Type{spec.bump_type}_{i + 1:02d}", config.HEADLESS_START_X + ROAD_DIRECTION[0] * (FIRST_BUMP_OFFSET_M + i * spec.spacing_m),
+             height, depth) for i in range(spec.bump_count)]
+
+class Episode:
+    def __init__(self, spec, step_dt=config.HEADLESS_STEP_DT, speed_map=None):
+        self.spec = spec
+        self.step_dt = step_dt
+        self.layout = make_layout(spec)
+        self.world = HeadlessWorld.local()
+        self.clock = HeadlessWorldClock(self.world, step_dt)
+        self.application = HeadlessApplication(self.world, self.layout)
+        self.world.start_scenario(0, spec.speed_kmh, config.HEADLESS_FRONT_VEHICLE_GAP_M.get(1, 20.0) if spec.v2v else None)
+        self.car = self.application.SimulationCore.TrafficSimulation.Driver.CurrentCar
+        self.brake_actuator = select_brake_actuator(self.car, spec.brake_actuator, self.clock, threaded=False)
+        self.decision = ControlDecision(load_speed_map() if speed_map is None else speed_map, spec.pR_Calibration, spec.PWM_Calibration,
+                                        spec.brake_planner, spec.lookahead, spec.horizon_bumps, self.clock)
+        self.frame_source = SimulatedFrameSource(self.application, clock=self.clock)
+        self.bump_index = BumpIndex(catalog_entries(build_bump_catalog(self.application.Project)))
+
+        self.pending_bumps = sorted(self.layout, key=lambda b: b[1] * ROAD_DIRECTION[0])
+        self.plans = {}
+        self.rows = []
+        self.last_pass_time = 0.0
+        self.peak_decel = 0.0
+        self.detection_history = collections.deque(maxlen=config.DETECTION_CONFIRM_FRAME_COUNT)
+        self.next_frame = 0.0
+        self.empty_road_result = None
+        self.v2v_queue = collections.deque(maxlen=8)
+        self.broadcast_bump_ids = set()
+        self.next_v2v = 0.0
+
+    @property
+    def now(self):
+        return self.clock.time()
+
+    def state(self):
+        return read_vehicle_state(self.car, self.now, with_direction=True)
+
+    # 월드를 duration 만큼 진행하면서 방지턱 통과 시점의 속도와 그 사이 최대 감속도를 기록하고, 주기마다 V2V 방송을 흉내낸다.
+    def advance(self, duration, on_step=None):
+        steps = max(1, round(duration / self.step_dt))
+        for _ in range(steps):
+            if on_step is not None: on_step(self.step_dt)
+            speed = self.world.get('ego_speed')
+            self.world.step(self.step_dt)
+            self.peak_decel = max(self.peak_decel, (speed - self.world.get('ego_speed')) / self.step_dt)
+            self._record_passes()
+            if self.spec.v2v and self.now >= self.next_v2v:
+                self._broadcast_v2v()
+                self.next_v2v = self.now + config.V2V_PERIOD_S
+
+    def _record_passes(self):
+        ego_x = self.world.get('ego_x')
+        while self.pending_bumps and (ego_x - self.pending_bumps[0][1]) * ROAD_DIRECTION[0] >= 0:
+            name, _, height, depth = self.pending_bumps.pop(0)
+            pass_speed = self.world.get('ego_speed') * 3.6
+            actual_RMS = compute_rms(pass_speed, height, depth)
+            row = {'bump_type': self.spec.bump_type, 'speed_kmh': self.spec.speed_kmh, 'spacing_m': self.spec.spacing_m,
+                   'v2v': int(self.spec.v2v), 'control_mode': self.spec.control_mode, 'brake_actuator': self.brake_actuator.kind, 'brake_planner': self.spec.brake_planner, 'lookahead': int(self.spec.lookahead), 'horizon_bumps': self.spec.horizon_bumps, 'bump': name, 'source': "",
+                   'pass_speed': pass_speed, 'actual_RMS': actual_RMS, 'comfort_level': classify_rms(actual_RMS),
+                   'segment_time_s': self.now - self.last_pass_time, 'peak_decel_mps2': self.peak_decel}
+            self.last_pass_time, self.peak_decel = self.now, 0.0
+            plan = self.plans.pop(name, {})
+            # 제어 시작 시점 속도 그대로 통과했을 때 대비 늦어진 시간
+            start = plan.pop('start', None)
+            if start is not None:
+                start_time, start_dist, start_speed = start
+                plan['time_lost_s'] = (self.now - start_time) - start_dist / max(start_speed / 3.6, 0.1)
+            row.update(plan)
+            self.rows.append(row)
+
+    def _front_distance(self):
+        if not self.world.get('front_valid'): return None
+        return abs(self.world.get('front_x') - self.world.get('ego_x'))
+
+    # run_v2v_simulation: 전방 차량이 V2V_RANGE_M 안이면 전방 차량 근처 방지턱을 방송한다 (v2v_to_vision_queue 대신 deque)
+    def _broadcast_v2v(self):
+        front_distance = self._front_distance()
+        if front_distance is None or front_distance > config.V2V_RANGE_M: return
+        front_position = (self.world.get('front_x'), 0.0, 0.0)
+        for bump, packet in make_v2v_packets(self.bump_index, self.state(), front_position, "FrontCar", self.broadcast_bump_ids, self.now):
+            self.v2v_queue.append(packet)
+            self.broadcast_bump_ids.add(bump['id'])
+
+    # run_vision_processing 의 한 프레임: 전방 차량이 가까우면 V2V 패킷을 전달하고, 아니면 합성 프레임을 분석해 Vision 패킷을 만든다.
+    def perceive(self):
+        self.next_frame = self.now + 1.0 / config.VISION_FRAME_RATE_HZ
+        front_distance = self._front_distance()
+        if front_distance is not None and front_distance <= config.V2V_RANGE_M:
+            return self.v2v_queue.popleft() if self.v2v_queue else make_perception_packet("None", timestamp=self.now)
+
+        regular_frame, height_frame = self.frame_source.read()
+        if self.frame_source.truth['type'] == "None" and self.empty_road_result is not None:
+            result = self.empty_road_result  # 빈 도로 장면은 항상 같은 프레임이므로 분석 결과를 재사용한다.
+        else:
+            result = analyze_frame_pair(regular_frame, height_frame)
+            if self.frame_source.truth['type'] == "None": self.empty_road_result = result
+        return make_vision_packet(result, self.detection_history, self.bump_index, self.state(), self.now)
+
+    # 제동 중 메일박스에서 받을 값: Vision 프레임 주기가 지났으면 새 패킷, 아니면 None
+    def poll_perception(self):
+        return self.perceive() if self.now >= self.next_frame else None
+
+    # run_control_simulation 의 제동 구간: 폴링 모드는 CONTROL_POLL_DT마다 brake_actuator에 강도를 넣고(PWM은 스텝마다 위상 진행),
+    # 콜백 모드는 스텝마다 CallbackBrakeController. 두 모드 모두 tick마다 받은 인지로 ControlDecision.track()을 부른다.
+    def brake(self, control):
+        car, actuator, session = self.car, self.brake_actuator, control.session
+        if self.spec.control_mode == "callback":
+            controller = CallbackBrakeController(self.clock, actuator.kind == "analog")
+            controller.arm(session, control.bump_pos)
+            while not controller.finished.is_set():
+                self.advance(self.step_dt, lambda dt: controller.on_tick(dt, car))
+                self.decision.track(control, self.poll_perception(), self.state(), self.bump_index)
+            return
+
+        while True:
+            state = self.state()
+            braking = session.update(state.timestamp, state.distance_to(control.bump_pos), state.Speed_kmh, state)
+            if braking is None: break
+            actuator.apply(session.Brake_PWM if braking else 0.0)
+            if session.finished: break
+            self.advance(config.CONTROL_POLL_DT, lambda dt: actuator.step())
+            self.decision.track(control, self.poll_perception(), self.state(), self.bump_index)
+        actuator.release()
+
+    # 시작한 제어 하나를 끝까지 진행하고, Evaluate 노드 대신 evaluate_pass로 보정 계수를 바로 갱신한다.
+    def run_control(self, control):
+        state = self.state()
+        name = control.bump['name']
+        self.plans[name] = {'source': control.source, 'target_speed': control.target_speed, 'Brake_PWM': control.Brake_PWM,
+                            'prediction_RMS': control.prediction_RMS, 'start': (self.now, state.distance_to(control.bump_pos), state.Speed_kmh)}
+        self.brake(control)
+        eval_request = self.decision.finish(control, self.state().Speed_kmh)
+        if name in self.plans: self.plans[name]['source'] = control.detect_source
+        self.decision.apply_correction(evaluate_pass(eval_request))
+        for row in self.rows:
+            if row['bump'] == name:
+                row.update(source=control.detect_source, pR_Calibration=self.decision.pR_Calibration, PWM_Calibration=self.decision.PWM_Calibration)
+
+    # run_control_simulation 의 대기 루프: 트리거가 없으면 Vision 프레임 주기마다 인지를 받아 ControlDecision.step()에 넣는다.
+    # 제어를 시작하지 않은 루프는 항상 프레임 주기만큼 시간을 진행한다.
+    def run(self, time_limit=None):
+        if time_limit is None:
+            route_m = FIRST_BUMP_OFFSET_M + self.spec.bump_count * self.spec.spacing_m
+            time_limit = 3.0 * route_m / max(self.spec.speed_kmh / 3.6, 1.0) + 60.0
+        frame_period = 1.0 / config.VISION_FRAME_RATE_HZ
+
+        while self.pending_bumps and self.now < time_limit:
+            data, trigger_bump = None, None
+            if self.decision.armed:
+                data, trigger_bump = self.decision.trigger(self.state(), self.bump_index)
+            if data is None:
+                data = self.perceive()
+            control = self.decision.step(data, self.state(), self.bump_index, trigger_bump)
+            if control is None:
+                self.advance(frame_period)
+                continue
+            self.run_control(control)
+        return self.rows
+
+def run_episode(spec):
+    return Episode(spec).run()
+
+def make_grid(bump_types, speeds, spacings, bump_count, v2v_modes, control_mode, pwm_calibrations, brake_actuator=config.CONTROL_BRAKE_ACTUATOR,
+              brake_planner=config.CONTROL_BRAKE_PLANNER, lookahead_modes=(config.CONTROL_LOOKAHEAD,), horizon_sizes=(config.CONTROL_HORIZON_BUMPS,)):
+    return [EpisodeSpec(bump_type, speed, spacing, bump_count, v2v, control_mode, config.INITIAL_PR_CALIBRATION, pwm, brake_actuator, brake_planner,
+                        lookahead, horizon_bumps)
+            for bump_type, speed, spacing, v2v, pwm, lookahead, horizon_bumps in itertools.product(bump_types, speeds, spacings, v2v_modes,
+                                                                                                 pwm_calibrations, lookahead_modes, horizon_sizes)]
+
+def run_sweep(specs, workers=None):
+    if workers == 1:
+        return [run_episode(spec) for spec in specs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_episode, specs, chunksize=max(1, len(specs) // (4 * (workers or os.cpu_count() or 1)))))
+
+def write_results(path, results):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS, restval="")
+        writer.writeheader()
+        for rows in results: writer.writerows(rows)
+
+def summarize(results):
+    groups = collections.defaultdict(list)
+    for rows in results:
+        for row in rows: groups[(row['bump_type'], row['speed_kmh'], row['spacing_m'], row['v2v'], row['lookahead'], row['horizon_bumps'])].append(row)
+    lines = []
+    for (bump_type, speed, spacing, v2v, lookahead, horizon_bumps), rows in sorted(groups.items()):
+        controlled = sum(1 for row in rows if row['source'])
+        pass_speed = sum(row['pass_speed'] for row in rows) / len(rows)
+        actual_RMS = sum(row['actual_RMS'] for row in rows) / len(rows)
+        comfort = collections.Counter(row['comfort_level'] for row in rows).most_common(1)[0][0]
+        segment_time = sum(row['segment_time_s'] for row in rows) / len(rows)
+        hard_braking = sum(1 for row in rows if row['peak_decel_mps2'] > HARD_BRAKING_DECEL_MPS2)
+        line = (f"T:{bump_type} v0:{speed:.0f}km/h S:{spacing:.0f}m V2V:{v2v} LA:{lookahead} H:{horizon_bumps} | 제어 {controlled}/{len(rows)} | "
+                f"cS:{pass_speed:.1f}km/h | aR:{actual_RMS:.2f} | {comfort} | 구간:{segment_time:.2f}s | 급제동 {hard_braking}/{len(rows)}")
+        planned = [row for row in rows if 'time_lost_s' in row]
+        if planned:
+            ts_error = sum(row['pass_speed'] - row['target_speed'] for row in planned) / len(planned)
+            time_lost = sum(row['time_lost_s'] for row in planned) / len(planned)
+            line += f" | cS-tS:{ts_error:+.1f}km/h | 지연:{time_lost:.2f}s"
+        lines.append(line)
+    return lines
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="헤드리스 폐루프 시나리오 배치 실행 (가상 시간)")
+    parser.add_argument("--types", default="ABCD")
+    parser.add_argument("--speeds", type=float, nargs='+', default=[30.0, 40.0, 50.0])
+    parser.add_argument("--spacings", type=float, nargs='+', default=[200.0])
+    parser.add_argument("--count", type=int, default=4, help="에피소드당 방지턱 수")
+    parser.add_argument("--v2v", choices=["off", "on", "both"], default="both")
+    parser.add_argument("--mode", choices=["poll", "callback"], default=config.CONTROL_MODE)
+    parser.add_argument("--actuator", choices=["auto", "analog", "pwm"], default=config.CONTROL_BRAKE_ACTUATOR)
+    parser.add_argument("--planner", choices=["kinematic", "pi", "heuristic"], default=config.CONTROL_BRAKE_PLANNER)
+    parser.add_argument("--lookahead", choices=["off", "on", "both"], default="on" if config.CONTROL_LOOKAHEAD else "off")
+    parser.add_argument("--horizons", type=int, nargs='+', default=[config.CONTROL_HORIZON_BUMPS], help="제동 계획에 함께 고려할 방지턱 수")
+    parser.add_argument("--pwm-calibrations", type=float, nargs='+', default=[config.INITIAL_PWM_CALIBRATION])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="scenario_results.csv")
+    args = parser.parse_args()
+
+    v2v_modes = {"off": [False], "on": [True], "both": [False, True]}[args.v2v]
+    lookahead_modes = {"off": [False], "on": [True], "both": [False, True]}[args.lookahead]
+    specs = make_grid(list(args.types.upper()), args.speeds, args.spacings, args.count, v2v_modes, args.mode, args.pwm_calibrations, args.actuator, args.planner,
+                      lookahead_modes, args.horizons)
+    results = run_sweep(specs, args.workers)
+    write_results(args.out, results)
+    for line in summarize(results):
+        print(line)
+    print(f"{len(specs)} episodes -> {args.out}")
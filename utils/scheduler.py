@@ -0,0 +1,46 @@
+# utils/scheduler.py
+from utils.clock import REAL_CLOCK
+
+# 고정 sleep 대신 목표 주기의 deadline에 맞춰 대기하는 프레임 스케줄러.
+# 처리 시간을 주기에서 빼고 대기하며, deadline을 넘기면 missed_deadlines를 올리고 현재 시각부터 다시 잡는다.
+# 방지턱 후보가 보이면 boost 주기로 올리고, 빈 도로가 idle_after_frames 프레임 이어지면 idle 주기로 내린다.
+class FrameScheduler:
+    def __init__(self, rate_hz, boost_rate_hz=None, idle_rate_hz=None, idle_after_frames=10, clock=REAL_CLOCK):
+        self.clock = clock
+        self.rate_hz = rate_hz
+        self.boost_rate_hz = boost_rate_hz or rate_hz
+        self.idle_rate_hz = idle_rate_hz or rate_hz
+        self.idle_after_frames = idle_after_frames
+        self.current_rate_hz = rate_hz
+        self.empty_frames = 0
+        self.next_deadline = None
+        self.frames = 0
+        self.missed_deadlines = 0
+
+    @property
+    def period(self):
+        return 1.0 / self.current_rate_hz
+
+    def report_activity(self, bump_candidate):
+        if bump_candidate:
+            self.empty_frames = 0
+            self.current_rate_hz = self.boost_rate_hz
+        else:
+            self.empty_frames += 1
+            self.current_rate_hz = self.idle_rate_hz if self.empty_frames >= self.idle_after_frames else self.rate_hz
+
+    def reset(self):
+        self.next_deadline = None
+
+    def wait(self):
+        now = self.clock.monotonic()
+        if self.next_deadline is None:
+            self.next_deadline = now
+        self.next_deadline += self.period
+        self.frames += 1
+        if now > self.next_deadline:
+            self.missed_deadlines += 1
+            self.next_deadline = now
+            return False
+        self.clock.sleep(self.next_deadline - now)
+        return True
@@ -0,0 +1,12 @@
+# utils/shm.py
+from multiprocessing import shared_memory
+
+def create_shared_memory(size):
+    return shared_memory.SharedMemory(create=True, size=size)
+
+# 자식 프로세스는 생성자와 resource_tracker를 공유하므로 이름으로 붙기만 하고 소유(unlink)는 생성자가 맡는다.
+def attach_shared_memory(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
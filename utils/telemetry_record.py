@@ -0,0 +1,126 @@
+# utils/telemetry_record.py
+import math
+import time
+import dataclasses
+import numpy as np
+
+from utils.shm import create_shared_memory, attach_shared_memory
+from utils.vehicle_state import VehicleState
+
+NO_FRONT_VEHICLE_DISTANCE = 999.9
+FRONT_NAME_CHARS = 24
+
+TELEMETRY_DTYPE = np.dtype([
+    ('timestamp', '<f8'), ('ego_valid', 'u1'),
+    ('Pos_X', '<f8'), ('Pos_Y', '<f8'), ('Pos_Z', '<f8'), ('Speed_kmh', '<f8'),
+    ('Dir_X', '<f8'), ('Dir_Y', '<f8'), ('Dir_Z', '<f8'),
+    ('front_valid', 'u1'), ('front_id', '<i8'), ('front_name', f'<U{FRONT_NAME_CHARS}'),
+    ('front_X', '<f8'), ('front_Y', '<f8'), ('front_Z', '<f8'), ('front_distance', '<f8'),
+])
+
+HEADER_SEQ = 0
+HEADER_SIZE = 1
+
+@dataclasses.dataclass(slots=True)
+class TelemetrySnapshot:
+    timestamp: float = 0.0
+    ego: VehicleState = None
+    front_id: int = None
+    front_name: str = ""
+    front_position: tuple = None
+    front_distance: float = NO_FRONT_VEHICLE_DISTANCE
+
+    @property
+    def has_front_vehicle(self):
+        return self.front_id is not None
+
+# 자차/전방 차량 상태 레코드 하나를 담는 공유 메모리 (단일 writer seqlock).
+# telemetry 프로세스만 COM으로 상태를 읽어 publish() 하고, 나머지 노드는 read()로 같은 시점의 스냅샷을 본다.
+class VehicleTelemetry:
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((HEADER_SIZE,), dtype=np.int64, buffer=shm.buf, offset=0)
+        self.record = np.ndarray((1,), dtype=TELEMETRY_DTYPE, buffer=shm.buf, offset=8 * HEADER_SIZE)
+
+    @classmethod
+    def create(cls):
+        telemetry = cls(create_shared_memory(8 * HEADER_SIZE + TELEMETRY_DTYPE.itemsize), owner=True)
+        telemetry.header[:] = 0
+        telemetry.record[0] = np.zeros((), dtype=TELEMETRY_DTYPE)
+        telemetry.record[0]['front_distance'] = NO_FRONT_VEHICLE_DISTANCE
+        return telemetry
+
+    @classmethod
+    def attach(cls, name):
+        return cls(attach_shared_memory(name))
+
+    def __reduce__(self):
+        return (VehicleTelemetry.attach, (self.shm.name,))
+
+    @property
+    def version(self):
+        return int(self.header[HEADER_SEQ]) // 2
+
+    def publish(self, ego, front_id=None, front_name="", front_position=None, timestamp=None):
+        row = np.zeros((), dtype=TELEMETRY_DTYPE)
+        row['timestamp'] = time.time() if timestamp is None else timestamp
+        row['front_distance'] = NO_FRONT_VEHICLE_DISTANCE
+        if ego is not None:
+            row['ego_valid'] = 1
+            for field in ('Pos_X', 'Pos_Y', 'Pos_Z', 'Speed_kmh'): row[field] = getattr(ego, field)
+            if ego.has_direction: row['Dir_X'], row['Dir_Y'], row['Dir_Z'] = ego.direction
+            if front_position is not None:
+                row['front_valid'], row['front_id'] = 1, front_id
+                row['front_name'] = front_name[:FRONT_NAME_CHARS]
+                row['front_X'], row['front_Y'], row['front_Z'] = front_position
+                row['front_distance'] = math.dist(ego.position, front_position)
+        seq = int(self.header[HEADER_SEQ])
+        self.header[HEADER_SEQ] = seq + 1
+        self.record[0] = row
+        self.header[HEADER_SEQ] = seq + 2
+
+    def read(self):
+        while True:
+            seq = int(self.header[HEADER_SEQ])
+            if seq % 2: continue
+            row = self.record[0].copy()
+            if int(self.header[HEADER_SEQ]) == seq: break
+
+        snapshot = TelemetrySnapshot(float(row['timestamp']))
+        if row['ego_valid']:
+            snapshot.ego = VehicleState(snapshot.timestamp, float(row['Pos_X']), float(row['Pos_Y']), float(row['Pos_Z']),
+                                        float(row['Speed_kmh']), float(row['Dir_X']), float(row['Dir_Y']), float(row['Dir_Z']))
+        if row['front_valid']:
+            snapshot.front_id, snapshot.front_name = int(row['front_id']), str(row['front_name'])
+            snapshot.front_position = (float(row['front_X']), float(row['front_Y']), float(row['front_Z']))
+            snapshot.front_distance = float(row['front_distance'])
+        return snapshot
+
+    def close(self):
+        self.header = self.record = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+# VehicleStateReader 와 같은 인터페이스로 COM 대신 telemetry 레코드에서 자차 상태를 읽는다.
+# 자차가 없으면(시나리오 재시작 중 등) snapshot()/refresh()는 None을 돌려준다.
+class TelemetryStateReader:
+    def __init__(self, telemetry):
+        self.telemetry = telemetry
+        self.state = None
+
+    def attach(self, car):
+        self.state = None
+
+    def tick(self):
+        self.state = None
+
+    def snapshot(self, with_direction=False):
+        if self.state is None:
+            self.state = self.telemetry.read().ego
+        return self.state
+
+    def refresh(self, with_direction=False):
+        self.tick()
+        return self.snapshot(with_direction)
@@ -0,0 +1,75 @@
+# utils/vehicle_state.py
+import math
+import dataclasses
+
+from utils.clock import REAL_CLOCK
+
+# 한 틱에 필요한 차량 상태를 float 스냅샷으로 읽는다.
+# COM 벡터 객체(Position/Direction)는 틱당 한 번만 가져오고 X/Y/Z를 바로 float으로 풀어, 이후 계산에서는 IDispatch 왕복이 없다.
+@dataclasses.dataclass(slots=True)
+class VehicleState:
+    timestamp: float = 0.0
+    Pos_X: float = 0.0
+    Pos_Y: float = 0.0
+    Pos_Z: float = 0.0
+    Speed_kmh: float = 0.0
+    Dir_X: float = None
+    Dir_Y: float = None
+    Dir_Z: float = None
+
+    @property
+    def position(self):
+        return (self.Pos_X, self.Pos_Y, self.Pos_Z)
+
+    @property
+    def direction(self):
+        return (self.Dir_X, self.Dir_Y, self.Dir_Z)
+
+    @property
+    def has_direction(self):
+        return self.Dir_X is not None
+
+    def distance_to(self, point):
+        return math.dist(self.position, point)
+
+def _read_speed_kmh(car):
+    try: return float(car.Speed(1))
+    except Exception: return 0.0
+
+def _read_direction(car, state):
+    direction = car.Direction
+    state.Dir_X, state.Dir_Y, state.Dir_Z = float(direction.X), float(direction.Y), float(direction.Z)
+
+def read_vehicle_state(car, timestamp, with_direction=False):
+    pos = car.Position
+    state = VehicleState(timestamp, float(pos.X), float(pos.Y), float(pos.Z), _read_speed_kmh(car))
+    if with_direction: _read_direction(car, state)
+    return state
+
+# 틱 단위 캐시를 가진 스냅샷 리더. tick()으로 새 틱을 시작하기 전까지 snapshot()은 같은 스냅샷을 돌려주며,
+# 틱 도중에 방향이 처음 필요해지면 Direction만 추가로 읽는다.
+class VehicleStateReader:
+    def __init__(self, car, clock=REAL_CLOCK):
+        self.car = car
+        self.clock = clock
+        self.state = None
+        self.fetch_count = 0
+
+    def attach(self, car):
+        self.car = car
+        self.state = None
+
+    def tick(self):
+        self.state = None
+
+    def snapshot(self, with_direction=False):
+        if self.state is None:
+            self.state = read_vehicle_state(self.car, self.clock.time(), with_direction)
+            self.fetch_count += 1
+        elif with_direction and not self.state.has_direction:
+            _read_direction(self.car, self.state)
+        return self.state
+
+    def refresh(self, with_direction=False):
+        self.tick()
+        return self.snapshot(with_direction)
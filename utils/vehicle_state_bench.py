@@ -0,0 +1,72 @@
+# utils/vehicle_state_bench.py
+import os
+import sys
+import math
+import argparse
+import collections
+
+# 단독 실행을 위해 프로젝트 root 경로를 sys.path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.vehicle_state import VehicleStateReader
+
+# 호출 계수 가짜 COM 객체 (속성 읽기/쓰기와 메서드 호출을 각각 IDispatch 왕복 1회로 센다)
+class CountingComObject:
+    def __init__(self, name, counter, properties=None, methods=None):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_counter', counter)
+        object.__setattr__(self, '_properties', dict(properties or {}))
+        object.__setattr__(self, '_methods', dict(methods or {}))
+
+    def __getattr__(self, attr):
+        if attr in self._methods:
+            method = self._methods[attr]
+            def call(*args):
+                self._counter[f"{self._name}.{attr}()"] += 1
+                return method(*args)
+            return call
+        if attr not in self._properties: raise AttributeError(attr)
+        self._counter[f"{self._name}.{attr}"] += 1
+        value = self._properties[attr]
+        return value() if callable(value) else value
+
+    def __setattr__(self, attr, value):
+        self._counter[f"{self._name}.{attr}="] += 1
+        self._properties[attr] = value
+
+def make_counting_car(x=0.0, speed_kmh=40.0):
+    calls = collections.Counter()
+    def vector(name, X, Y, Z): return CountingComObject(name, calls, {'X': X, 'Y': Y, 'Z': Z})
+    car = CountingComObject('car', calls,
+                            properties={'Position': lambda: vector('Position', x, 0.0, 0.0),
+                                        'Direction': lambda: vector('Direction', 1.0, 0.0, 0.0),
+                                        'Throttle': 0.0, 'ParkingBrake': False},
+                            methods={'Speed': lambda unit=1: speed_kmh})
+    return car, calls
+
+# 제동 루프 한 틱의 COM 호출 수 비교: 기존 방식(차량/방지턱 Position 벡터를 Distance로 비교 + Speed) vs 스냅샷
+def run_com_call_benchmark(ticks):
+    car, calls = make_counting_car()
+    bump = CountingComObject('bump', calls, {'Position': lambda: CountingComObject('Position', calls, {'X': 50.0, 'Y': 0.0, 'Z': 0.0})})
+    for _ in range(ticks):
+        car_pos, bump_pos = car.Position, bump.Position
+        dist = math.sqrt((car_pos.X - bump_pos.X)**2 + (car_pos.Y - bump_pos.Y)**2 + (car_pos.Z - bump_pos.Z)**2)
+        speed = float(car.Speed(1))
+    legacy = sum(calls.values())
+
+    car, calls = make_counting_car()
+    reader = VehicleStateReader(car)
+    bump_pos = (50.0, 0.0, 0.0)
+    for _ in range(ticks):
+        state = reader.refresh()
+        dist, speed = state.distance_to(bump_pos), state.Speed_kmh
+    snapshot = sum(calls.values())
+    return {"legacy_calls_per_tick": legacy / ticks, "snapshot_calls_per_tick": snapshot / ticks}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="차량 상태 읽기의 틱당 COM 호출 수 벤치마크")
+    parser.add_argument("--ticks", type=int, default=1000)
+    args = parser.parse_args()
+
+    for key, value in run_com_call_benchmark(args.ticks).items():
+        print(f"{key}: {value:.1f}")
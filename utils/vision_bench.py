@@ -0,0 +1,79 @@
+# utils/vision_bench.py
+import os
+import sys
+import argparse
+import collections
+
+# 단독 실행을 위해 프로젝트 root 경로를 sys.path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.vision import VisionPipeline, format_stage_latency
+from src.frame_source import LiveFrameSource, RecordedFrameSource, SyntheticFrameSource, save_frame_pair
+
+def open_frame_source(source, frame_count):
+    if source == "synthetic": return SyntheticFrameSource(frame_count=frame_count)
+    if source == "live": return LiveFrameSource()
+    return RecordedFrameSource(source)
+
+class _RecordingFrameSource:
+    def __init__(self, frame_source, record_dir):
+        self.frame_source, self.record_dir, self.index = frame_source, record_dir, 0
+
+    @property
+    def truth(self):
+        return getattr(self.frame_source, 'truth', None)
+
+    def read(self):
+        frames = self.frame_source.read()
+        if frames is not None:
+            save_frame_pair(self.record_dir, self.index, *frames)
+            self.index += 1
+        return frames
+
+    def release(self):
+        self.frame_source.release()
+
+# 프레임 소스를 끝까지(또는 frame_count 까지) 최대 CPU 속도로 돌려 인지 경로의 단계별 처리 시간과 결과를 집계한다.
+def run_vision_benchmark(frame_source, frame_count=None, record_dir=None, concurrent=False):
+    if record_dir: frame_source = _RecordingFrameSource(frame_source, record_dir)
+    pipeline = VisionPipeline(frame_source, concurrent=concurrent)
+    stage_totals, type_counts = collections.Counter(), collections.Counter()
+    totals = []
+    truth_total, truth_match = 0, 0
+    while frame_count is None or len(totals) < frame_count:
+        result = pipeline.process()
+        if result is None: break
+        Bump_Pattern, Measured_Height, Measured_Distance, Bump_Type, Height_Quality = result
+        stage_totals.update(pipeline.stage_latency)
+        totals.append(pipeline.stage_latency['total'])
+        type_counts[Bump_Type] += 1
+
+        truth = getattr(frame_source, 'truth', None)
+        if truth is not None:
+            truth_total += 1
+            truth_match += (truth['type'] == Bump_Type)
+    pipeline.close()
+
+    result = {"frames": len(totals), "types": dict(type_counts), "frame_stats": pipeline.frame_stats()}
+    if totals:
+        result["stages"] = format_stage_latency({k: v / len(totals) for k, v in stage_totals.items()})
+        totals.sort()
+        result["mean_ms"] = 1000.0 * sum(totals) / len(totals)
+        result["p95_ms"] = 1000.0 * totals[int(0.95 * (len(totals) - 1))]
+        result["fps"] = len(totals) / sum(totals) if sum(totals) > 0 else 0.0
+    if truth_total:
+        result["type_accuracy"] = truth_match / truth_total
+    return result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Vision 인지 경로 오프라인 벤치마크")
+    parser.add_argument("source", help="'synthetic', 'live' 또는 녹화된 프레임 디렉토리")
+    parser.add_argument("--frames", type=int, default=None)
+    parser.add_argument("--record", default=None, help="읽은 프레임 쌍을 저장할 디렉토리")
+    parser.add_argument("--concurrent", action="store_true", help="<top>/<test> 뷰를 동시에 분석")
+    args = parser.parse_args()
+
+    frame_count = args.frames if args.frames is not None or args.source != "synthetic" else 1000
+    result = run_vision_benchmark(open_frame_source(args.source, frame_count), frame_count, args.record, args.concurrent)
+    for key, value in result.items():
+        print(f"{key}: {value}")